@@ -1,27 +1,34 @@
 import os
+import atexit
+import signal
 import numpy as np
 import logging
 from datetime import datetime, timedelta
 import json
 import apsw
-import joblib
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Response, request, jsonify, render_template, send_file
 from flask_socketio import SocketIO, emit
-import plotly
-import plotly.graph_objs as go
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('Agg')  # Untuk server tanpa GUI
-import tflite_runtime.interpreter as tflite
-from textblob import TextBlob
-from googletrans import Translator
-import pandas as pd
-from better_profanity import profanity
-from profanityfilter import ProfanityFilter
 import csv
-import requests
 import time
-pf_extended = ProfanityFilter()
+import queue
+import random
+import re
+import threading
+import zlib
+import hashlib
+import hmac
+import unicodedata
+import uuid
+import base64
+import itertools
+import heapq
+import bisect
+import cProfile
+import pstats
+import io
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from functools import lru_cache, wraps
 # Konfigurasi logging
 logging.basicConfig(
     level=logging.INFO,
@@ -36,19 +43,104 @@ app.config['SECRET_KEY'] = 'rahasia_sentimen_analisis'
 socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet')
 
 # Konfigurasi database
-DB_PATH = './sentimen_data.db'
+DB_PATH = os.environ.get('SENTIMEN_DB', './sentimen_data.db')
 PLOT_PATH = 'static/plots'
 os.makedirs(PLOT_PATH, exist_ok=True)
 
 # Set timeout koneksi database (dalam milidetik)
 DB_TIMEOUT = 5000  # 5 detik
 
+# Konfigurasi pool koneksi database
+DB_READERS = 4               # Jumlah koneksi reader maksimal
+DB_STATEMENT_CACHE = 256     # Ukuran cache prepared statement APSW per koneksi
+
+# Konfigurasi micro-batching inferensi
+BATCH_MAX_SIZE = 16     # Jumlah teks maksimal per batch
+BATCH_MAX_WAIT_MS = 5   # Waktu tunggu maksimal sebelum batch diproses
+
+# Konfigurasi pool interpreter TFLite
+INTERPRETER_POOL_SIZE = os.cpu_count() or 1  # Default: satu interpreter per core
+INTERPRETER_NUM_THREADS = 1                  # Thread internal per interpreter
+INTERPRETER_BUCKET = (1, 4, 16, 64)          # Ukuran batch tetap; batch dibulatkan ke atas dan di-padding
+
+# Konfigurasi penulis hasil ke database (write-behind)
+WRITER_QUEUE_SIZE = 10000       # Kapasitas antrian hasil yang belum ditulis
+WRITER_BATCH_SIZE = 200         # Jumlah hasil maksimal per transaksi
+WRITER_FLUSH_INTERVAL = 0.5     # Jendela waktu pengumpulan per transaksi (detik)
+WRITER_PUT_TIMEOUT = 5.0        # Lama menunggu antrian penuh sebelum tulis langsung (detik)
+WRITER_SHUTDOWN_TIMEOUT = 10.0  # Lama menunggu worker mengosongkan antrian saat berhenti (detik)
+
+# Konfigurasi statistik live di memori
+STATISTIK_HARI = 7                      # Jumlah hari yang ditampilkan
+STATISTIK_REKONSILIASI_INTERVAL = 60    # Interval sinkronisasi dengan database (detik)
+STATISTIK_DELTA_LOG = 1000              # Jumlah versi delta yang disimpan untuk client
+
+# Konfigurasi broadcast visualisasi
+BROADCAST_INTERVAL = 1.0    # Jarak minimal antar broadcast update_visualisasi (detik)
+
+# Konfigurasi analisis massal (/api/sentimen/bulk)
+BULK_MAX_ITEMS = 1000       # Jumlah teks maksimal per request
+BULK_CHUNK_SIZE = 64        # Teks per panggilan predict_batch
+
+# Konfigurasi job analisis korpus besar (/api/jobs)
+JOB_DIR = 'jobs'             # Folder file input upload dan hasil job
+JOB_INPUT_ROOT = '.'         # Path lokal yang boleh dirujuk job harus berada di folder ini
+JOB_WORKERS = 2              # Jumlah job yang diproses bersamaan
+JOB_CHUNK_SIZE = 256         # Teks per chunk; progress di-checkpoint setiap chunk
+
+# Endpoint /admin/* menuntut header X-Admin-Token berisi token ini; tanpa token admin nonaktif
+ADMIN_TOKEN = os.environ.get('SENTIMEN_ADMIN_TOKEN', '')
+
+# Konfigurasi tracing per request (opt-in, bisa diubah lewat /admin/tracing)
+TRACING_AKTIF = False
+TRACING_JENDELA = 1000       # Jumlah trace terakhir yang disimpan
+TRACING_TERLAMBAT = 20       # Jumlah trace terlambat yang ditampilkan
+PROFIL_SETIAP = 0            # Profil cProfile 1 dari K request (0 = mati)
+PROFIL_DIR = 'profil'
+
+# Konfigurasi API riwayat (/api/riwayat)
+RIWAYAT_LIMIT = 50           # Jumlah baris default per halaman
+RIWAYAT_LIMIT_MAKS = 500
+RIWAYAT_FTS = os.environ.get('SENTIMEN_FTS', '0') == '1'  # Indeks FTS5 trigram untuk pencarian teks
+
+# Konfigurasi cache terjemahan
+TRANSLATION_CACHE_SIZE = 10000              # Entri maksimal di LRU memori
+TRANSLATION_CACHE_TTL = 24 * 3600           # Umur entri memori (detik)
+TRANSLATION_CACHE_DB_TTL = 30 * 24 * 3600   # Umur entri di database (detik)
+TRANSLATION_CACHE_DB_MAKS = 200000          # Baris maksimal tabel cache_terjemahan
+RESOLUSI_CACHE_DEST = 'en#resolusi'         # Namespace cache hasil resolve_language
+
+# Konfigurasi cache hasil prediksi
+RESULT_CACHE_SIZE = 50000                   # Entri maksimal di LRU memori
+RESULT_CACHE_PERSISTEN = True               # Simpan juga di tabel cache_prediksi
+RESULT_CACHE_DB_TTL = 30 * 24 * 3600        # Umur entri di database (detik)
+RESULT_CACHE_DB_MAKS = 500000               # Baris maksimal tabel cache_prediksi
+RESULT_CACHE_SKEMA = 1                      # Naikkan jika format hasil prediksi berubah
+LEXICON_FILES = ['positive_words.csv', 'negative_words.csv']  # Ikut menentukan versi cache hasil
+
+# Konfigurasi penulisan cache persisten (terjemahan dan hasil)
+CACHE_FLUSH_INTERVAL = 1.0      # Jarak penulisan entri cache baru ke database (detik)
+CACHE_TERTUNDA_MAKS = 10000     # Entri yang menunggu ditulis per cache; selebihnya hanya di memori
+CACHE_BERSIH_INTERVAL = 3600    # Jarak pembersihan entri kedaluwarsa/berlebih di database (detik)
+
+# Konfigurasi backend translator
+TRANSLATOR_BACKEND = os.environ.get('SENTIMEN_TRANSLATOR', 'google')  # 'google', 'offline' atau 'noop'
+TRANSLATOR_BREAKER_THRESHOLD = 3    # Kegagalan beruntun sebelum backend diputus
+TRANSLATOR_BREAKER_COOLDOWN = 60    # Lama backend diputus (detik)
+TRANSLATOR_TIMEOUT = 2.0            # Timeout satu panggilan HTTP translator (detik)
+TRANSLATOR_RETRY = 3                # Jumlah percobaan per panggilan
+TRANSLATOR_BACKOFF_BASE = 0.25      # Jeda awal backoff eksponensial (detik)
+TRANSLATOR_BACKOFF_MAX = 2.0        # Jeda backoff maksimal (detik)
+TRANSLATOR_DEADLINE = 3.0           # Total waktu translator per request (detik)
+TRANSLATOR_MAKS_KARAKTER = 4500     # Panjang maksimal satu request batch googletrans
+TRANSLATOR_PARALEL = 8              # Request googletrans bersamaan untuk batch per teks
+
 # Fungsi untuk mendapatkan koneksi database
 def get_db_connection():
     """Mendapatkan koneksi database dengan APSW"""
     try:
         # Buat koneksi tanpa parameter timeout
-        conn = apsw.Connection(DB_PATH)
+        conn = apsw.Connection(DB_PATH, statementcachesize=DB_STATEMENT_CACHE)
         
         # Set timeout menggunakan PRAGMA
         cursor = conn.cursor()
@@ -61,10 +153,1229 @@ def get_db_connection():
         logger.error(f"Gagal membuat koneksi database: {str(e)}")
         raise
 
+class DatabasePool:
+    """
+    Pool koneksi APSW: satu koneksi writer (dikunci) dan hingga N koneksi reader.
+    Setiap koneksi dibuat sekali dengan PRAGMA dan cache statement, lalu dipinjam
+    secara eksklusif oleh satu thread per operasi.
+    
+    Kunci dan antrian pool adalah primitive OS thread yang juga dipegang thread
+    tpool selama commit, sehingga pool hanya boleh dipakai dari OS thread. Kode
+    yang berjalan di greenlet meminjam koneksi lewat jalankan_blocking agar hub
+    eventlet tidak ikut tertahan.
+    """
+    
+    def __init__(self, readers=DB_READERS):
+        self.max_readers = max(1, readers)
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        self._readers = queue.Queue()
+        self._jumlah_reader = 0
+        self._reader_lock = threading.Lock()
+    
+    @contextmanager
+    def writer(self):
+        """Pinjam koneksi writer tunggal (operasi tulis diserialisasi)"""
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = get_db_connection()
+            yield self._writer
+    
+    @contextmanager
+    def reader(self):
+        """Pinjam satu koneksi reader, dibuat baru jika pool belum penuh"""
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            with self._reader_lock:
+                buat_baru = self._jumlah_reader < self.max_readers
+                if buat_baru:
+                    self._jumlah_reader += 1
+            if buat_baru:
+                try:
+                    conn = get_db_connection()
+                except Exception:
+                    with self._reader_lock:
+                        self._jumlah_reader -= 1
+                    raise
+            else:
+                conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._kembalikan_reader(conn)
+    
+    def _kembalikan_reader(self, conn):
+        """
+        Kembalikan reader ke pool. Reader yang masih punya statement belum
+        selesai (read transaction terbuka) menahan snapshot WAL lama dan tidak
+        melihat commit berikutnya, jadi ditutup dan tidak dipakai ulang.
+        """
+        if conn.txn_state() == apsw.SQLITE_TXN_NONE:
+            self._readers.put(conn)
+            return
+        logger.warning("Koneksi reader dikembalikan dengan statement yang belum selesai, ditutup")
+        try:
+            conn.close(True)
+        finally:
+            with self._reader_lock:
+                self._jumlah_reader -= 1
+    
+    def close(self):
+        """Tutup semua koneksi yang sedang tidak dipakai"""
+        with self._writer_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+            with self._reader_lock:
+                self._jumlah_reader -= 1
+
+db_pool = DatabasePool()
+
+def jalankan_blocking(fungsi, *args, **kwargs):
+    """Jalankan fungsi blocking di OS thread agar hub eventlet tidak tertahan"""
+    if socketio.async_mode == 'eventlet':
+        # tpool langsung memanggil fungsi jika sudah berada di thread tpool
+        from eventlet import tpool
+        return tpool.execute(fungsi, *args, **kwargs)
+    return fungsi(*args, **kwargs)
+
+def kumpulkan_batch(antrian, antrian_kosong, max_item, max_wait):
+    """Ambil item pertama dari antrian lalu tunggu maksimal max_wait detik atau max_item item"""
+    batch = [antrian.get()]
+    batas_waktu = time.monotonic() + max_wait
+    
+    while len(batch) < max_item:
+        sisa = batas_waktu - time.monotonic()
+        if sisa <= 0:
+            break
+        try:
+            batch.append(antrian.get(timeout=sisa))
+        except antrian_kosong:
+            break
+    
+    return batch
+
+def tidur_kooperatif(detik):
+    """Sleep yang tidak memblokir hub eventlet ketika dipanggil dari greenlet"""
+    if socketio.async_mode == 'eventlet' and threading.current_thread() is threading.main_thread():
+        socketio.sleep(detik)
+    else:
+        time.sleep(detik)
+
+# -------------- BAGIAN METRIK --------------
+
+# Batas bucket histogram latensi (detik)
+BUCKET_LATENSI = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _format_label(nama_label, nilai_label, ekstra=()):
+    """Label Prometheus: {a="x",b="y"} atau string kosong"""
+    pasangan = list(zip(nama_label, nilai_label)) + list(ekstra)
+    if not pasangan:
+        return ''
+    isi = ','.join(
+        '{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for k, v in pasangan
+    )
+    return '{' + isi + '}'
+
+class Counter:
+    """Counter monoton per kombinasi label"""
+    
+    tipe = 'counter'
+    
+    def __init__(self, nama, keterangan, label=()):
+        self.nama = nama
+        self.keterangan = keterangan
+        self.label = tuple(label)
+        self._nilai = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, *nilai_label, n=1):
+        with self._lock:
+            self._nilai[nilai_label] = self._nilai.get(nilai_label, 0) + n
+    
+    def sampel(self):
+        with self._lock:
+            items = sorted(self._nilai.items())
+        return [f"{self.nama}{_format_label(self.label, lv)} {v}" for lv, v in items]
+
+class Histogram:
+    """Histogram bucket kumulatif per kombinasi label"""
+    
+    tipe = 'histogram'
+    
+    def __init__(self, nama, keterangan, label=(), buckets=BUCKET_LATENSI):
+        self.nama = nama
+        self.keterangan = keterangan
+        self.label = tuple(label)
+        self.buckets = tuple(sorted(buckets))
+        self._data = {}  # nilai label -> [jumlah per bucket (+Inf terakhir), sum]
+        self._lock = threading.Lock()
+    
+    def observe(self, nilai, *nilai_label):
+        i = bisect.bisect_left(self.buckets, nilai)
+        with self._lock:
+            data = self._data.get(nilai_label)
+            if data is None:
+                data = self._data[nilai_label] = [[0] * (len(self.buckets) + 1), 0.0]
+            data[0][i] += 1
+            data[1] += nilai
+    
+    @contextmanager
+    def ukur(self, *nilai_label):
+        """Catat durasi blok with sebagai satu observasi"""
+        mulai = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - mulai, *nilai_label)
+    
+    def sampel(self):
+        with self._lock:
+            items = sorted((lv, list(data[0]), data[1]) for lv, data in self._data.items())
+        
+        baris = []
+        for lv, jumlah, total in items:
+            kumulatif = 0
+            for batas, n in zip(self.buckets + ('+Inf',), jumlah):
+                kumulatif += n
+                baris.append(f"{self.nama}_bucket{_format_label(self.label, lv, [('le', batas)])} {kumulatif}")
+            baris.append(f"{self.nama}_sum{_format_label(self.label, lv)} {total}")
+            baris.append(f"{self.nama}_count{_format_label(self.label, lv)} {kumulatif}")
+        return baris
+
+class RegistryMetrik:
+    """
+    Kumpulan metrik yang dirender dalam format teks Prometheus. Nilai yang
+    sudah ada di tempat lain (kedalaman antrian, statistik cache) dibaca oleh
+    kolektor hanya saat endpoint di-scrape.
+    """
+    
+    def __init__(self):
+        self._metrik = []
+        self._kolektor = []
+    
+    def counter(self, nama, keterangan, label=()):
+        metrik = Counter(nama, keterangan, label)
+        self._metrik.append(metrik)
+        return metrik
+    
+    def histogram(self, nama, keterangan, label=(), buckets=BUCKET_LATENSI):
+        metrik = Histogram(nama, keterangan, label, buckets)
+        self._metrik.append(metrik)
+        return metrik
+    
+    def kolektor(self, fungsi):
+        """
+        Daftarkan fungsi yang mengembalikan list (nama, tipe, keterangan,
+        [(dict label, nilai), ...]) saat scrape
+        """
+        self._kolektor.append(fungsi)
+        return fungsi
+    
+    def render(self):
+        baris = []
+        for metrik in self._metrik:
+            baris.append(f"# HELP {metrik.nama} {metrik.keterangan}")
+            baris.append(f"# TYPE {metrik.nama} {metrik.tipe}")
+            baris.extend(metrik.sampel())
+        
+        for fungsi in self._kolektor:
+            try:
+                keluarga = fungsi()
+            except Exception as e:
+                logger.warning(f"Kolektor metrik gagal: {str(e)}")
+                continue
+            for nama, tipe, keterangan, sampel in keluarga:
+                baris.append(f"# HELP {nama} {keterangan}")
+                baris.append(f"# TYPE {nama} {tipe}")
+                for label, nilai in sampel:
+                    baris.append(f"{nama}{_format_label(label.keys(), label.values())} {nilai}")
+        return '\n'.join(baris) + '\n'
+
+metrik = RegistryMetrik()
+
+METRIK_TAHAP = metrik.histogram(
+    'sentimen_tahap_detik', 'Latensi per tahap analisis sentimen', ('tahap',)
+)
+METRIK_LABEL = metrik.counter(
+    'sentimen_label_total', 'Jumlah hasil prediksi per label', ('label',)
+)
+METRIK_FALLBACK = metrik.counter(
+    'sentimen_fallback_total', 'Jumlah fallback analisis per alasan', ('alasan',)
+)
+METRIK_TRANSLATOR_GAGAL = metrik.counter(
+    'sentimen_translator_gagal_total', 'Jumlah panggilan translator yang gagal per backend', ('backend',)
+)
+
+# -------------- BAGIAN TRACING --------------
+
+class Trace:
+    """Rekaman span satu request; waktu span relatif terhadap awal request"""
+    
+    def __init__(self, nama, profil=False):
+        self.id = uuid.uuid4().hex[:16]
+        self.nama = nama
+        self.waktu = datetime.now().isoformat()
+        self.mulai = time.perf_counter()
+        self.durasi = None
+        self.profil = profil  # True jika batch request ini harus diprofil
+        self.file_profil = None
+        self.ukuran_batch = None
+        self.spans = []
+    
+    def tambah_span(self, nama, mulai, selesai):
+        self.spans.append((nama, mulai - self.mulai, selesai - mulai))
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'nama': self.nama,
+            'waktu': self.waktu,
+            'durasi_ms': round(self.durasi * 1000, 3) if self.durasi is not None else None,
+            'ukuran_batch': self.ukuran_batch,
+            'profil': self.file_profil,
+            'spans': [
+                {'nama': nama, 'mulai_ms': round(mulai * 1000, 3), 'durasi_ms': round(durasi * 1000, 3)}
+                for nama, mulai, durasi in self.spans
+            ]
+        }
+
+class Tracer:
+    """
+    Tracing opt-in: span per request, jendela trace terakhir untuk mencari
+    request paling lambat, dan profil cProfile untuk 1 dari K request.
+    Saat tidak aktif, mulai() mengembalikan None dan semua pemanggilan lain
+    menjadi no-op.
+    """
+    
+    def __init__(self, aktif=TRACING_AKTIF, profil_setiap=PROFIL_SETIAP,
+                 jendela=TRACING_JENDELA, profil_dir=PROFIL_DIR):
+        self.aktif = aktif
+        self.profil_setiap = profil_setiap
+        self.profil_dir = profil_dir
+        
+        self._selesai = deque(maxlen=jendela)
+        self._lokal = threading.local()  # Trace milik batch yang sedang berjalan di thread ini
+        self._lock = threading.Lock()
+        self._profil_lock = threading.Lock()  # Hanya satu cProfile aktif per proses
+        self._jumlah = 0
+    
+    def mulai(self, nama):
+        """Buat trace baru, atau None jika tracing tidak aktif"""
+        if not self.aktif:
+            return None
+        profil = False
+        if self.profil_setiap > 0:
+            with self._lock:
+                self._jumlah += 1
+                profil = self._jumlah % self.profil_setiap == 0
+        return Trace(nama, profil)
+    
+    @contextmanager
+    def span(self, trace, nama):
+        """Catat blok with sebagai span milik trace (jika ada)"""
+        mulai = time.perf_counter()
+        try:
+            yield
+        finally:
+            if trace is not None:
+                trace.tambah_span(nama, mulai, time.perf_counter())
+    
+    def selesai(self, trace):
+        if trace is None:
+            return
+        trace.durasi = time.perf_counter() - trace.mulai
+        with self._lock:
+            self._selesai.append(trace)
+    
+    def aktif_di_thread(self):
+        """Trace milik batch yang sedang dijalankan thread ini"""
+        return getattr(self._lokal, 'traces', ())
+    
+    def jalankan(self, traces, fungsi, *args):
+        """
+        Jalankan fungsi dengan traces sebagai trace aktif di thread ini, di
+        bawah cProfile jika salah satu trace terpilih untuk diprofil.
+        
+        Sejak Python 3.12 hanya satu profiler boleh aktif per proses, jadi batch
+        yang terpilih saat batch lain sedang diprofil dijalankan tanpa profil.
+        Kegagalan profiler tidak pernah menggantikan hasil fungsi.
+        """
+        traces = [trace for trace in traces if trace is not None]
+        if not traces:
+            return fungsi(*args)
+        
+        self._lokal.traces = traces
+        try:
+            if not any(trace.profil for trace in traces) or not self._profil_lock.acquire(blocking=False):
+                return fungsi(*args)
+            
+            try:
+                profiler = cProfile.Profile()
+                try:
+                    profiler.enable()
+                except ValueError as e:
+                    # Profiler lain di luar tracer (mis. debugger) sedang aktif
+                    logger.warning(f"Profil dilewati: {str(e)}")
+                    return fungsi(*args)
+                
+                try:
+                    return fungsi(*args)
+                finally:
+                    profiler.disable()
+                    self._simpan_profil(profiler, traces)
+            finally:
+                self._profil_lock.release()
+        finally:
+            self._lokal.traces = ()
+    
+    def _simpan_profil(self, profiler, traces):
+        try:
+            os.makedirs(self.profil_dir, exist_ok=True)
+            nama_file = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{traces[0].id}.prof"
+            profiler.dump_stats(os.path.join(self.profil_dir, nama_file))
+            for trace in traces:
+                trace.file_profil = nama_file
+        except Exception as e:
+            logger.warning(f"Gagal menyimpan profil: {str(e)}")
+    
+    def terlambat(self, n=TRACING_TERLAMBAT):
+        """N trace paling lambat di jendela trace terakhir"""
+        with self._lock:
+            traces = list(self._selesai)
+        traces.sort(key=lambda trace: trace.durasi, reverse=True)
+        return [trace.to_dict() for trace in traces[:n]]
+    
+    def daftar_profil(self):
+        if not os.path.isdir(self.profil_dir):
+            return []
+        return sorted((f for f in os.listdir(self.profil_dir) if f.endswith('.prof')), reverse=True)
+    
+    def baca_profil(self, nama_file, baris=40):
+        """Ringkasan pstats (urut waktu kumulatif) dari file profil"""
+        path = os.path.join(self.profil_dir, os.path.basename(nama_file))
+        keluaran = io.StringIO()
+        pstats.Stats(path, stream=keluaran).sort_stats('cumulative').print_stats(baris)
+        return keluaran.getvalue()
+
+tracer = Tracer()
+
+@contextmanager
+def tahap(nama):
+    """Ukur satu tahap analisis: histogram metrik dan span di trace yang aktif"""
+    mulai = time.perf_counter()
+    try:
+        yield
+    finally:
+        selesai = time.perf_counter()
+        METRIK_TAHAP.observe(selesai - mulai, nama)
+        for trace in tracer.aktif_di_thread():
+            trace.tambah_span(nama, mulai, selesai)
+
+# -------------- BAGIAN TRANSLATOR --------------
+
+# Frasa umum Indonesia -> Inggris untuk translator offline, melengkapi kamus lexicon
+FRASA_DASAR_ID_EN = {
+    'tidak': 'not', 'bukan': 'not', 'belum': 'not yet', 'jangan': "don't",
+    'sangat': 'very', 'sekali': 'very', 'terlalu': 'too', 'cukup': 'quite',
+    'agak': 'rather', 'kurang': 'less', 'lebih': 'more', 'paling': 'most',
+    'saya': 'i', 'aku': 'i', 'kami': 'we', 'kita': 'we', 'anda': 'you',
+    'kamu': 'you', 'dia': 'he', 'mereka': 'they', 'ini': 'this', 'itu': 'that',
+    'dan': 'and', 'atau': 'or', 'tapi': 'but', 'tetapi': 'but', 'karena': 'because',
+    'dengan': 'with', 'untuk': 'for', 'dari': 'from', 'di': 'in', 'ke': 'to',
+    'yang': 'which', 'adalah': 'is', 'ada': 'there is', 'sudah': 'already',
+    'suka': 'like', 'senang': 'happy', 'bagus': 'good', 'baik': 'good',
+    'produk': 'product', 'layanan': 'service', 'pelayanan': 'service',
+    'harga': 'price', 'kualitas': 'quality', 'barang': 'item', 'film': 'movie',
+    'makanan': 'food', 'tempat': 'place',
+}
+
+class HasilTerjemahan:
+    """Hasil terjemahan dengan atribut yang sama seperti hasil googletrans"""
+    
+    def __init__(self, text, src, dest, confidence=None):
+        self.text = text
+        self.src = src
+        self.dest = dest
+        self.extra_data = {'confidence': confidence}
+
+class TranslatorBackend:
+    """
+    Antarmuka backend translator. translate() menerima satu teks atau list teks
+    dan mengembalikan hasil (atau list hasil) dengan atribut text, src dan
+    extra_data seperti googletrans.
+    """
+    
+    nama = 'base'
+    cacheable = False  # Apakah hasilnya layak disimpan di cache terjemahan
+    
+    def translate(self, text, dest='en', src='auto'):
+        raise NotImplementedError
+
+class GoogleTranslatorBackend(TranslatorBackend):
+    """Backend googletrans (membutuhkan akses internet)"""
+    
+    nama = 'google'
+    cacheable = True
+    
+    def __init__(self, timeout=TRANSLATOR_TIMEOUT, maks_karakter=TRANSLATOR_MAKS_KARAKTER, paralel=TRANSLATOR_PARALEL):
+        from concurrent.futures import ThreadPoolExecutor
+        from googletrans import Translator
+        self.translator = Translator(timeout=timeout)
+        self.maks_karakter = maks_karakter
+        self._executor = ThreadPoolExecutor(max_workers=paralel, thread_name_prefix='googletrans')
+    
+    def translate(self, text, dest='en', src='auto'):
+        if not isinstance(text, list):
+            return self.translator.translate(text, dest=dest, src=src)
+        
+        # Batch micro-batcher/bulk mencampur teks (dan bahasa) dari pengguna
+        # berbeda. Deteksi bahasa satu segmen gabungan akan ditempelkan ke semua
+        # teks lalu di-cache, jadi dengan src='auto' setiap teks diterjemahkan
+        # sendiri; request dikirim bersamaan agar tetap satu round trip.
+        if src == 'auto':
+            return self._translate_per_teks(text, dest, src)
+        
+        # Bahasa sumber sudah pasti: gabungkan item per baris agar satu batch
+        # cukup satu round trip (per segmen maks_karakter)
+        baris = [' '.join(item.split()) for item in text]
+        hasil = []
+        for segmen in self._segmen(baris):
+            result = self.translator.translate('\n'.join(segmen), dest=dest, src=src)
+            terjemahan = result.text.split('\n')
+            if len(terjemahan) != len(segmen):
+                # Deterministik untuk segmen ini, jadi tidak di-retry: terjemahkan per item
+                logger.warning(f"Jumlah baris terjemahan tidak sesuai ({len(terjemahan)} != {len(segmen)}), "
+                               f"menerjemahkan per item")
+                hasil.extend(self._translate_per_teks(segmen, dest, src))
+                continue
+            confidence = (getattr(result, 'extra_data', None) or {}).get('confidence')
+            hasil.extend(HasilTerjemahan(t.strip(), result.src, dest, confidence) for t in terjemahan)
+        return hasil
+    
+    def _translate_per_teks(self, texts, dest, src):
+        """Satu request per teks, dijalankan bersamaan di thread pool backend"""
+        return list(self._executor.map(lambda text: self.translator.translate(text, dest=dest, src=src), texts))
+    
+    def _segmen(self, baris):
+        """Kelompokkan baris berurutan tanpa melewati maks_karakter per request"""
+        segmen, panjang = [], 0
+        for item in baris:
+            if segmen and panjang + len(item) + 1 > self.maks_karakter:
+                yield segmen
+                segmen, panjang = [], 0
+            segmen.append(item)
+            panjang += len(item) + 1
+        if segmen:
+            yield segmen
+
+class NoopTranslatorBackend(TranslatorBackend):
+    """Backend yang mengembalikan teks apa adanya"""
+    
+    nama = 'noop'
+    
+    def translate(self, text, dest='en', src='auto'):
+        if isinstance(text, list):
+            return [self.translate(item, dest, src) for item in text]
+        return HasilTerjemahan(text, None if src == 'auto' else src, dest)
+
+class OfflineTranslatorBackend(TranslatorBackend):
+    """
+    Translator offline Indonesia <-> Inggris berbasis tabel frasa dari lexicon.
+    Frasa terpanjang dicocokkan lebih dulu, kata yang tidak dikenal dibiarkan.
+    """
+    
+    nama = 'offline'
+    TANDA_BACA = ".,!?;:'\"()-"
+    
+    def __init__(self, kamus_en_id=None, kamus_id_en=None):
+        tabel_id_en = dict(FRASA_DASAR_ID_EN)
+        tabel_id_en.update(kamus_id_en or {})
+        for en, id_ in (kamus_en_id or {}).items():
+            tabel_id_en.setdefault(id_, en)
+        
+        tabel_en_id = dict(kamus_en_id or {})
+        for id_, en in tabel_id_en.items():
+            tabel_en_id.setdefault(en, id_)
+        
+        self.tabel = {('id', 'en'): tabel_id_en, ('en', 'id'): tabel_en_id}
+        self.max_frasa = max(len(frasa.split()) for tabel in self.tabel.values() for frasa in tabel)
+    
+    def _inti(self, token):
+        return token.strip(self.TANDA_BACA).lower()
+    
+    def _deteksi(self, tokens):
+        """Tebak bahasa dari jumlah kata yang dikenal di masing-masing tabel"""
+        inti = [self._inti(token) for token in tokens]
+        skor_id = sum(1 for kata in inti if kata in self.tabel[('id', 'en')])
+        skor_en = sum(1 for kata in inti if kata in self.tabel[('en', 'id')])
+        bahasa = 'id' if skor_id > skor_en else 'en'
+        confidence = max(skor_id, skor_en) / len(inti) if inti else 0.0
+        return bahasa, confidence
+    
+    def _terjemahkan(self, tokens, tabel):
+        inti = [self._inti(token) for token in tokens]
+        hasil = []
+        i = 0
+        while i < len(tokens):
+            for n in range(min(self.max_frasa, len(tokens) - i), 0, -1):
+                frasa = ' '.join(inti[i:i + n])
+                if frasa in tabel:
+                    # Pertahankan tanda baca di akhir frasa
+                    token_akhir = tokens[i + n - 1]
+                    hasil.append(tabel[frasa] + token_akhir[len(token_akhir.rstrip(self.TANDA_BACA)):])
+                    i += n
+                    break
+            else:
+                hasil.append(tokens[i])
+                i += 1
+        return ' '.join(hasil)
+    
+    def translate(self, text, dest='en', src='auto'):
+        if isinstance(text, list):
+            return [self.translate(item, dest, src) for item in text]
+        
+        tokens = text.split()
+        confidence = None
+        if src == 'auto':
+            src, confidence = self._deteksi(tokens)
+        
+        tabel = self.tabel.get((src, dest))
+        if tabel is None:
+            return HasilTerjemahan(text, src, dest, confidence)
+        return HasilTerjemahan(self._terjemahkan(tokens, tabel), src, dest, confidence)
+
+class CircuitBreaker:
+    """Hentikan pemanggilan backend yang gagal beruntun selama periode cooldown"""
+    
+    def __init__(self, threshold=TRANSLATOR_BREAKER_THRESHOLD, cooldown=TRANSLATOR_BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.gagal_beruntun = 0
+        self.dibuka_hingga = 0.0
+        self._lock = threading.Lock()
+    
+    def boleh_dipanggil(self):
+        """False selama breaker terbuka (masih dalam cooldown)"""
+        return time.monotonic() >= self.dibuka_hingga
+    
+    def catat_sukses(self):
+        with self._lock:
+            self.gagal_beruntun = 0
+    
+    def catat_gagal(self):
+        with self._lock:
+            self.gagal_beruntun += 1
+            if self.gagal_beruntun >= self.threshold:
+                # Setelah cooldown satu percobaan diizinkan; jika gagal lagi, buka kembali
+                self.dibuka_hingga = time.monotonic() + self.cooldown
+                logger.warning(f"Translator diputus selama {self.cooldown} detik setelah {self.gagal_beruntun} kegagalan beruntun")
+
+# -------------- BAGIAN CACHE TERJEMAHAN --------------
+
+class PenulisCache:
+    """
+    Tulis entri baru cache persisten secara berkelompok dari OS thread latar
+    belakang, sehingga cache miss di jalur predict tidak membayar commit
+    sendiri dan tidak berebut kunci writer dengan ResultWriter per entri.
+    Thread yang sama membuang entri lama agar tabel cache tidak tumbuh tanpa batas.
+    """
+    
+    def __init__(self, interval=CACHE_FLUSH_INTERVAL, interval_bersih=CACHE_BERSIH_INTERVAL):
+        self.interval = interval
+        self.interval_bersih = interval_bersih
+        self._cache = []
+        self._lock = threading.Lock()
+        self._thread = None
+    
+    def daftar(self, cache):
+        """Daftarkan cache yang punya simpan_tertunda() dan bersihkan(); thread dimulai saat pertama kali"""
+        with self._lock:
+            self._cache.append(cache)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name='penulis-cache', daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+    
+    def _loop(self):
+        berikutnya = time.monotonic()  # Pembersihan pertama segera setelah start
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+            if time.monotonic() >= berikutnya:
+                self.bersihkan()
+                berikutnya = time.monotonic() + self.interval_bersih
+    
+    def flush(self):
+        """Tulis semua entri yang masih tertunda di setiap cache"""
+        with self._lock:
+            semua_cache = list(self._cache)
+        for cache in semua_cache:
+            cache.simpan_tertunda()
+    
+    def bersihkan(self):
+        """Buang entri kedaluwarsa dan entri tertua di atas batas baris setiap cache"""
+        with self._lock:
+            semua_cache = list(self._cache)
+        for cache in semua_cache:
+            cache.bersihkan()
+
+penulis_cache = PenulisCache()
+
+class TranslationCache:
+    """
+    Cache terjemahan dua tingkat dengan key (teks, src, dest): LRU di memori
+    proses dan tabel `cache_terjemahan` di database SQLite
+    """
+    
+    def __init__(self, persisten=True, max_size=TRANSLATION_CACHE_SIZE,
+                 ttl=TRANSLATION_CACHE_TTL, db_ttl=TRANSLATION_CACHE_DB_TTL,
+                 db_maks=TRANSLATION_CACHE_DB_MAKS, pool=None):
+        self.pool = (pool or db_pool) if persisten else None  # None = hanya cache memori
+        self.max_size = max_size
+        self.ttl = ttl
+        self.db_ttl = db_ttl
+        self.db_maks = db_maks
+        
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        
+        # Counter hit/miss
+        self.hits_memori = 0
+        self.hits_disk = 0
+        self.misses = 0
+        
+        self._tertunda = {}  # key -> baris yang belum ditulis ke database
+        if self.pool:
+            self._init_tabel()
+        if self.pool:  # _init_tabel menonaktifkan cache persisten jika tabel gagal dibuat
+            penulis_cache.daftar(self)
+    
+    def _init_tabel(self):
+        """Buat tabel cache persisten jika belum ada"""
+        try:
+            with self.pool.writer() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+            CREATE TABLE IF NOT EXISTS cache_terjemahan (
+                teks TEXT NOT NULL,
+                src TEXT NOT NULL,
+                dest TEXT NOT NULL,
+                hasil TEXT NOT NULL,
+                dibuat REAL NOT NULL,
+                PRIMARY KEY (teks, src, dest)
+            )
+            ''')
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_cache_terjemahan_dibuat ON cache_terjemahan (dibuat)")
+        except Exception as e:
+            logger.warning(f"Cache terjemahan persisten dinonaktifkan: {str(e)}")
+            self.pool = None
+    
+    def _simpan_memori(self, key, hasil):
+        with self._lock:
+            self._lru[key] = (hasil, time.time() + self.ttl)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_size:
+                self._lru.popitem(last=False)
+    
+    def get(self, text, src, dest):
+        """Ambil terjemahan dari cache, return None jika tidak ada"""
+        key = (text, src, dest)
+        
+        # Tingkat 1: LRU memori
+        with self._lock:
+            entri = self._lru.get(key)
+            if entri is not None:
+                if entri[1] > time.time():
+                    self._lru.move_to_end(key)
+                    self.hits_memori += 1
+                    return entri[0]
+                del self._lru[key]
+        
+        # Tingkat 2: database
+        if self.pool:
+            try:
+                with self.pool.reader() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute(
+                        "SELECT hasil FROM cache_terjemahan WHERE teks = ? AND src = ? AND dest = ? AND dibuat >= ?",
+                        (text, src, dest, time.time() - self.db_ttl)
+                    )
+                    row = cursor.fetchone()
+                    cursor.close()  # Selesaikan statement sebelum reader kembali ke pool
+                if row is not None:
+                    self._simpan_memori(key, row[0])
+                    with self._lock:
+                        self.hits_disk += 1
+                    return row[0]
+            except Exception as e:
+                logger.warning(f"Gagal membaca cache terjemahan: {str(e)}")
+        
+        with self._lock:
+            self.misses += 1
+        return None
+    
+    def set(self, text, src, dest, hasil):
+        """Simpan terjemahan ke memori; database ditulis berkelompok oleh penulis_cache"""
+        self._simpan_memori((text, src, dest), hasil)
+        
+        if self.pool:
+            with self._lock:
+                if len(self._tertunda) < CACHE_TERTUNDA_MAKS:
+                    self._tertunda[(text, src, dest)] = (text, src, dest, hasil, time.time())
+    
+    def simpan_tertunda(self):
+        """Tulis entri baru yang belum tersimpan ke database dalam satu transaksi"""
+        with self._lock:
+            if not self._tertunda:
+                return
+            baris, self._tertunda = list(self._tertunda.values()), {}
+        
+        try:
+            with self.pool.writer() as conn:
+                with conn:
+                    conn.cursor().executemany(
+                        "INSERT OR REPLACE INTO cache_terjemahan (teks, src, dest, hasil, dibuat) VALUES (?, ?, ?, ?, ?)",
+                        baris
+                    )
+        except Exception as e:
+            logger.warning(f"Gagal menyimpan {len(baris)} entri cache terjemahan: {str(e)}")
+    
+    def bersihkan(self):
+        """
+        Hapus entri yang lebih tua dari db_ttl (tidak pernah terbaca lagi) dan
+        entri tertua di atas db_maks baris. Halaman yang dibebaskan dipakai ulang
+        SQLite, jadi ukuran file berhenti tumbuh.
+        """
+        try:
+            with self.pool.writer() as conn:
+                with conn:
+                    cursor = conn.cursor()
+                    cursor.execute("DELETE FROM cache_terjemahan WHERE dibuat < ?", (time.time() - self.db_ttl,))
+                    kedaluwarsa = conn.changes()
+                    cursor.execute(
+                        "DELETE FROM cache_terjemahan WHERE dibuat <= "
+                        "(SELECT dibuat FROM cache_terjemahan ORDER BY dibuat DESC LIMIT 1 OFFSET ?)",
+                        (self.db_maks,)
+                    )
+                    berlebih = conn.changes()
+            if kedaluwarsa or berlebih:
+                logger.info(f"Cache terjemahan dibersihkan: {kedaluwarsa} kedaluwarsa, {berlebih} di atas batas")
+        except Exception as e:
+            logger.warning(f"Gagal membersihkan cache terjemahan: {str(e)}")
+    
+    def stats(self):
+        """Statistik hit/miss cache"""
+        with self._lock:
+            total = self.hits_memori + self.hits_disk + self.misses
+            return {
+                'ukuran_memori': len(self._lru),
+                'hits_memori': self.hits_memori,
+                'hits_disk': self.hits_disk,
+                'misses': self.misses,
+                'tertunda': len(self._tertunda),
+                'hit_rate': (self.hits_memori + self.hits_disk) / total if total else 0.0
+            }
+
+# -------------- BAGIAN CACHE HASIL --------------
+
+def hitung_versi_hasil(paths, *ekstra):
+    """
+    Sidik jari isi file model/lexicon dan konfigurasi lain yang memengaruhi
+    hasil prediksi. Berubah begitu salah satu file berubah.
+    """
+    h = hashlib.blake2b(digest_size=8)
+    for path in paths:
+        if not path:
+            continue
+        h.update(path.encode('utf-8'))
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                for blok in iter(lambda: f.read(1 << 20), b''):
+                    h.update(blok)
+    for nilai in ekstra:
+        h.update(str(nilai).encode('utf-8'))
+    return h.hexdigest()
+
+def kunci_teks(text):
+    """Hash teks yang sudah dinormalisasi (NFC, spasi dirapikan)"""
+    normal = ' '.join(unicodedata.normalize('NFC', text).split())
+    return hashlib.blake2b(normal.encode('utf-8'), digest_size=16).hexdigest()
+
+class PredictionCache:
+    """
+    Cache hasil prediksi berbasis isi teks: LRU di memori proses dan tabel
+    `cache_prediksi` di database SQLite. Entri terikat pada versi model/lexicon;
+    entri versi lain dibuang saat cache dibuat, entri kedaluwarsa dan entri di
+    atas batas baris dibuang berkala oleh penulis_cache.
+    """
+    
+    def __init__(self, versi, persisten=RESULT_CACHE_PERSISTEN, max_size=RESULT_CACHE_SIZE,
+                 db_ttl=RESULT_CACHE_DB_TTL, db_maks=RESULT_CACHE_DB_MAKS, pool=None):
+        self.versi = versi
+        self.pool = (pool or db_pool) if persisten else None  # None = hanya cache memori
+        self.max_size = max_size
+        self.db_ttl = db_ttl
+        self.db_maks = db_maks
+        
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        
+        # Counter hit/miss
+        self.hits_memori = 0
+        self.hits_disk = 0
+        self.misses = 0
+        
+        self._tertunda = {}  # kunci -> baris yang belum ditulis ke database
+        if self.pool:
+            self._init_tabel()
+        if self.pool:  # _init_tabel menonaktifkan cache persisten jika tabel gagal dibuat
+            penulis_cache.daftar(self)
+    
+    def _init_tabel(self):
+        """Buat tabel cache persisten dan buang entri dari versi lain"""
+        try:
+            with self.pool.writer() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+            CREATE TABLE IF NOT EXISTS cache_prediksi (
+                kunci TEXT NOT NULL,
+                versi TEXT NOT NULL,
+                hasil TEXT NOT NULL,
+                dibuat REAL NOT NULL,
+                PRIMARY KEY (kunci, versi)
+            )
+            ''')
+                cursor.execute("CREATE INDEX IF NOT EXISTS idx_cache_prediksi_dibuat ON cache_prediksi (dibuat)")
+                cursor.execute("DELETE FROM cache_prediksi WHERE versi != ?", (self.versi,))
+                dibuang = conn.changes()
+            if dibuang:
+                logger.info(f"{dibuang} entri cache prediksi dari versi lain dibuang")
+        except Exception as e:
+            logger.warning(f"Cache prediksi persisten dinonaktifkan: {str(e)}")
+            self.pool = None
+    
+    def _simpan_memori(self, kunci, hasil):
+        with self._lock:
+            self._lru[kunci] = hasil
+            self._lru.move_to_end(kunci)
+            while len(self._lru) > self.max_size:
+                self._lru.popitem(last=False)
+    
+    def get(self, kunci):
+        """Ambil salinan hasil prediksi (tanpa timestamp), return None jika tidak ada"""
+        # Tingkat 1: LRU memori
+        with self._lock:
+            hasil = self._lru.get(kunci)
+            if hasil is not None:
+                self._lru.move_to_end(kunci)
+                self.hits_memori += 1
+                return dict(hasil)
+        
+        # Tingkat 2: database
+        if self.pool:
+            try:
+                with self.pool.reader() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute(
+                        "SELECT hasil FROM cache_prediksi WHERE kunci = ? AND versi = ? AND dibuat >= ?",
+                        (kunci, self.versi, time.time() - self.db_ttl)
+                    )
+                    row = cursor.fetchone()
+                    cursor.close()  # Selesaikan statement sebelum reader kembali ke pool
+                if row is not None:
+                    hasil = json.loads(row[0])
+                    self._simpan_memori(kunci, hasil)
+                    with self._lock:
+                        self.hits_disk += 1
+                    return dict(hasil)
+            except Exception as e:
+                logger.warning(f"Gagal membaca cache prediksi: {str(e)}")
+        
+        with self._lock:
+            self.misses += 1
+        return None
+    
+    def set(self, kunci, hasil):
+        """
+        Simpan hasil prediksi (timestamp tidak ikut disimpan) ke memori;
+        database ditulis berkelompok oleh penulis_cache
+        """
+        hasil = {k: v for k, v in hasil.items() if k != 'timestamp'}
+        self._simpan_memori(kunci, hasil)
+        
+        if self.pool:
+            with self._lock:
+                if len(self._tertunda) < CACHE_TERTUNDA_MAKS:
+                    self._tertunda[kunci] = (kunci, self.versi, json.dumps(hasil), time.time())
+    
+    def simpan_tertunda(self):
+        """Tulis entri baru yang belum tersimpan ke database dalam satu transaksi"""
+        with self._lock:
+            if not self._tertunda:
+                return
+            baris, self._tertunda = list(self._tertunda.values()), {}
+        
+        try:
+            with self.pool.writer() as conn:
+                with conn:
+                    conn.cursor().executemany(
+                        "INSERT OR REPLACE INTO cache_prediksi (kunci, versi, hasil, dibuat) VALUES (?, ?, ?, ?)",
+                        baris
+                    )
+        except Exception as e:
+            logger.warning(f"Gagal menyimpan {len(baris)} entri cache prediksi: {str(e)}")
+    
+    def bersihkan(self):
+        """Hapus entri yang lebih tua dari db_ttl dan entri tertua di atas db_maks baris"""
+        try:
+            with self.pool.writer() as conn:
+                with conn:
+                    cursor = conn.cursor()
+                    cursor.execute("DELETE FROM cache_prediksi WHERE dibuat < ?", (time.time() - self.db_ttl,))
+                    kedaluwarsa = conn.changes()
+                    cursor.execute(
+                        "DELETE FROM cache_prediksi WHERE dibuat <= "
+                        "(SELECT dibuat FROM cache_prediksi ORDER BY dibuat DESC LIMIT 1 OFFSET ?)",
+                        (self.db_maks,)
+                    )
+                    berlebih = conn.changes()
+            if kedaluwarsa or berlebih:
+                logger.info(f"Cache prediksi dibersihkan: {kedaluwarsa} kedaluwarsa, {berlebih} di atas batas")
+        except Exception as e:
+            logger.warning(f"Gagal membersihkan cache prediksi: {str(e)}")
+    
+    def stats(self):
+        """Statistik hit/miss cache"""
+        with self._lock:
+            total = self.hits_memori + self.hits_disk + self.misses
+            return {
+                'versi': self.versi,
+                'ukuran_memori': len(self._lru),
+                'hits_memori': self.hits_memori,
+                'hits_disk': self.hits_disk,
+                'misses': self.misses,
+                'tertunda': len(self._tertunda),
+                'hit_rate': (self.hits_memori + self.hits_disk) / total if total else 0.0
+            }
+
+# -------------- BAGIAN LEXICON --------------
+
+def baca_csv(path):
+    """Baca file CSV kecil (lexicon) sebagai list dictionary per baris"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+def tulis_daftar_kata(path, words):
+    """Tulis daftar kata ke CSV dengan satu kolom 'word'"""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['word'])
+        writer.writerows([word] for word in sorted(words))
+
+# Kata negasi yang membalik polaritas hit lexicon di dekatnya
+KATA_NEGASI = {
+    'not', 'no', 'never', "don't", "doesn't", "didn't", "isn't", "wasn't", "aren't",
+    "won't", "can't", 'cannot', 'tidak', 'tak', 'bukan', 'jangan', 'belum', 'kurang'
+}
+NEGASI_JENDELA = 2  # Jumlah token sebelum hit yang diperiksa untuk negasi
+
+class LexiconMatcher:
+    """
+    Automaton Aho-Corasick di level token untuk menemukan semua entri lexicon,
+    baik satu kata maupun frasa (mis. 'luar biasa'), dalam satu lintasan teks
+    """
+    
+    def __init__(self, lexicon):
+        """
+        Args:
+            lexicon: Dictionary {frasa: polaritas} dengan polaritas 'positif'/'negatif'
+        """
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]  # Per state: list (panjang, frasa, polaritas)
+        
+        for frasa, polaritas in lexicon.items():
+            tokens = frasa.split()
+            if not tokens:
+                continue
+            state = 0
+            for token in tokens:
+                berikut = self.goto[state].get(token)
+                if berikut is None:
+                    berikut = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][token] = berikut
+                state = berikut
+            self.output[state].append((len(tokens), frasa, polaritas))
+        
+        # Bangun failure link secara BFS
+        antrian = deque(self.goto[0].values())
+        while antrian:
+            state = antrian.popleft()
+            for token, anak in self.goto[state].items():
+                antrian.append(anak)
+                f = self.fail[state]
+                while f and token not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[anak] = self.goto[f].get(token, 0)
+                self.output[anak] = self.output[anak] + self.output[self.fail[anak]]
+    
+    def cari(self, tokens):
+        """
+        Cari hit lexicon pada list token (sudah lowercase dan tanpa tanda baca)
+        
+        Returns:
+            List (awal, akhir, frasa, polaritas) yang tidak saling tumpang tindih,
+            memilih hit paling kiri lalu paling panjang
+        """
+        hits = []
+        state = 0
+        for i, token in enumerate(tokens):
+            while state and token not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(token, 0)
+            for panjang, frasa, polaritas in self.output[state]:
+                hits.append((i - panjang + 1, i + 1, frasa, polaritas))
+        
+        hits.sort(key=lambda hit: (hit[0], hit[0] - hit[1]))
+        terpilih = []
+        akhir_terakhir = 0
+        for hit in hits:
+            if hit[0] >= akhir_terakhir:
+                terpilih.append(hit)
+                akhir_terakhir = hit[1]
+        return terpilih
+
+def tokenisasi(text):
+    """Pecah teks menjadi list (token, posisi_awal, posisi_akhir) tanpa tanda baca"""
+    return [(m.group(), m.start(), m.end()) for m in re.finditer(r"\w+(?:'\w+)*", text)]
+
+@lru_cache(maxsize=100000)
+def hash_stabil(word):
+    """Hash kata ke [0, 1) yang sama di semua proses (hash() bawaan diacak per proses)"""
+    return zlib.crc32(word.encode('utf-8')) % 10000 / 10000
+
+def ada_negasi(tokens, awal):
+    """Cek apakah ada kata negasi dalam NEGASI_JENDELA token sebelum posisi awal"""
+    return any(token in KATA_NEGASI for token in tokens[max(0, awal - NEGASI_JENDELA):awal])
+
+# -------------- BAGIAN PROFANITY --------------
+
+class ProfanityIndex:
+    """
+    Indeks kata kotor gabungan (better_profanity, profanityfilter dan kata kustom)
+    yang dibangun sekali saat startup. Satu lintasan teks menjawab apakah ada kata
+    kotor, kata apa saja, dan di posisi mana.
+    """
+    
+    def __init__(self, kata):
+        self.kata = {k.lower().strip() for k in kata if k and k.strip()}
+        self.matcher = LexiconMatcher({k: 'profanity' for k in self.kata})
+    
+    def cari(self, text):
+        """
+        Cari semua kata kotor dalam teks
+        
+        Returns:
+            List dictionary berisi kata, indeks token (awal, akhir) dan posisi
+            karakter (awal, akhir) di teks
+        """
+        tokens = tokenisasi(text.lower())
+        return [{
+            'kata': frasa,
+            'token': (awal, akhir),
+            'posisi': (tokens[awal][1], tokens[akhir - 1][2])
+        } for awal, akhir, frasa, _ in self.matcher.cari([token for token, _, _ in tokens])]
+    
+    def contains(self, text):
+        return bool(self.cari(text))
+
+def muat_kata_profanity(custom_badwords):
+    """Gabungkan daftar kata kotor dari kedua library dan daftar kustom"""
+    kata = set(custom_badwords)
+    
+    # Daftar bawaan better_profanity (file wordlist di dalam paketnya)
+    try:
+        import better_profanity
+        wordlist = os.path.join(os.path.dirname(better_profanity.__file__), 'profanity_wordlist.txt')
+        with open(wordlist, encoding='utf-8') as f:
+            kata.update(line.strip() for line in f)
+    except Exception as e:
+        logger.warning(f"Gagal memuat daftar better_profanity: {str(e)}")
+    
+    # Daftar bawaan profanityfilter
+    try:
+        from profanityfilter import ProfanityFilter
+        kata.update(ProfanityFilter().get_profane_words())
+    except Exception as e:
+        logger.warning(f"Gagal memuat daftar profanityfilter: {str(e)}")
+    
+    return kata
+
 # -------------- BAGIAN MODEL SENTIMENT --------------
 
+class InterpreterPool:
+    """
+    Pool interpreter TFLite yang sudah dialokasikan dengan semantik checkout/checkin.
+    Setiap slot berisi satu interpreter per ukuran bucket yang tensornya sudah
+    dialokasikan saat start, sehingga inferensi tidak pernah memanggil
+    resize_tensor_input/allocate_tensors.
+    """
+    
+    def __init__(self, model_path, size=None, num_threads=None, bucket=INTERPRETER_BUCKET):
+        self.size = max(1, size or INTERPRETER_POOL_SIZE)
+        self.num_threads = num_threads or INTERPRETER_NUM_THREADS
+        self.bucket = sorted(set(bucket))
+        self._tersedia = queue.Queue()
+        
+        import tflite_runtime.interpreter as tflite
+        for _ in range(self.size):
+            slot = {}
+            for ukuran in self.bucket:
+                interpreter = tflite.Interpreter(model_path=model_path, num_threads=self.num_threads)
+                input_details = interpreter.get_input_details()
+                for input_detail in input_details:
+                    interpreter.resize_tensor_input(input_detail['index'], [ukuran] + list(input_detail['shape'][1:]))
+                interpreter.allocate_tensors()
+                slot[ukuran] = interpreter
+            self._tersedia.put(slot)
+        
+        logger.info(f"Pool interpreter siap: {self.size} slot x bucket {self.bucket}, "
+                    f"{self.num_threads} thread/interpreter")
+    
+    @property
+    def bucket_maks(self):
+        return self.bucket[-1]
+    
+    def ukuran_bucket(self, n):
+        """Bucket terkecil yang memuat n teks (n tidak boleh melebihi bucket_maks)"""
+        return next(ukuran for ukuran in self.bucket if ukuran >= n)
+    
+    @contextmanager
+    def checkout(self, ukuran=None, timeout=None):
+        """
+        Pinjam satu slot secara eksklusif dan berikan interpreter untuk bucket
+        ukuran (default bucket terkecil), dikembalikan otomatis setelah selesai
+        """
+        slot = self._tersedia.get(timeout=timeout)
+        try:
+            yield slot[ukuran or self.bucket[0]]
+        finally:
+            self._tersedia.put(slot)
+
 class SentimenModel:
-    def __init__(self, model_path, vocab_path=None, max_length=256):
+    def __init__(self, model_path, vocab_path=None, max_length=256, pool_size=None, num_threads=None,
+                 translator_backend=TRANSLATOR_BACKEND, cache_persisten=True):
         try:
             # Inisialisasi parameter dasar
             self.max_length = max_length
@@ -74,30 +1385,45 @@ class SentimenModel:
             if not os.path.exists(model_path):
                 raise FileNotFoundError(f"File model tidak ditemukan: {model_path}")
             
-            # Load model TFLite
-            self.interpreter = tflite.Interpreter(model_path=model_path)
-            self.interpreter.allocate_tensors()
+            # Load model TFLite ke dalam pool interpreter
+            self.interpreter_pool = InterpreterPool(model_path, pool_size, num_threads)
             
             # Dapatkan input/output details
-            self.input_details = self.interpreter.get_input_details()
-            self.output_details = self.interpreter.get_output_details()
+            with self.interpreter_pool.checkout() as interpreter:
+                self.input_details = interpreter.get_input_details()
+                self.output_details = interpreter.get_output_details()
             
             # Load preprocessor jika ada
             if vocab_path and os.path.exists(vocab_path):
+                import joblib
                 with open(vocab_path, 'rb') as f:
                     self.preprocessor = joblib.load(f)
+            self.vocab, self.vocab_oov = self.load_vocab()
+            self._lokal = threading.local()  # Buffer input per thread
                 
-            logger.info(f"Model berhasil dimuat. Max length: {self.max_length}")
-            
-            # Inisialisasi translator
-            self.translator = Translator()
+            logger.info(f"Model berhasil dimuat. Max length: {self.max_length}, "
+                        f"tokenizer: {'vocabulary' if self.vocab is not None else 'hash'}")
             
             # Load lexicon sentimen
             self.positive_words = self.load_positive_words()
             self.negative_words = self.load_negative_words()
+            self.kamus_positif_id = self.load_kamus_positif()
+            self.kamus_negatif_en = self.load_kamus_negatif()
+            self.lexicon_matcher = self.buat_lexicon_matcher()
+            
+            # Inisialisasi translator dan cache-nya
+            self.translator, self.translator_cadangan = self.buat_translator(translator_backend)
+            self.translator_breaker = CircuitBreaker()
+            self.translation_cache = TranslationCache(persisten=cache_persisten, pool=db_pool)
             
             # Tambahkan kustom profanity filter
-            self.setup_profanity_filter()
+            self.profanity_index = self.setup_profanity_filter()
+            
+            # Cache hasil prediksi, otomatis tidak berlaku jika model/lexicon berubah
+            self.result_cache = PredictionCache(
+                hitung_versi_hasil([model_path, vocab_path, *LEXICON_FILES], translator_backend, RESULT_CACHE_SKEMA),
+                persisten=cache_persisten and RESULT_CACHE_PERSISTEN
+            )
             
         except Exception as e:
             logger.error(f"Gagal memuat model: {str(e)}")
@@ -107,18 +1433,19 @@ class SentimenModel:
         logger.info(f"Output details: {self.output_details}")
     
     def setup_profanity_filter(self):
-        """Setup profanity filter dengan kata-kata kustom"""
+        """Bangun indeks profanity gabungan dengan kata-kata kustom"""
         custom_badwords = ['idiot', 'stupid', 'hate', 'terrible', 'awful', 'worst', 
                           'jelek', 'buruk', 'bodoh', 'tolol', 'menyebalkan']
-        profanity.load_censor_words(custom_badwords)
+        index = ProfanityIndex(muat_kata_profanity(custom_badwords))
+        logger.info(f"Indeks profanity berisi {len(index.kata)} kata")
+        return index
     
     def load_positive_words(self):
         """Load daftar kata positif dari file atau buat baru"""
         try:
             # Coba load dari file
             if os.path.exists('positive_words.csv'):
-                df = pd.read_csv('positive_words.csv')
-                word_set = set(df['word'].str.lower().tolist())
+                word_set = {row['word'].lower() for row in baca_csv('positive_words.csv') if row.get('word')}
             else:
                 # Buat file baru
                 word_set = {
@@ -132,7 +1459,7 @@ class SentimenModel:
                 }
                 
                 # Simpan ke file untuk penggunaan selanjutnya
-                pd.DataFrame({'word': list(word_set)}).to_csv('positive_words.csv', index=False)
+                tulis_daftar_kata('positive_words.csv', word_set)
             
             return word_set
             
@@ -141,13 +1468,62 @@ class SentimenModel:
             # Return default fallback
             return {'good', 'great', 'excellent', 'amazing', 'wonderful', 'baik', 'bagus', 'hebat'}
     
+    def load_kamus_positif(self):
+        """Load kamus Inggris -> Indonesia dari kolom terjemahan_id di positive_words.csv"""
+        try:
+            if os.path.exists('positive_words.csv'):
+                return {
+                    row['word'].lower(): row['terjemahan_id'].lower()
+                    for row in baca_csv('positive_words.csv')
+                    if row.get('word') and row.get('terjemahan_id')
+                }
+            return {}
+        except Exception as e:
+            logger.error(f"Gagal memuat kamus kata positif: {str(e)}")
+            return {}
+    
+    def buat_lexicon_matcher(self):
+        """Compile kata positif dan negatif menjadi satu automaton pencocokan"""
+        lexicon = {word: 'positif' for word in self.positive_words}
+        lexicon.update({word: 'negatif' for word in self.negative_words})
+        return LexiconMatcher(lexicon)
+    
+    def load_kamus_negatif(self):
+        """Load kamus Indonesia -> Inggris dari kolom terjemahan_en di negative_words.csv"""
+        try:
+            if os.path.exists('negative_words.csv'):
+                return {
+                    row['word'].lower(): row['terjemahan_en'].lower()
+                    for row in baca_csv('negative_words.csv')
+                    if row.get('word') and row.get('terjemahan_en')
+                }
+            return {}
+        except Exception as e:
+            logger.error(f"Gagal memuat kamus kata negatif: {str(e)}")
+            return {}
+    
+    def buat_translator(self, nama):
+        """
+        Buat backend translator sesuai konfigurasi
+        
+        Returns:
+            Tuple (backend utama, backend cadangan atau None)
+        """
+        offline = OfflineTranslatorBackend(self.kamus_positif_id, self.kamus_negatif_en)
+        if nama == 'offline':
+            return offline, None
+        if nama == 'noop':
+            return NoopTranslatorBackend(), None
+        if nama != 'google':
+            logger.warning(f"Backend translator tidak dikenal: {nama}, memakai google")
+        return GoogleTranslatorBackend(), offline
+    
     def load_negative_words(self):
         """Load daftar kata negatif dari file atau buat baru"""
         try:
             # Coba load dari file
             if os.path.exists('negative_words.csv'):
-                df = pd.read_csv('negative_words.csv')
-                word_set = set(df['word'].str.lower().tolist())
+                word_set = {row['word'].lower() for row in baca_csv('negative_words.csv') if row.get('word')}
             else:
                 # Buat file baru
                 word_set = {
@@ -160,7 +1536,7 @@ class SentimenModel:
                 }
                 
                 # Simpan ke file untuk penggunaan selanjutnya
-                pd.DataFrame({'word': list(word_set)}).to_csv('negative_words.csv', index=False)
+                tulis_daftar_kata('negative_words.csv', word_set)
             
             return word_set
             
@@ -169,49 +1545,220 @@ class SentimenModel:
             # Return default fallback
             return {'bad', 'terrible', 'awful', 'horrible', 'buruk', 'jelek', 'mengecewakan'}
     
-    def translate_text(self, text, dest='en', src='auto'):
-        """Terjemahkan teks ke bahasa target dengan error handling"""
-        try:
-            for _ in range(3):  # Coba 3 kali
+    def _translate_dengan_retry(self, text, dest, src, batas_waktu=None):
+        """
+        Panggil translator utama dengan retry dan backoff eksponensial (kecuali
+        circuit breaker terbuka), lalu translator cadangan jika gagal
+        
+        Args:
+            batas_waktu: Deadline time.monotonic() untuk request ini (opsional)
+        
+        Returns:
+            Tuple (hasil, boleh_cache). hasil bernilai None jika semua backend gagal.
+        """
+        if self.translator_breaker.boleh_dipanggil():
+            gagal = False
+            for percobaan in range(TRANSLATOR_RETRY):
+                if batas_waktu is not None and time.monotonic() >= batas_waktu:
+                    logger.warning("Batas waktu terjemahan habis, memakai fallback")
+                    break
                 try:
-                    result = self.translator.translate(text, dest=dest, src=src)
-                    return result.text
+                    # Panggilan HTTP dijalankan di luar hub eventlet
+                    result = jalankan_blocking(self.translator.translate, text, dest=dest, src=src)
+                    self.translator_breaker.catat_sukses()
+                    return result, self.translator.cacheable
                 except Exception as e:
+                    gagal = True
+                    METRIK_TRANSLATOR_GAGAL.inc(self.translator.nama)
                     logger.warning(f"Gagal menerjemahkan, mencoba lagi: {str(e)}")
-                    time.sleep(1)  # Tunggu sejenak sebelum coba lagi
+                    if percobaan < TRANSLATOR_RETRY - 1:
+                        # Backoff eksponensial dengan full jitter, tidak melewati deadline
+                        jeda = random.uniform(0, min(TRANSLATOR_BACKOFF_MAX, TRANSLATOR_BACKOFF_BASE * 2 ** percobaan))
+                        if batas_waktu is not None:
+                            jeda = min(jeda, max(0.0, batas_waktu - time.monotonic()))
+                        tidur_kooperatif(jeda)
+            # Deadline yang habis sebelum backend dipanggil bukan kegagalan backend
+            if gagal:
+                self.translator_breaker.catat_gagal()
+        
+        if self.translator_cadangan is not None:
+            METRIK_FALLBACK.inc('translator_cadangan')
+            try:
+                return self.translator_cadangan.translate(text, dest=dest, src=src), False
+            except Exception as e:
+                METRIK_TRANSLATOR_GAGAL.inc(self.translator_cadangan.nama)
+                logger.warning(f"Translator cadangan gagal: {str(e)}")
+        return None, False
+    
+    def translate_text(self, text, dest='en', src='auto', batas_waktu=None):
+        """Terjemahkan teks ke bahasa target dengan error handling"""
+        cached = self.translation_cache.get(text, src, dest)
+        if cached is not None:
+            return cached
+        
+        try:
+            result, boleh_cache = self._translate_dengan_retry(text, dest, src, batas_waktu)
+            if result is not None:
+                if boleh_cache:
+                    self.translation_cache.set(text, src, dest, result.text)
+                return result.text
             
             # Fallback: gunakan API alternatif atau hanya return teks asli
             return text
         except:
             return text
     
-    def analyze_sentiment_lexicon(self, text):
-        """Analisis sentimen berdasarkan lexicon (kamus kata)"""
-        text_translate = self.translate_text(text)
+    def translate_batch(self, texts, dest='en', src='auto', kamus=None, batas_waktu=None):
+        """
+        Terjemahkan banyak teks sekaligus dengan satu panggilan translator
+        
+        Args:
+            texts: List teks yang akan diterjemahkan
+            dest: Bahasa tujuan
+            src: Bahasa sumber
+            kamus: Dictionary fallback {teks: terjemahan} jika translator gagal
+            batas_waktu: Deadline time.monotonic() untuk request ini (opsional)
+            
+        Returns:
+            List terjemahan dengan urutan yang sama seperti input
+        """
+        terjemahan = {}
+        belum_ada = []
+        for text in dict.fromkeys(texts):  # Unik, urutan tetap
+            cached = self.translation_cache.get(text, src, dest)
+            if cached is not None:
+                terjemahan[text] = cached
+            else:
+                belum_ada.append(text)
+        
+        if belum_ada:
+            try:
+                results, boleh_cache = self._translate_dengan_retry(belum_ada, dest, src, batas_waktu)
+                if results is not None:
+                    for text, result in zip(belum_ada, results):
+                        terjemahan[text] = result.text
+                        if boleh_cache:
+                            self.translation_cache.set(text, src, dest, result.text)
+            except Exception as e:
+                logger.warning(f"Gagal menerjemahkan batch: {str(e)}")
+        
+        # Fallback: kamus bilingual, lalu teks asli
+        kamus = kamus or {}
+        return [terjemahan.get(text, kamus.get(text.lower(), text)) for text in texts]
+    
+    def resolve_language(self, text, batas_waktu=None):
+        """
+        Deteksi bahasa sekaligus terjemahkan ke bahasa Inggris dalam satu
+        panggilan translator
+        
+        Returns:
+            Dictionary berisi bahasa terdeteksi, confidence dan teks bahasa Inggris.
+            Jika translator gagal, teks asli dipakai dan bahasa bernilai None.
+        """
+        return self.resolve_language_batch([text], batas_waktu)[0]
+    
+    def resolve_language_batch(self, texts, batas_waktu=None):
+        """
+        Versi batch resolve_language: semua teks yang belum ada di cache
+        dideteksi dan diterjemahkan dengan satu panggilan translator
+        
+        Returns:
+            List dictionary resolusi dengan urutan yang sama seperti input
+        """
+        return self._resolve_language_batch(texts, batas_waktu)[0]
+    
+    def _resolve_language_batch(self, texts, batas_waktu=None):
+        """
+        Returns:
+            Tuple (list resolusi, set teks yang resolusinya andal). Resolusi
+            dari translator cadangan atau fallback teks asli tidak andal.
+        """
+        resolusi = {}
+        andal = set()
+        belum_ada = []
+        for text in dict.fromkeys(texts):  # Unik, urutan tetap
+            cached = self.translation_cache.get(text, 'auto', RESOLUSI_CACHE_DEST)
+            if cached is not None:
+                resolusi[text] = json.loads(cached)
+                andal.add(text)
+            else:
+                belum_ada.append(text)
+        
+        if belum_ada:
+            try:
+                results, boleh_cache = self._translate_dengan_retry(belum_ada, 'en', 'auto', batas_waktu)
+                if results is not None:
+                    # Tanpa translator cadangan, hasil berasal dari backend utama
+                    if boleh_cache or self.translator_cadangan is None:
+                        andal.update(belum_ada)
+                    for text, result in zip(belum_ada, results):
+                        extra_data = getattr(result, 'extra_data', None) or {}
+                        resolusi[text] = {
+                            'bahasa': result.src,
+                            'confidence': extra_data.get('confidence'),
+                            'teks_inggris': result.text
+                        }
+                        if boleh_cache:
+                            self.translation_cache.set(text, 'auto', RESOLUSI_CACHE_DEST, json.dumps(resolusi[text]))
+            except Exception as e:
+                logger.warning(f"Gagal mendeteksi bahasa, melanjutkan dengan teks asli: {str(e)}")
+        
+        return [
+            resolusi.get(text, {'bahasa': None, 'confidence': None, 'teks_inggris': text})
+            for text in texts
+        ], andal & resolusi.keys()
+    
+    def analyze_sentiment_lexicon(self, text, resolusi=None, batas_waktu=None, profanity_hits=None):
+        """
+        Analisis sentimen berdasarkan lexicon (kamus kata)
+        
+        Args:
+            text: Teks yang akan dianalisis
+            resolusi: Hasil resolve_language untuk teks ini (opsional). Jika ada,
+                teks bahasa Inggris diambil dari sini tanpa memanggil translator lagi.
+            batas_waktu: Deadline time.monotonic() untuk panggilan translator (opsional)
+            profanity_hits: Hasil profanity_index.cari untuk teks bahasa Inggris (opsional)
+        """
+        if resolusi is None:
+            resolusi = self.resolve_language(text, batas_waktu)
+        text_translate = resolusi['teks_inggris']
         text_lower = text_translate.lower()
-        words = text_lower.split()
+        tokens = [token for token, _, _ in tokenisasi(text_lower)]
+        if profanity_hits is None:
+            profanity_hits = self.profanity_index.cari(text_translate)
         
         positive_count = 0
         negative_count = 0
         positive_found = []
+        posisi_negatif = set()
         
-        for word in words:
-            word = word.strip(".,!?;:'\"()-")
-            new_word=pf_extended.censor(word)
-            if new_word in self.positive_words:
+        # Semua hit kata dan frasa lexicon dalam satu lintasan
+        with tahap('lexicon'):
+            hits = self.lexicon_matcher.cari(tokens)
+        for awal, akhir, frasa, polaritas in hits:
+            if ada_negasi(tokens, awal):
+                polaritas = 'negatif' if polaritas == 'positif' else 'positif'
+            if polaritas == 'positif':
                 positive_count += 1
-                positive_found.append(word)
-            if "*" in new_word:
+                positive_found.append(frasa)
+            else:
+                negative_count += 1
+                posisi_negatif.update(range(awal, akhir))
+        
+        # Kata kotor yang belum terhitung sebagai hit lexicon negatif
+        for hit in profanity_hits:
+            if hit['token'][0] not in posisi_negatif:
                 negative_count += 1
         
         # Deteksi profanity
-        has_profanity = profanity.contains_profanity(text)
+        has_profanity = bool(profanity_hits) or (text != text_translate and self.profanity_index.contains(text))
         if has_profanity:
             negative_count += 2  # Berikan bobot lebih untuk kata-kata kotor
         
-        # Evaluasi TextBlob (sebagai faktor tambahan)
-        blob = TextBlob(text)
-        polarity = blob.sentiment.polarity
+        # Evaluasi TextBlob (sebagai faktor tambahan), diimpor saat pemanasan model
+        from textblob import TextBlob
+        with tahap('textblob'):
+            polarity = TextBlob(text).sentiment.polarity
         
         # Logika kombinasi
         if negative_count > positive_count or polarity < -0.3:
@@ -228,22 +1775,265 @@ class SentimenModel:
             "label": label,
             "skor": min(0.99, confidence),
             "positive_words": positive_found,
-            "translations": [self.translate_text(word, dest='id', src='en') 
-                           if len(word) > 1 else word for word in positive_found]
+            "translations": self.translate_positive_words(positive_found, batas_waktu)
         }
     
+    def translate_positive_words(self, words, batas_waktu=None):
+        """Terjemahkan balik kata positif ke bahasa Indonesia dalam satu panggilan"""
+        kata = [word for word in words if len(word) > 1]
+        with tahap('terjemahan_kata'):
+            terjemahan = dict(zip(kata, self.translate_batch(kata, dest='id', src='en', kamus=self.kamus_positif_id,
+                                                             batas_waktu=batas_waktu)))
+        return [terjemahan.get(word, word) for word in words]
+    
+    def load_vocab(self):
+        """
+        Ambil mapping kata -> indeks dari preprocessor joblib (dict, tokenizer
+        Keras dengan word_index, atau vectorizer sklearn dengan vocabulary_)
+        
+        Returns:
+            Tuple (vocab, indeks_oov). vocab None jika tidak ada preprocessor.
+        """
+        if self.preprocessor is None:
+            return None, 0
+        
+        vocab = self.preprocessor if isinstance(self.preprocessor, dict) else None
+        for atribut in ('word_index', 'vocabulary_', 'vocab'):
+            if vocab is None and isinstance(getattr(self.preprocessor, atribut, None), dict):
+                vocab = getattr(self.preprocessor, atribut)
+        
+        if vocab is None:
+            logger.warning(f"Format preprocessor tidak dikenali ({type(self.preprocessor).__name__}), memakai hash")
+            return None, 0
+        
+        oov_token = getattr(self.preprocessor, 'oov_token', None) or '<OOV>'
+        return vocab, vocab.get(oov_token, 0)
+    
+    def _nilai_token(self, word):
+        """Nilai input model untuk satu kata"""
+        if self.vocab is not None:
+            return self.vocab.get(word, self.vocab_oov)
+        return hash_stabil(word)
+    
+    def preprocess_batch(self, texts, out=None):
+        """
+        Ubah list teks menjadi tensor input (N, max_length) float32
+        
+        Args:
+            texts: List teks
+            out: Buffer float32 yang sudah dialokasikan dengan minimal N baris (opsional)
+        """
+        n = len(texts)
+        if out is None or out.shape[0] < n:
+            out = np.zeros((n, self.max_length), dtype=np.float32)
+        else:
+            out = out[:n]
+            out.fill(0)
+        
+        # Kumpulkan semua (baris, kolom, nilai) lalu isi buffer dalam satu operasi
+        baris, kolom, nilai = [], [], []
+        for i, text in enumerate(texts):
+            words = text.lower().split()[:self.max_length]
+            baris.extend([i] * len(words))
+            kolom.extend(range(len(words)))
+            nilai.extend(map(self._nilai_token, words))
+        
+        if nilai:
+            out[baris, kolom] = nilai
+        return out
+    
     def preprocess_text(self, text):
         """Implementasi yang sesuai dengan bentuk input model"""
-        logger.info(f"Preprocessing text dengan max length: {self.max_length}")
-        words = text.lower().split()
+        return [self.preprocess_batch([text])]  # Kembalikan sebagai list tensor
     
-        # Sesuaikan dengan bentuk yang diharapkan model
-        tokens = np.zeros((1, self.max_length), dtype=np.float32)
+    def pemanasan(self):
+        """
+        Jalankan sekali tahap-tahap lokal (interpreter, lexicon, profanity,
+        TextBlob) agar request pertama tidak menanggung biaya inisialisasi.
+        Translator dan cache tidak disentuh.
+        """
+        from textblob import TextBlob
+        
+        contoh = 'this product is really good'
+        self._jalankan_model([contoh])
+        self.lexicon_matcher.cari([token for token, _, _ in tokenisasi(contoh)])
+        self.profanity_index.cari(contoh)
+        TextBlob(contoh).sentiment  # Memuat lexicon pattern milik TextBlob
+    
+    def _hasil_error(self, e):
+        """Hasil default ketika terjadi error umum"""
+        return {
+            "label": "netral",
+            "skor": 0.5,
+            "error": str(e),
+            "positive_words": [],
+            "translations": [],
+            "timestamp": datetime.now().isoformat()
+        }
     
-        for i, word in enumerate(words[:self.max_length]):
-            tokens[0, i] = hash(word) % 10000 / 10000  # Hashing sederhana
+    def _analisis_awal(self, text, resolusi=None, batas_waktu=None):
+        """
+        Tahap per-teks sebelum inferensi model: deteksi bahasa, terjemahan,
+        profanity dan lexicon
+        
+        Args:
+            resolusi: Hasil resolve_language yang sudah dihitung untuk teks ini (opsional)
+            batas_waktu: Deadline time.monotonic() untuk terjemahan (opsional)
+        
+        Returns:
+            Tuple (hasil_akhir, translated_text, lexicon_result). Jika hasil_akhir
+            tidak None, teks sudah selesai dianalisis dan tidak perlu masuk model.
+        """
+        # Cek apakah teks kosong
+        if not text or text.strip() == '':
+            return {
+                'label': 'netral',
+                'skor': 0.5,
+                'positive_words': [],
+                'translations': []
+            }, None, None
         
-        return [tokens]  # Kembalikan sebagai list tensor
+        # Satu request tidak boleh menunggu translator melebihi TRANSLATOR_DEADLINE
+        if batas_waktu is None:
+            batas_waktu = time.monotonic() + TRANSLATOR_DEADLINE
+        
+        # Deteksi bahasa dan terjemahkan ke bahasa Inggris dalam satu tahap
+        if resolusi is None:
+            resolusi = self.resolve_language(text, batas_waktu)
+        translated_text = resolusi['teks_inggris']
+        logger.info(f"Detected language: {resolusi['bahasa']}, confidence: {resolusi['confidence']}")
+        
+        # Deteksi profanity (kata-kata kotor)
+        with tahap('profanity'):
+            profanity_hits = self.profanity_index.cari(translated_text)
+            ada_profanity = bool(profanity_hits) or (text != translated_text and self.profanity_index.contains(text))
+        if ada_profanity:
+            logger.info("Profanity terdeteksi dalam teks")
+            return {
+                "label": "negatif",
+                "skor": 0.92,
+                "positive_words": [],
+                "translations": [],
+                "timestamp": datetime.now().isoformat()
+            }, translated_text, None
+        
+        # Analisis sentimen berbasis lexicon
+        lexicon_result = self.analyze_sentiment_lexicon(translated_text, resolusi, batas_waktu, profanity_hits)
+        return None, translated_text, lexicon_result
+    
+    def _sesuaikan_ukuran_batch(self, interpreter, batch_size):
+        """
+        Ubah dimensi batch tensor input interpreter menjadi batch_size jika berbeda.
+        Interpreter dari pool sudah berukuran bucket, jadi ini hanya jaring pengaman.
+        
+        Returns:
+            Tuple (input_details, output_details) milik interpreter tersebut
+        """
+        input_details = interpreter.get_input_details()
+        if input_details[0]['shape'][0] != batch_size:
+            for input_detail in input_details:
+                shape = [batch_size] + list(input_detail['shape'][1:])
+                interpreter.resize_tensor_input(input_detail['index'], shape)
+            interpreter.allocate_tensors()
+            
+            # Detail tensor berubah setelah resize
+            input_details = interpreter.get_input_details()
+        
+        return input_details, interpreter.get_output_details()
+    
+    def _jalankan_model(self, texts):
+        """
+        Jalankan inferensi untuk seluruh teks, return output (N, ...). Batch
+        dibulatkan ke bucket interpreter terdekat dan di-padding baris nol;
+        batch yang lebih besar dari bucket terbesar dipecah.
+        """
+        maks = self.interpreter_pool.bucket_maks
+        if len(texts) > maks:
+            return np.concatenate([self._jalankan_model(texts[i:i + maks]) for i in range(0, len(texts), maks)])
+        
+        # Pakai ulang buffer milik thread ini agar tidak alokasi per request
+        buffer = getattr(self._lokal, 'buffer', None)
+        if buffer is None:
+            buffer = np.zeros((maks, self.max_length), dtype=np.float32)
+            self._lokal.buffer = buffer
+        n = len(texts)
+        ukuran = self.interpreter_pool.ukuran_bucket(n)
+        with tahap('preprocess'):
+            self.preprocess_batch(texts, out=buffer)
+            buffer[n:ukuran].fill(0)  # Baris padding
+        
+        # Interpreter TFLite tidak aman dipakai bersama, pinjam satu dari pool
+        with self.interpreter_pool.checkout(ukuran) as interpreter:
+            return self._invoke(interpreter, [buffer[:ukuran]])[:n]
+    
+    def _invoke(self, interpreter, inputs):
+        """Set tensor input, jalankan inferensi dan ambil output pertama"""
+        input_details, output_details = self._sesuaikan_ukuran_batch(interpreter, inputs[0].shape[0])
+        
+        # Set input tensor
+        for i, input_detail in enumerate(input_details):
+            input_shape = input_detail['shape']
+            if i < len(inputs):
+                input_data = inputs[i].astype(np.float32, copy=False)
+                
+                # Reshape jika diperlukan
+                if input_data.shape != tuple(input_shape):
+                    input_data = input_data.reshape(input_shape)
+                
+                interpreter.set_tensor(input_detail['index'], input_data)
+            else:
+                # Jika input hanya satu, dan model memerlukan input tambahan
+                interpreter.set_tensor(input_detail['index'], np.zeros(input_shape, dtype=np.float32))
+        
+        # Lakukan inferensi
+        with tahap('invoke'):
+            interpreter.invoke()
+        
+        # Dapatkan output
+        return interpreter.get_tensor(output_details[0]['index'])
+    
+    def _label_dari_output(self, output_row):
+        """Konversi satu baris output model menjadi (label, skor)"""
+        if output_row.shape[-1] > 1:  # Multi-kelas
+            predicted_class = np.argmax(output_row)
+            confidence = output_row[predicted_class]
+            
+            # Map indeks kelas ke label sentimen
+            sentiment_map = {0: "negatif", 1: "netral", 2: "positif"}
+            model_label = sentiment_map.get(predicted_class, f"kelas_{predicted_class}")
+            return model_label, float(confidence)
+        
+        # Binary classification
+        score = float(output_row[0])
+        if score < 0.4:
+            return "negatif", 1 - score
+        elif score > 0.6:
+            return "positif", score
+        else:
+            return "netral", 0.5 + abs(score - 0.5)
+    
+    def _gabungkan_hasil(self, model_label, model_score, lexicon_result):
+        """Kombinasikan hasil model dengan lexicon"""
+        if model_label == lexicon_result['label']:
+            # Jika kedua metode setuju, tingkatkan kepercayaan
+            final_label = model_label
+            final_score = max(model_score, lexicon_result['skor'])
+        else:
+            # Jika berbeda, pilih yang memiliki skor lebih tinggi
+            if model_score > lexicon_result['skor']:
+                final_label = model_label
+                final_score = model_score
+            else:
+                final_label = lexicon_result['label']
+                final_score = lexicon_result['skor']
+        
+        return {
+            "label": final_label,
+            "skor": final_score,
+            "positive_words": lexicon_result['positive_words'],
+            "translations": lexicon_result['translations'],
+            "timestamp": datetime.now().isoformat()
+        }
     
     def predict(self, text):
         """
@@ -255,195 +2045,246 @@ class SentimenModel:
         Returns:
             Dictionary berisi hasil prediksi (label dan skor)
         """
-        result = {
-            'label': '',
-            'skor': 0.0,
-            'positive_words': [],
-            'translations': []
-        }
-        
-        # Cek apakah teks kosong
-        if not text or text.strip() == '':
-            result['label'] = 'netral'
-            result['skor'] = 0.5
-            return result
+        return self.predict_batch([text])[0]
+    
+    def predict_batch(self, texts):
+        """
+        Melakukan prediksi sentimen terhadap banyak teks dengan satu kali
+        inferensi model. Teks yang sama (setelah normalisasi) diambil dari
+        cache hasil dan hanya dihitung sekali per batch.
         
-        try:
-            # Terjemahkan teks ke bahasa Inggris jika bukan dalam bahasa Inggris
-            original_text = text
-            is_english = False
+        Args:
+            texts: List teks yang akan dianalisis
             
+        Returns:
+            List dictionary hasil prediksi dengan urutan yang sama seperti input
+        """
+        mulai = time.perf_counter()
+        hasil = [None] * len(texts)
+        belum_ada = {}  # kunci -> (teks, [posisi, ...])
+        
+        # Error satu teks hanya mengenai hasil teks itu, bukan seluruh batch
+        for posisi, text in enumerate(texts):
+            if text is not None and not isinstance(text, str):
+                hasil[posisi] = self._hasil_error(TypeError(f"Teks harus berupa string, bukan {type(text).__name__}"))
+                continue
+            if not text or not text.strip():
+                continue
             try:
-                detected = self.translator.detect(text)
-                is_english = detected.lang == 'en'
-                logger.info(f"Detected language: {detected.lang}, confidence: {detected.confidence}")
-            except:
-                logger.warning("Gagal mendeteksi bahasa, melanjutkan dengan teks asli")
-            
-            # Jika bukan bahasa Inggris, coba terjemahkan
-            translated_text = text
-            if not is_english:
-                try:
-                    translated_text = self.translate_text(text)
-                    logger.info(f"Teks diterjemahkan: {translated_text}")
-                except Exception as e:
-                    logger.warning(f"Gagal menerjemahkan: {str(e)}")
-            
-            # Deteksi profanity (kata-kata kotor)
-            if profanity.contains_profanity(text) or profanity.contains_profanity(translated_text):
-                logger.info("Profanity terdeteksi dalam teks")
-                return {
-                    "label": "negatif",
-                    "skor": 0.92,
-                    "positive_words": [],
-                    "translations": [],
-                    "timestamp": datetime.now().isoformat()
-                }
-            
-            # Analisis sentimen berbasis lexicon
-            lexicon_result = self.analyze_sentiment_lexicon(translated_text)
-            
-            # Analisis kata positif
-            result['positive_words'] = lexicon_result['positive_words']
-            result['translations'] = lexicon_result['translations']
-            
-            # Coba gunakan model jika tersedia
+                kunci = kunci_teks(text)
+                if kunci in belum_ada:
+                    belum_ada[kunci][1].append(posisi)
+                    continue
+                cached = self.result_cache.get(kunci)
+            except Exception as e:
+                logger.error(f"Error cache hasil: {str(e)}", exc_info=True)
+                hasil[posisi] = self._hasil_error(e)
+                continue
+            if cached is not None:
+                cached['timestamp'] = datetime.now().isoformat()
+                hasil[posisi] = cached
+            else:
+                belum_ada[kunci] = (text, [posisi])
+        
+        # Teks kosong tidak perlu cache
+        kosong = [posisi for posisi, text in enumerate(texts)
+                  if hasil[posisi] is None and (not text or not text.strip())]
+        masuk = [texts[posisi] for posisi in kosong] + [text for text, _ in belum_ada.values()]
+        try:
+            prediksi, boleh_cache = self._predict_batch(masuk)
+        except Exception as e:
+            logger.error(f"Error saat memproses batch: {str(e)}", exc_info=True)
+            prediksi, boleh_cache = [self._hasil_error(e) for _ in masuk], [False] * len(masuk)
+        for posisi, hasil_teks in zip(kosong, prediksi):
+            hasil[posisi] = hasil_teks
+        
+        for (kunci, (_, semua_posisi)), hasil_teks, cacheable in zip(
+                belum_ada.items(), prediksi[len(kosong):], boleh_cache[len(kosong):]):
+            if cacheable:
+                self.result_cache.set(kunci, hasil_teks)
+            for posisi in semua_posisi:
+                hasil[posisi] = dict(hasil_teks)
+        
+        for hasil_teks in hasil:
+            METRIK_LABEL.inc(hasil_teks['label'])
+        METRIK_TAHAP.observe(time.perf_counter() - mulai, 'predict_batch')
+        return hasil
+    
+    def _predict_batch(self, texts):
+        """
+        Prediksi tanpa cache hasil
+        
+        Returns:
+            Tuple (list hasil, list bool apakah hasil layak di-cache). Hasil error,
+            fallback lexicon atau dengan terjemahan tidak andal tidak di-cache.
+        """
+        hasil = [None] * len(texts)
+        boleh_cache = [False] * len(texts)
+        perlu_model = []  # (posisi, translated_text, lexicon_result)
+        
+        # Deteksi bahasa seluruh batch dengan satu panggilan translator
+        batas_waktu = time.monotonic() + TRANSLATOR_DEADLINE
+        teks_valid = [text for text in texts if text and text.strip()]
+        semua_resolusi, andal = {}, set()
+        if teks_valid:
+            with tahap('deteksi_bahasa'):
+                daftar_resolusi, andal = self._resolve_language_batch(teks_valid, batas_waktu)
+            semua_resolusi = dict(zip(teks_valid, daftar_resolusi))
+        
+        for posisi, text in enumerate(texts):
             try:
-                inputs = self.preprocess_text(translated_text)
-                
-                # Set input tensor
-                for i, input_detail in enumerate(self.input_details):
-                    input_shape = input_detail['shape']
-                    if i < len(inputs):
-                        input_data = inputs[i].astype(np.float32)
-                        
-                        # Reshape jika diperlukan
-                        if input_data.shape != tuple(input_shape):
-                            input_data = input_data.reshape(input_shape)
-                        
-                        self.interpreter.set_tensor(input_detail['index'], input_data)
-                    else:
-                        # Jika input hanya satu, dan model memerlukan input tambahan
-                        self.interpreter.set_tensor(input_detail['index'], np.zeros(input_shape, dtype=np.float32))
-                
-                # Lakukan inferensi
-                self.interpreter.invoke()
-                
-                # Dapatkan output
-                output = self.interpreter.get_tensor(self.output_details[0]['index'])
-                
-                # Konversi output menjadi label dan skor
-                if output.shape[-1] > 1:  # Multi-kelas
-                    predicted_class = np.argmax(output[0])
-                    confidence = output[0][predicted_class]
-                    
-                    # Map indeks kelas ke label sentimen
-                    sentiment_map = {0: "negatif", 1: "netral", 2: "positif"}
-                    model_label = sentiment_map.get(predicted_class, f"kelas_{predicted_class}")
-                    model_score = float(confidence)
-                else:  # Binary classification
-                    score = output[0][0]
-                    if score < 0.4:
-                        model_label = "negatif"
-                        model_score = 1 - score
-                    elif score > 0.6:
-                        model_label = "positif"
-                        model_score = score
-                    else:
-                        model_label = "netral"
-                        model_score = 0.5 + abs(score - 0.5)
-                
-                # Kombinasikan hasil model dengan lexicon
-                if model_label == lexicon_result['label']:
-                    # Jika kedua metode setuju, tingkatkan kepercayaan
-                    final_label = model_label
-                    final_score = max(model_score, lexicon_result['skor'])
+                hasil_akhir, translated_text, lexicon_result = self._analisis_awal(
+                    text, semua_resolusi.get(text), batas_waktu
+                )
+                if hasil_akhir is not None:
+                    hasil[posisi] = hasil_akhir
+                    boleh_cache[posisi] = text in andal
                 else:
-                    # Jika berbeda, pilih yang memiliki skor lebih tinggi
-                    if model_score > lexicon_result['skor']:
-                        final_label = model_label
-                        final_score = model_score
-                    else:
-                        final_label = lexicon_result['label']
-                        final_score = lexicon_result['skor']
-                
-                return {
-                    "label": final_label,
-                    "skor": final_score,
-                    "positive_words": result['positive_words'],
-                    "translations": result['translations'],
-                    "timestamp": datetime.now().isoformat()
-                }
-                
+                    perlu_model.append((posisi, translated_text, lexicon_result))
             except Exception as e:
-                logger.error(f"Error model, fallback ke lexicon: {str(e)}", exc_info=True)
-                return {
+                logger.error(f"Error umum: {str(e)}", exc_info=True)
+                hasil[posisi] = self._hasil_error(e)
+        
+        if not perlu_model:
+            return hasil, boleh_cache
+        
+        # Coba gunakan model jika tersedia
+        output = None
+        try:
+            output = self._jalankan_model([item[1] for item in perlu_model])
+        except Exception as e:
+            logger.error(f"Error model, fallback ke lexicon: {str(e)}", exc_info=True)
+        
+        for baris, (posisi, _, lexicon_result) in enumerate(perlu_model):
+            try:
+                if output is None:
+                    raise RuntimeError("Output model tidak tersedia")
+                model_label, model_score = self._label_dari_output(output[baris])
+                hasil[posisi] = self._gabungkan_hasil(model_label, model_score, lexicon_result)
+                boleh_cache[posisi] = texts[posisi] in andal
+            except Exception as e:
+                METRIK_FALLBACK.inc('model_error')
+                if output is not None:
+                    logger.error(f"Error model, fallback ke lexicon: {str(e)}", exc_info=True)
+                hasil[posisi] = {
                     "label": lexicon_result['label'],
                     "skor": lexicon_result['skor'],
-                    "positive_words": result['positive_words'],
-                    "translations": result['translations'],
+                    "positive_words": lexicon_result['positive_words'],
+                    "translations": lexicon_result['translations'],
                     "timestamp": datetime.now().isoformat()
                 }
-                
-        except Exception as e:
-            logger.error(f"Error umum: {str(e)}", exc_info=True)
-            return {
-                "label": "netral",
-                "skor": 0.5,
-                "error": str(e),
-                "positive_words": [],
-                "translations": [],
-                "timestamp": datetime.now().isoformat()
-            }
+        
+        return hasil, boleh_cache
+
+class MicroBatcher:
+    """
+    Kumpulkan request prediksi yang datang bersamaan lalu jalankan sebagai satu
+    batch, sehingga pemanggil satu-teks tetap mendapat manfaat batching
+    """
+    
+    def __init__(self, model, max_batch=BATCH_MAX_SIZE, max_wait_ms=BATCH_MAX_WAIT_MS, workers=None):
+        self.model = model
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait_ms / 1000.0
+        
+        # Satu worker per interpreter agar semua core terpakai
+        self.workers = workers or model.interpreter_pool.size
+        
+        # Gunakan primitive sesuai async_mode SocketIO agar tidak memblokir hub
+        self._antrian = socketio.server.eio.create_queue()
+        self._antrian_kosong = socketio.server.eio.get_queue_empty_exception()
+        self._workers = None
+    
+    def start(self):
+        """Jalankan worker batching di background (idempoten)"""
+        if self._workers is None:
+            self._workers = [socketio.start_background_task(self._loop) for _ in range(self.workers)]
+        return self
+    
+    def kedalaman_antrian(self):
+        """Jumlah request yang belum masuk batch"""
+        return self._antrian.qsize()
+    
+    def predict(self, text, trace=None):
+        """Prediksi satu teks, menunggu hingga batch yang memuatnya selesai"""
+        self.start()
+        item = {'text': text, 'event': socketio.server.eio.create_event(), 'hasil': None,
+                'trace': trace, 'masuk': time.perf_counter()}
+        self._antrian.put(item)
+        item['event'].wait()
+        return item['hasil']
+    
+    def _loop(self):
+        while True:
+            batch = kumpulkan_batch(self._antrian, self._antrian_kosong, self.max_batch, self.max_wait)
+            traces = [item['trace'] for item in batch]
+            mulai = time.perf_counter()
+            for item in batch:
+                if item['trace'] is not None:
+                    item['trace'].tambah_span('antri_batch', item['masuk'], mulai)
+                    item['trace'].ukuran_batch = len(batch)
+            try:
+                semua_hasil = jalankan_blocking(
+                    tracer.jalankan, traces, self.model.predict_batch, [item['text'] for item in batch]
+                )
+            except Exception as e:
+                logger.error(f"Error saat memproses batch: {str(e)}", exc_info=True)
+                semua_hasil = [self.model._hasil_error(e) for _ in batch]
+            
+            for item, hasil in zip(batch, semua_hasil):
+                item['hasil'] = hasil
+                item['event'].set()
 
 # -------------- BAGIAN DATABASE --------------
 
 def init_db():
     """Inisialisasi database SQLite dengan APSW"""
+    global riwayat_fts
     try:
-        conn = apsw.Connection(DB_PATH)
-        cursor = conn.cursor()
-        
-        # Set WAL mode di luar transaksi
-        cursor.execute("PRAGMA busy_timeout = 5000")  # 5 detik timeout
-        cursor.execute("PRAGMA journal_mode = WAL")
-        cursor.execute("PRAGMA synchronous = NORMAL")
-        
-        # Buat tabel jika belum ada
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS sentimen_hasil (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            teks TEXT NOT NULL,
-            label TEXT NOT NULL,
-            skor REAL NOT NULL,
-            timestamp TEXT NOT NULL
-        )
-        ''')
-        
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS sentimen_statistik (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            tanggal TEXT NOT NULL UNIQUE,
-            positif INTEGER DEFAULT 0,
-            netral INTEGER DEFAULT 0,
-            negatif INTEGER DEFAULT 0,
-            total INTEGER DEFAULT 0
-        )
-        ''')
-        
-        # Tambahkan data dummy jika tabel statistik kosong
-        cursor.execute("SELECT COUNT(*) FROM sentimen_statistik")
-        count = cursor.fetchone()[0]
-        
-        if count == 0:
-            # Tambahkan data untuk 7 hari terakhir
-            today = datetime.now()
-            for i in range(7):
-                date = (today - timedelta(days=6-i)).strftime('%Y-%m-%d')
-                cursor.execute(
-                    "INSERT INTO sentimen_statistik (tanggal, positif, netral, negatif, total) VALUES (?, ?, ?, ?, ?)",
-                    (date, i+1, i+2, i, (i+1)+(i+2)+i)
-                )
+        # PRAGMA (WAL, busy_timeout) sudah diterapkan saat koneksi pool dibuat
+        with db_pool.writer() as conn:
+            cursor = conn.cursor()
+            
+            # Buat tabel jika belum ada
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sentimen_hasil (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                teks TEXT NOT NULL,
+                label TEXT NOT NULL,
+                skor REAL NOT NULL,
+                timestamp TEXT NOT NULL
+            )
+            ''')
+            
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS sentimen_statistik (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                tanggal TEXT NOT NULL UNIQUE,
+                positif INTEGER DEFAULT 0,
+                netral INTEGER DEFAULT 0,
+                negatif INTEGER DEFAULT 0,
+                total INTEGER DEFAULT 0
+            )
+            ''')
+            
+            # Indeks untuk API riwayat (urut waktu, filter label)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_sentimen_hasil_timestamp ON sentimen_hasil (timestamp, id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_sentimen_hasil_label ON sentimen_hasil (label, timestamp, id)")
+            riwayat_fts = RIWAYAT_FTS and _init_fts_riwayat(cursor)
+            
+            # Tambahkan data dummy jika tabel statistik kosong
+            cursor.execute("SELECT COUNT(*) FROM sentimen_statistik")
+            count = cursor.fetchone()[0]
+            
+            if count == 0:
+                # Tambahkan data untuk 7 hari terakhir
+                today = datetime.now()
+                for i in range(7):
+                    date = (today - timedelta(days=6-i)).strftime('%Y-%m-%d')
+                    cursor.execute(
+                        "INSERT INTO sentimen_statistik (tanggal, positif, netral, negatif, total) VALUES (?, ?, ?, ?, ?)",
+                        (date, i+1, i+2, i, (i+1)+(i+2)+i)
+                    )
         
         logger.info("Database berhasil diinisialisasi")
         return True
@@ -451,82 +2292,559 @@ def init_db():
         logger.error(f"Error saat inisialisasi database: {str(e)}", exc_info=True)
         return False
 
+def _init_fts_riwayat(cursor):
+    """
+    Buat indeks FTS5 trigram atas sentimen_hasil.teks beserta trigger
+    sinkronisasinya. Return False jika SQLite tidak mendukung FTS5 trigram.
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'sentimen_hasil_fts'")
+    if cursor.fetchone() is not None:
+        return True
+    
+    try:
+        with cursor.getconnection():
+            cursor.execute('''
+            CREATE VIRTUAL TABLE sentimen_hasil_fts USING fts5(
+                teks, content='sentimen_hasil', content_rowid='id', tokenize='trigram'
+            )
+            ''')
+            cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS sentimen_hasil_fts_insert AFTER INSERT ON sentimen_hasil BEGIN
+                INSERT INTO sentimen_hasil_fts (rowid, teks) VALUES (new.id, new.teks);
+            END
+            ''')
+            cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS sentimen_hasil_fts_delete AFTER DELETE ON sentimen_hasil BEGIN
+                INSERT INTO sentimen_hasil_fts (sentimen_hasil_fts, rowid, teks) VALUES ('delete', old.id, old.teks);
+            END
+            ''')
+            # Indeks baris yang sudah ada
+            cursor.execute("INSERT INTO sentimen_hasil_fts (sentimen_hasil_fts) VALUES ('rebuild')")
+        logger.info("Indeks FTS5 riwayat dibuat")
+        return True
+    except apsw.Error as e:
+        logger.warning(f"FTS5 trigram tidak tersedia, pencarian teks memakai LIKE: {str(e)}")
+        return False
+
 def simpan_hasil(teks, hasil_prediksi):
     """Simpan hasil analisis ke database"""
+    return simpan_hasil_batch([(teks, hasil_prediksi)])
+
+def hitung_statistik(items):
+    """
+    Akumulasi jumlah label per tanggal dari list (teks, hasil_prediksi). Hasil
+    tanpa timestamp (mis. teks kosong) tidak disimpan sehingga tidak dihitung.
+    """
+    statistik = {}
+    for _, hasil in items:
+        if 'timestamp' not in hasil:
+            continue
+        tanggal = hasil['timestamp'][:10]
+        stat = statistik.setdefault(tanggal, {'positif': 0, 'netral': 0, 'negatif': 0, 'total': 0})
+        if hasil['label'] in ('positif', 'netral', 'negatif'):
+            stat[hasil['label']] += 1
+        stat['total'] += 1
+    return statistik
+
+def simpan_hasil_batch(items, setelah_commit=None):
+    """
+    Simpan banyak hasil analisis ke database dalam satu transaksi
+    
+    Args:
+        items: List tuple (teks, hasil_prediksi)
+        setelah_commit: Callback(statistik) yang dipanggil setelah commit berhasil,
+            masih di dalam kunci writer (opsional)
+    """
+    # Hasil tanpa timestamp (mis. teks kosong) tidak disimpan
+    valid = [(teks, hasil) for teks, hasil in items if 'timestamp' in hasil]
+    if len(valid) < len(items):
+        logger.warning(f"{len(items) - len(valid)} hasil tanpa timestamp tidak disimpan")
+    if not valid:
+        return True
+    
+    # Akumulasi statistik per tanggal agar cukup satu UPSERT per hari
+    statistik = hitung_statistik(valid)
+    
     try:
-        with apsw.Connection(DB_PATH) as conn:
+        with db_pool.writer() as conn:
             cursor = conn.cursor()
             
             # Gunakan transaksi eksplisit
             with conn:
                 # Simpan hasil analisis individual
-                cursor.execute(
+                cursor.executemany(
                     "INSERT INTO sentimen_hasil (teks, label, skor, timestamp) VALUES (?, ?, ?, ?)",
-                    (teks, hasil_prediksi['label'], hasil_prediksi['skor'], hasil_prediksi['timestamp'])
+                    [(teks, hasil['label'], hasil['skor'], hasil['timestamp']) for teks, hasil in valid]
                 )
                 
                 # Update statistik harian dengan UPSERT
-                tanggal = datetime.now().strftime('%Y-%m-%d')
-                cursor.execute('''
+                cursor.executemany('''
                     INSERT INTO sentimen_statistik 
                     (tanggal, positif, netral, negatif, total) 
-                    VALUES (?, ?, ?, ?, 1)
+                    VALUES (?, ?, ?, ?, ?)
                     ON CONFLICT(tanggal) DO UPDATE SET
-                        positif = positif + ?,
-                        netral = netral + ?,
-                        negatif = negatif + ?,
-                        total = total + 1
-                ''', (
-                    tanggal,
-                    1 if hasil_prediksi['label'] == 'positif' else 0,
-                    1 if hasil_prediksi['label'] == 'netral' else 0,
-                    1 if hasil_prediksi['label'] == 'negatif' else 0,
-                    1 if hasil_prediksi['label'] == 'positif' else 0,
-                    1 if hasil_prediksi['label'] == 'netral' else 0,
-                    1 if hasil_prediksi['label'] == 'negatif' else 0
-                ))
-            
-            logger.info(f"Data tersimpan: {teks[:30]}...")
+                        positif = positif + excluded.positif,
+                        netral = netral + excluded.netral,
+                        negatif = negatif + excluded.negatif,
+                        total = total + excluded.total
+                ''', [
+                    (tanggal, stat['positif'], stat['netral'], stat['negatif'], stat['total'])
+                    for tanggal, stat in statistik.items()
+                ])
+            
+            if setelah_commit is not None:
+                setelah_commit(statistik)
+            
+            logger.info(f"Data tersimpan: {len(valid)} hasil")
             return True
             
     except Exception as e:
         logger.error(f"Gagal menyimpan: {str(e)}", exc_info=True)
         return False
 
-def dapatkan_statistik():
+class ResultWriter:
+    """
+    Penulis hasil write-behind: hasil dimasukkan ke antrian terbatas lalu ditulis
+    oleh satu worker background dalam transaksi berkelompok
+    """
+    
+    def __init__(self, queue_size=WRITER_QUEUE_SIZE, batch_size=WRITER_BATCH_SIZE,
+                 flush_interval=WRITER_FLUSH_INTERVAL, put_timeout=WRITER_PUT_TIMEOUT, statistik=None):
+        self.statistik = statistik  # StatistikLive yang ikut diperbarui (opsional)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        
+        self._antrian = socketio.server.eio.create_queue(queue_size)
+        self._antrian_kosong = socketio.server.eio.get_queue_empty_exception()
+        self._worker = None
+        self._lock = threading.Lock()
+        self._tertunda = 0  # Hasil yang sudah masuk antrian tetapi belum selesai ditulis
+        self._ditutup = False  # True setelah tutup(): hasil baru ditulis langsung
+        
+        # Metrik
+        self.ditulis = 0
+        self.gagal = 0
+        self.transaksi = 0
+        self.latensi_commit_terakhir = 0.0
+        self.latensi_commit_total = 0.0
+        self.tulis_langsung = 0
+    
+    def start(self):
+        """Jalankan worker penulis di background (idempoten)"""
+        if self._worker is None:
+            self._worker = socketio.start_background_task(self._loop)
+        return self
+    
+    def simpan(self, teks, hasil_prediksi):
+        """
+        Masukkan hasil ke antrian tulis. Jika antrian penuh, pemanggil menunggu
+        (backpressure) hingga put_timeout lalu menulis langsung. Setelah tutup()
+        hasil ditulis langsung agar tidak tertinggal di antrian yang sudah di-flush.
+        """
+        self.start()
+        if self.statistik is not None:
+            self.statistik.catat(teks, hasil_prediksi)
+        with self._lock:
+            antri = not self._ditutup
+            if antri:
+                self._tertunda += 1
+        if antri:
+            try:
+                self._antrian.put((teks, hasil_prediksi), timeout=self.put_timeout)
+                return
+            except queue.Full:
+                with self._lock:
+                    self._tertunda -= 1
+                logger.warning("Antrian penulis penuh, menulis hasil secara langsung")
+        with self._lock:
+            self.tulis_langsung += 1
+        self._tulis([(teks, hasil_prediksi)])
+    
+    def simpan_batch(self, items):
+        """
+        Tulis banyak hasil (list tuple (teks, hasil_prediksi)) langsung dalam
+        satu transaksi tanpa melewati antrian
+        """
+        if not items:
+            return
+        if self.statistik is not None:
+            self.statistik.catat_batch(items)
+        self._tulis(items)
+    
+    def _tulis(self, batch, offload=True):
+        setelah_commit = self.statistik.konfirmasi if self.statistik is not None else None
+        mulai = time.perf_counter()
+        if offload:
+            # Commit (fsync) dijalankan di luar hub eventlet
+            berhasil = jalankan_blocking(simpan_hasil_batch, batch, setelah_commit)
+        else:
+            berhasil = simpan_hasil_batch(batch, setelah_commit)
+        latensi = time.perf_counter() - mulai
+        METRIK_TAHAP.observe(latensi, 'simpan_hasil')
+        
+        if not berhasil and self.statistik is not None:
+            self.statistik.batalkan(hitung_statistik(batch))
+        
+        with self._lock:
+            self.transaksi += 1
+            self.latensi_commit_terakhir = latensi
+            self.latensi_commit_total += latensi
+            if berhasil:
+                self.ditulis += len(batch)
+            else:
+                self.gagal += len(batch)
+    
+    def _loop(self):
+        while True:
+            batch = kumpulkan_batch(self._antrian, self._antrian_kosong, self.batch_size, self.flush_interval)
+            try:
+                self._tulis(batch)
+            except Exception as e:
+                logger.error(f"Error pada penulis hasil: {str(e)}", exc_info=True)
+            finally:
+                with self._lock:
+                    self._tertunda -= len(batch)
+    
+    def flush(self, offload=False):
+        """
+        Tulis seluruh isi antrian saat ini secara langsung (dipakai saat shutdown)
+        
+        Args:
+            offload: True jika dipanggil dari greenlet selagi hub eventlet masih berjalan
+        """
+        batch = []
+        while True:
+            try:
+                batch.append(self._antrian.get_nowait())
+            except self._antrian_kosong:
+                break
+            if len(batch) >= self.batch_size:
+                self._tulis_sisa(batch, offload)
+                batch = []
+        if batch:
+            self._tulis_sisa(batch, offload)
+    
+    def _tulis_sisa(self, batch, offload):
+        try:
+            self._tulis(batch, offload=offload)
+        finally:
+            with self._lock:
+                self._tertunda -= len(batch)
+    
+    def tutup(self, batas_waktu=WRITER_SHUTDOWN_TIMEOUT):
+        """
+        Tunggu worker menulis isi antrian, termasuk batch yang sedang
+        dikumpulkan, lalu tulis sisanya langsung. Dipanggil dari greenlet.
+        Hasil yang disimpan setelah tutup() tidak lagi masuk antrian.
+        """
+        with self._lock:
+            self._ditutup = True
+        akhir = time.monotonic() + batas_waktu
+        while self._worker is not None and time.monotonic() < akhir:
+            with self._lock:
+                if self._tertunda <= 0:
+                    break
+            tidur_kooperatif(0.05)
+        self.flush(offload=True)
+        with self._lock:
+            if self._tertunda > 0:
+                logger.warning(f"{self._tertunda} hasil masih dalam proses tulis saat penulis ditutup")
+    
+    def stats(self):
+        """Metrik antrian dan latensi commit"""
+        with self._lock:
+            return {
+                'kedalaman_antrian': self._antrian.qsize(),
+                'tertunda': self._tertunda,
+                'ditulis': self.ditulis,
+                'gagal': self.gagal,
+                'transaksi': self.transaksi,
+                'tulis_langsung': self.tulis_langsung,
+                'latensi_commit_terakhir_ms': self.latensi_commit_terakhir * 1000,
+                'latensi_commit_rata_ms': self.latensi_commit_total / self.transaksi * 1000 if self.transaksi else 0.0
+            }
+
+def _query_statistik(conn, hari):
+    cursor = conn.cursor()
+    
+    cursor.execute("""
+        SELECT tanggal, 
+               COALESCE(positif, 0) as positif, 
+               COALESCE(netral, 0) as netral, 
+               COALESCE(negatif, 0) as negatif,
+               COALESCE(total, 0) as total
+        FROM sentimen_statistik 
+        ORDER BY tanggal DESC 
+        LIMIT ?
+    """, (hari,))
+    
+    return [{
+        'tanggal': row[0],
+        'positif': row[1],
+        'netral': row[2],
+        'negatif': row[3],
+        'total': row[4]
+    } for row in cursor.fetchall()]
+
+def dapatkan_statistik(hari=STATISTIK_HARI):
     """Ambil statistik sentimen dari database"""
     try:
-        with apsw.Connection(DB_PATH) as conn:
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT tanggal, 
-                       COALESCE(positif, 0) as positif, 
-                       COALESCE(netral, 0) as netral, 
-                       COALESCE(negatif, 0) as negatif,
-                       COALESCE(total, 0) as total
-                FROM sentimen_statistik 
-                ORDER BY tanggal DESC 
-                LIMIT 7
-            """)
-            
-            return [{
-                'tanggal': row[0],
-                'positif': row[1],
-                'netral': row[2],
-                'negatif': row[3],
-                'total': row[4]
-            } for row in cursor.fetchall()]
+        with db_pool.reader() as conn:
+            return _query_statistik(conn, hari)
             
     except Exception as e:
         logger.error(f"Error saat mengambil statistik: {str(e)}", exc_info=True)
         return []
 
+riwayat_fts = False  # Diisi init_db
+
+def encode_cursor(timestamp, id_hasil):
+    """Cursor halaman berikutnya: posisi (timestamp, id) baris terakhir"""
+    return base64.urlsafe_b64encode(json.dumps([timestamp, id_hasil]).encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor_teks):
+    try:
+        timestamp, id_hasil = json.loads(base64.urlsafe_b64decode(cursor_teks.encode('ascii')))
+        return str(timestamp), int(id_hasil)
+    except (ValueError, TypeError):
+        raise ValueError("Cursor tidak valid")
+
+def _batas_tanggal(nilai, nama):
+    """
+    Validasi batas dari/sampai: tanggal (YYYY-MM-DD) atau timestamp ISO
+    
+    Returns:
+        Tuple (nilai, hanya_tanggal)
+    """
+    try:
+        datetime.fromisoformat(nilai)
+    except ValueError:
+        raise ValueError(f"'{nama}' harus berupa tanggal YYYY-MM-DD atau timestamp ISO")
+    return nilai, len(nilai) == 10
+
+def _query_riwayat(conn, label=None, skor_min=None, skor_max=None, dari=None, sampai=None,
+                   q=None, cursor_halaman=None, limit=RIWAYAT_LIMIT, urutan='desc'):
+    """
+    Satu halaman riwayat dengan keyset pagination atas (timestamp, id)
+    
+    Returns:
+        Tuple (list baris, cursor berikutnya atau None)
+    """
+    kondisi = []
+    params = []
+    label = list(dict.fromkeys(label or []))  # Label ganda tidak boleh menggandakan baris
+    
+    if skor_min is not None:
+        kondisi.append("skor >= ?")
+        params.append(skor_min)
+    if skor_max is not None:
+        kondisi.append("skor <= ?")
+        params.append(skor_max)
+    if dari:
+        kondisi.append("timestamp >= ?")
+        params.append(_batas_tanggal(dari, 'dari')[0])
+    if sampai:
+        sampai, hanya_tanggal = _batas_tanggal(sampai, 'sampai')
+        if hanya_tanggal:
+            # Tanggal saja berarti sampai akhir hari itu (timestamp disimpan sebagai ISO lengkap)
+            kondisi.append("timestamp < ?")
+            params.append((datetime.fromisoformat(sampai) + timedelta(days=1)).strftime('%Y-%m-%d'))
+        else:
+            kondisi.append("timestamp <= ?")
+            params.append(sampai)
+    if q:
+        if riwayat_fts and len(q) >= 3:
+            # Trigram: frasa dalam tanda kutip = pencocokan substring
+            kondisi.append("id IN (SELECT rowid FROM sentimen_hasil_fts WHERE sentimen_hasil_fts MATCH ?)")
+            params.append('"' + q.replace('"', '""') + '"')
+        else:
+            kondisi.append("teks LIKE ? ESCAPE '\\'")
+            params.append('%' + q.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+    
+    desc = urutan != 'asc'
+    if cursor_halaman:
+        kondisi.append(f"(timestamp, id) {'<' if desc else '>'} (?, ?)")
+        params.extend(decode_cursor(cursor_halaman))
+    
+    # Satu baris ekstra untuk tahu ada halaman berikutnya
+    if label:
+        # label IN (...) memaksa sort seluruh hasil; satu query per label memakai
+        # indeks (label, timestamp, id) yang sudah terurut, lalu digabung
+        rows = list(itertools.islice(heapq.merge(
+            *(_ambil_riwayat(conn, kondisi + ["label = ?"], params + [l], desc, limit + 1) for l in label),
+            key=lambda row: (row[4], row[0]), reverse=desc
+        ), limit + 1))
+    else:
+        rows = _ambil_riwayat(conn, kondisi, params, desc, limit + 1)
+    
+    berikutnya = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        berikutnya = encode_cursor(rows[-1][4], rows[-1][0])
+    
+    return [{
+        'id': row[0],
+        'teks': row[1],
+        'label': row[2],
+        'skor': row[3],
+        'timestamp': row[4]
+    } for row in rows], berikutnya
+
+def _ambil_riwayat(conn, kondisi, params, desc, limit):
+    where = f"WHERE {' AND '.join(kondisi)}" if kondisi else ''
+    arah = 'DESC' if desc else 'ASC'
+    return conn.cursor().execute(
+        f"SELECT id, teks, label, skor, timestamp FROM sentimen_hasil {where} "
+        f"ORDER BY timestamp {arah}, id {arah} LIMIT ?",
+        (*params, limit)
+    ).fetchall()
+
+def dapatkan_riwayat(**filter_riwayat):
+    """
+    Ambil satu halaman riwayat hasil analisis dari database. Query (termasuk
+    pencarian LIKE yang bisa memindai seluruh tabel) dijalankan di luar hub eventlet.
+    """
+    return jalankan_blocking(_dapatkan_riwayat, filter_riwayat)
+
+def _dapatkan_riwayat(filter_riwayat):
+    with db_pool.reader() as conn:
+        return _query_riwayat(conn, **filter_riwayat)
+
+class StatistikLive:
+    """
+    Penghitung statistik harian di memori. Dimuat dari sentimen_statistik saat
+    startup, diperbarui saat hasil dicatat, dan direkonsiliasi berkala dengan
+    database. Membaca jendela N hari tidak menyentuh SQLite.
+    """
+    
+    def __init__(self, hari=STATISTIK_HARI, interval=STATISTIK_REKONSILIASI_INTERVAL):
+        self.hari = hari
+        self.interval = interval
+        self.versi = 0  # Bertambah setiap kali angka yang tampil berubah
+        
+        self._db = {}       # tanggal -> angka yang sudah ter-commit
+        self._pending = {}  # tanggal -> angka yang masih di antrian penulis
+        self._jendela = []
+        self._log_delta = deque(maxlen=STATISTIK_DELTA_LOG)  # (versi, list delta atau None)
+        self._lock = threading.Lock()
+        self._worker = None
+    
+    def _tambah(self, tujuan, statistik, tanda=1):
+        for tanggal, stat in statistik.items():
+            angka = tujuan.setdefault(tanggal, {'positif': 0, 'netral': 0, 'negatif': 0, 'total': 0})
+            for kunci in angka:
+                angka[kunci] += tanda * stat[kunci]
+            if angka['total'] <= 0:
+                del tujuan[tanggal]
+    
+    def _susun_jendela(self, delta=None):
+        """
+        Susun ulang jendela N hari terbaru (dipanggil di dalam lock). Jika angka
+        berubah, versi naik dan delta dicatat; delta None berarti client harus
+        memuat ulang visualisasi penuh.
+        """
+        jendela = []
+        for tanggal in sorted(set(self._db) | set(self._pending), reverse=True)[:self.hari]:
+            angka = {'tanggal': tanggal, 'positif': 0, 'netral': 0, 'negatif': 0, 'total': 0}
+            for sumber in (self._db, self._pending):
+                for kunci, nilai in sumber.get(tanggal, {}).items():
+                    angka[kunci] += nilai
+            jendela.append(angka)
+        
+        if jendela != self._jendela:
+            self.versi += 1
+            self._log_delta.append((self.versi, delta))
+        self._jendela = jendela
+    
+    @staticmethod
+    def _ke_delta(statistik, tanda=1):
+        return [
+            {'tanggal': tanggal, 'label': label, 'increment': tanda * stat[label]}
+            for tanggal, stat in statistik.items()
+            for label in ('positif', 'netral', 'negatif') if stat[label]
+        ]
+    
+    def muat(self):
+        """Muat ulang angka ter-commit dari database"""
+        # Kunci writer memastikan tidak ada commit di antara query dan pembaruan
+        with db_pool.writer() as conn:
+            rows = _query_statistik(conn, self.hari)
+            with self._lock:
+                self._db = {row.pop('tanggal'): row for row in rows}
+                self._susun_jendela()
+        return self
+    
+    def catat(self, teks, hasil_prediksi):
+        """Tambahkan satu hasil yang baru masuk antrian penulis"""
+        self.catat_batch([(teks, hasil_prediksi)])
+    
+    def catat_batch(self, items):
+        """Tambahkan banyak hasil (list tuple (teks, hasil_prediksi)) sekaligus"""
+        statistik = hitung_statistik(items)
+        if statistik:
+            with self._lock:
+                self._tambah(self._pending, statistik)
+                self._susun_jendela(self._ke_delta(statistik))
+    
+    def konfirmasi(self, statistik):
+        """Pindahkan angka yang sudah ter-commit dari pending ke angka database"""
+        with self._lock:
+            self._tambah(self._pending, statistik, -1)
+            self._tambah(self._db, statistik)
+            self._susun_jendela()
+    
+    def batalkan(self, statistik):
+        """Buang angka pending dari batch yang gagal ditulis"""
+        with self._lock:
+            self._tambah(self._pending, statistik, -1)
+            self._susun_jendela(self._ke_delta(statistik, -1))
+    
+    def dapatkan(self):
+        """Statistik N hari terakhir (urutan tanggal terbaru lebih dulu)"""
+        return self._jendela
+    
+    def snapshot(self):
+        """Tuple (versi, statistik) yang konsisten satu sama lain"""
+        with self._lock:
+            return self.versi, self._jendela
+    
+    def delta_sejak(self, versi):
+        """
+        Semua delta setelah versi tertentu, masing-masing dengan field versi
+        
+        Returns:
+            List delta, atau None jika riwayat tidak lengkap dan client harus resync
+        """
+        with self._lock:
+            if versi == self.versi:
+                return []
+            entri = [(v, delta) for v, delta in self._log_delta if v > versi]
+            if not entri or entri[0][0] != versi + 1 or any(delta is None for _, delta in entri):
+                return None
+            return [dict(item, versi=v) for v, delta in entri for item in delta]
+    
+    def start(self):
+        """Jalankan rekonsiliasi berkala di background (idempoten)"""
+        if self._worker is None:
+            self._worker = socketio.start_background_task(self._loop)
+        return self
+    
+    def _loop(self):
+        while True:
+            socketio.sleep(self.interval)
+            try:
+                jalankan_blocking(self.muat)
+            except Exception as e:
+                logger.error(f"Gagal rekonsiliasi statistik: {str(e)}", exc_info=True)
+
 # -------------- BAGIAN VISUALISASI --------------
 
 def buat_visualisasi_plotly(statistik):
     """Buat visualisasi interaktif dengan Plotly"""
     try:
+        import plotly.graph_objs as go
+        
         # Balik urutan agar tanggal terlama di kiri
         statistik = statistik[::-1]
         
@@ -595,9 +2913,10 @@ def buat_visualisasi_plotly(statistik):
         line_fig = go.Figure(data=line_chart_data, layout=line_layout)
         pie_fig = go.Figure(data=pie_chart_data, layout=pie_layout)
         
+        # to_plotly_json langsung menghasilkan dict, tanpa serialisasi lalu parse ulang
         return {
-            'line_chart': json.loads(plotly.io.to_json(line_fig)),
-            'pie_chart': json.loads(plotly.io.to_json(pie_fig)),
+            'line_chart': line_fig.to_plotly_json(),
+            'pie_chart': pie_fig.to_plotly_json(),
             'latest_stats': {
                 'positif': statistik[-1]['positif'] if statistik else 0,
                 'netral': statistik[-1]['netral'] if statistik else 0,
@@ -609,8 +2928,674 @@ def buat_visualisasi_plotly(statistik):
         logger.error(f"Error saat membuat visualisasi plotly: {str(e)}")
         return None
 
+class VisualisasiBroadcaster:
+    """
+    Broadcast update_visualisasi yang digabung (maksimal satu push per interval)
+    dengan payload yang di-cache berdasarkan versi statistik
+    """
+    
+    def __init__(self, statistik, interval=BROADCAST_INTERVAL):
+        self.statistik = statistik
+        self.interval = interval
+        
+        self._cache = None
+        self._cache_versi = None
+        self._versi_terkirim = None
+        self._ada_update = socketio.server.eio.create_event()
+        self._worker = None
+    
+    def payload(self):
+        """Payload visualisasi terbaru, dibangun ulang hanya jika statistik berubah"""
+        versi, statistik = self.statistik.snapshot()
+        if self._cache is None or versi != self._cache_versi:
+            visualisasi = buat_visualisasi_plotly(statistik)
+            if visualisasi is not None:
+                visualisasi['versi'] = versi  # Basis versi untuk event stats_delta
+            self._cache = visualisasi
+            self._cache_versi = versi
+        return self._cache
+    
+    def tandai(self):
+        """Minta broadcast; beberapa permintaan dalam satu interval digabung"""
+        self.start()
+        self._ada_update.set()
+    
+    def start(self):
+        """Jalankan worker broadcast di background (idempoten)"""
+        if self._worker is None:
+            self._worker = socketio.start_background_task(self._loop)
+        return self
+    
+    def _loop(self):
+        while True:
+            self._ada_update.wait()
+            self._ada_update.clear()
+            try:
+                if self.statistik.versi != self._versi_terkirim:
+                    self._kirim()
+            except Exception as e:
+                logger.error(f"Error saat broadcast visualisasi: {str(e)}", exc_info=True)
+            
+            # Permintaan yang datang selama jeda ini digabung menjadi satu push
+            socketio.sleep(self.interval)
+    
+    def _kirim(self):
+        """Kirim stats_delta jika riwayat lengkap, selain itu figure penuh"""
+        delta = None
+        if self._versi_terkirim is not None:
+            delta = self.statistik.delta_sejak(self._versi_terkirim)
+        
+        if delta is None:
+            socketio.emit('update_visualisasi', self.payload())
+            self._versi_terkirim = self._cache_versi
+        elif delta:
+            socketio.emit('stats_delta', {
+                'versi_awal': self._versi_terkirim,
+                'versi': delta[-1]['versi'],
+                'delta': delta
+            })
+            self._versi_terkirim = delta[-1]['versi']
+
+# -------------- BAGIAN ANALISIS MASSAL --------------
+
+class BarisTidakValid(ValueError):
+    """Baris NDJSON yang gagal di-parse, dilaporkan dengan nomor barisnya (mulai 1)"""
+    
+    def __init__(self, nomor, pesan):
+        super().__init__(pesan)
+        self.nomor = nomor
+    
+    def __reduce__(self):
+        # Dikirim ke proses worker skor_file bersama chunk record
+        return type(self), (self.nomor, str(self))
+
+def format_error_bulk(item_id, error):
+    """Baris error analisis massal: key 'baris' untuk JSON tidak valid, selain itu 'id'"""
+    if isinstance(error, BarisTidakValid):
+        return {'baris': error.nomor, 'error': str(error)}
+    return {'id': item_id, 'error': str(error)}
+
+def baca_item_bulk(body, ndjson=False):
+    """
+    Parse body request analisis massal: array JSON atau NDJSON (satu item per baris).
+    Item boleh berupa string atau objek {"id": ..., "teks": ...}.
+    
+    Returns:
+        List tuple (id, teks, error). teks bernilai None jika item tidak valid.
+        Baris NDJSON yang bukan JSON mendapat id None dan error BarisTidakValid,
+        sehingga nomor barisnya tidak bentrok dengan id dari client.
+    """
+    if not ndjson and body.lstrip().startswith('['):
+        baris = json.loads(body)
+    else:
+        baris = []
+        for nomor, line in enumerate(body.splitlines(), 1):
+            if not line.strip():
+                continue
+            try:
+                baris.append(json.loads(line))
+            except ValueError as e:
+                baris.append(BarisTidakValid(nomor, f"JSON tidak valid: {str(e)}"))
+    
+    items = []
+    for posisi, item in enumerate(baris):
+        if isinstance(item, BarisTidakValid):
+            items.append((None, None, item))
+        elif isinstance(item, str):
+            items.append((posisi, item, None))
+        elif isinstance(item, dict) and isinstance(item.get('teks'), str):
+            items.append((item.get('id', posisi), item['teks'], None))
+        else:
+            item_id = item.get('id', posisi) if isinstance(item, dict) else posisi
+            items.append((item_id, None, "Field 'teks' (string) tidak ditemukan"))
+    return items
+
+def format_hasil_bulk(item_id, hasil):
+    """Satu baris hasil analisis massal dengan format yang sama seperti /api/sentimen"""
+    baris = {
+        'id': item_id,
+        'sentimen': {
+            'label': hasil['label'],
+            'skor': hasil['skor']
+        },
+        'kata_positif': hasil.get('positive_words', []),
+        'terjemahan': hasil.get('translations', [])
+    }
+    if 'error' in hasil:
+        baris['error'] = hasil['error']
+    return baris
+
+def stream_analisis_bulk(items, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Analisis item per chunk dengan predict_batch dan hasilkan baris NDJSON
+    segera setelah tiap chunk selesai. Semua hasil yang berhasil disimpan
+    dalam satu transaksi setelah stream selesai (atau terputus).
+    """
+    tersimpan = []
+    try:
+        for item_id, _, error in items:
+            if error is not None:
+                yield json.dumps(format_error_bulk(item_id, error)) + '\n'
+        
+        valid = [(item_id, teks) for item_id, teks, error in items if error is None]
+        for awal in range(0, len(valid), chunk_size):
+            chunk = valid[awal:awal + chunk_size]
+            texts = [teks for _, teks in chunk]
+            try:
+                semua_hasil = jalankan_blocking(model.predict_batch, texts)
+            except Exception as e:
+                logger.error(f"Error pada analisis massal: {str(e)}", exc_info=True)
+                for item_id, _ in chunk:
+                    yield json.dumps({'id': item_id, 'error': str(e)}) + '\n'
+                continue
+            
+            for (item_id, teks), hasil in zip(chunk, semua_hasil):
+                if 'error' not in hasil:
+                    tersimpan.append((teks, hasil))
+                yield json.dumps(format_hasil_bulk(item_id, hasil)) + '\n'
+    finally:
+        if tersimpan:
+            result_writer.simpan_batch(tersimpan)
+            broadcaster.tandai()
+
+# -------------- BAGIAN JOB ANALISIS --------------
+
+def baca_input_job(path, format_file, kolom, kolom_id=None):
+    """
+    Generator (id, teks) dari file CSV, JSONL atau Parquet. Baris JSONL boleh
+    berupa string atau objek; id default adalah nomor record (mulai 0). Baris
+    JSONL yang bukan JSON menghasilkan teks berupa BarisTidakValid dengan nomor
+    barisnya, dan pembacaan berlanjut ke baris berikutnya.
+    """
+    if format_file == 'parquet':
+        yield from _baca_parquet(path, kolom, kolom_id)
+        return
+    
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if format_file == 'csv':
+            records = csv.DictReader(f)
+        else:
+            records = _baca_jsonl(f)
+        
+        for posisi, record in enumerate(records):
+            if isinstance(record, (str, BarisTidakValid)):
+                yield posisi, record
+            elif isinstance(record, dict):
+                item_id = record.get(kolom_id, posisi) if kolom_id else posisi
+                yield item_id, record.get(kolom)
+            else:
+                yield posisi, None
+
+def _baca_jsonl(f):
+    """Record JSONL per baris; baris yang gagal di-parse menjadi BarisTidakValid"""
+    for nomor, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield BarisTidakValid(nomor, f"JSON tidak valid: {str(e)}")
+
+def _baca_parquet(path, kolom, kolom_id=None, batch_size=JOB_CHUNK_SIZE):
+    """Baca kolom Parquet per record batch agar memori tetap kecil (butuh pyarrow)"""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Membaca Parquet membutuhkan paket pyarrow")
+    
+    kolom_dibaca = [kolom] + ([kolom_id] if kolom_id else [])
+    posisi = 0
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size, columns=kolom_dibaca):
+        semua_teks = batch.column(0).to_pylist()
+        semua_id = batch.column(1).to_pylist() if kolom_id else range(posisi, posisi + len(semua_teks))
+        yield from zip(semua_id, semua_teks)
+        posisi += len(semua_teks)
+
+def analisis_records(model, records, kolom='teks'):
+    """
+    Analisis list (id, teks) dengan satu panggilan predict_batch. teks berupa
+    BarisTidakValid dilaporkan sebagai baris error dengan nomor barisnya.
+    
+    Returns:
+        Tuple (list baris hasil, list (teks, hasil) yang layak disimpan, jumlah gagal)
+    """
+    valid = [teks for _, teks in records if isinstance(teks, str)]
+    semua_hasil = iter(model.predict_batch(valid) if valid else [])
+    semua_baris = []
+    tersimpan = []
+    gagal = 0
+    for item_id, teks in records:
+        if isinstance(teks, BarisTidakValid):
+            baris = {'id': item_id, 'baris': teks.nomor, 'error': str(teks)}
+        elif not isinstance(teks, str):
+            baris = {'id': item_id, 'error': f"Kolom '{kolom}' tidak ditemukan"}
+        else:
+            hasil = next(semua_hasil)
+            baris = format_hasil_bulk(item_id, hasil)
+            if 'error' not in hasil:
+                tersimpan.append((teks, hasil))
+        if 'error' in baris:
+            gagal += 1
+        semua_baris.append(baris)
+    return semua_baris, tersimpan, gagal
+
+def tebak_format_input(path):
+    """Format input dari ekstensi file: csv, parquet atau jsonl (default)"""
+    ext = os.path.splitext(path)[1].lower()
+    return {'.csv': 'csv', '.parquet': 'parquet'}.get(ext, 'jsonl')
+
+class JobManager:
+    """
+    Job analisis sentimen untuk korpus besar. Job diproses per chunk oleh
+    beberapa worker lewat predict_batch, hasil ditulis ke file NDJSON, dan
+    progress di-checkpoint di tabel `job_analisis` sehingga job yang terputus
+    dilanjutkan setelah restart.
+    """
+    
+    STATUS_AKTIF = ('antri', 'berjalan')
+    
+    def __init__(self, model, result_writer=None, broadcaster=None, workers=JOB_WORKERS,
+                 chunk_size=JOB_CHUNK_SIZE, job_dir=JOB_DIR, pool=None):
+        self.model = model
+        self.result_writer = result_writer  # Diisi jika hasil job juga masuk sentimen_hasil
+        self.broadcaster = broadcaster
+        self.workers = max(1, workers)
+        self.chunk_size = max(1, chunk_size)
+        self.job_dir = job_dir
+        self.pool = pool or db_pool
+        
+        self._antrian = socketio.server.eio.create_queue()
+        self._worker = []
+        
+        os.makedirs(self.job_dir, exist_ok=True)
+        jalankan_blocking(self._init_tabel)
+    
+    def _init_tabel(self):
+        """Buat tabel job jika belum ada"""
+        with self.pool.writer() as conn:
+            conn.cursor().execute('''
+            CREATE TABLE IF NOT EXISTS job_analisis (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                path_input TEXT NOT NULL,
+                format TEXT NOT NULL,
+                kolom TEXT NOT NULL,
+                kolom_id TEXT,
+                simpan_db INTEGER DEFAULT 0,
+                path_hasil TEXT NOT NULL,
+                total INTEGER,
+                diproses INTEGER DEFAULT 0,
+                gagal INTEGER DEFAULT 0,
+                offset_hasil INTEGER DEFAULT 0,
+                durasi REAL DEFAULT 0,
+                error TEXT,
+                dibuat TEXT NOT NULL,
+                selesai TEXT
+            )
+            ''')
+    
+    def start(self):
+        """Jalankan worker dan antrikan ulang job yang belum selesai (idempoten)"""
+        if not self._worker:
+            self._worker = [socketio.start_background_task(self._loop) for _ in range(self.workers)]
+            for job_id in jalankan_blocking(self._job_aktif):
+                logger.info(f"Melanjutkan job {job_id}")
+                self._antrian.put(job_id)
+        return self
+    
+    def _job_aktif(self):
+        with self.pool.reader() as conn:
+            return [row[0] for row in conn.cursor().execute(
+                "SELECT id FROM job_analisis WHERE status IN (?, ?) ORDER BY dibuat",
+                self.STATUS_AKTIF
+            )]
+    
+    def buat(self, path_input, format_file=None, kolom='teks', kolom_id=None, simpan_db=False):
+        """
+        Daftarkan job baru dan masukkan ke antrian
+        
+        Returns:
+            id job
+        """
+        if format_file is None:
+            format_file = tebak_format_input(path_input)
+        if format_file not in ('csv', 'jsonl', 'parquet'):
+            raise ValueError(f"Format tidak didukung: {format_file}")
+        if not os.path.isfile(path_input):
+            raise ValueError(f"File tidak ditemukan: {path_input}")
+        
+        job_id = uuid.uuid4().hex
+        path_hasil = os.path.join(self.job_dir, f"{job_id}.hasil.jsonl")
+        jalankan_blocking(self._daftarkan, job_id, path_input, format_file, kolom, kolom_id, simpan_db, path_hasil)
+        self.start()
+        self._antrian.put(job_id)
+        return job_id
+    
+    def _daftarkan(self, job_id, path_input, format_file, kolom, kolom_id, simpan_db, path_hasil):
+        with self.pool.writer() as conn:
+            conn.cursor().execute(
+                "INSERT INTO job_analisis (id, status, path_input, format, kolom, kolom_id, simpan_db, path_hasil, dibuat) "
+                "VALUES (?, 'antri', ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, path_input, format_file, kolom, kolom_id, int(simpan_db), path_hasil, datetime.now().isoformat())
+            )
+    
+    def dapatkan(self, job_id):
+        """Status dan progress job, None jika tidak ada"""
+        return jalankan_blocking(self._dapatkan, job_id)
+    
+    def _dapatkan(self, job_id):
+        with self.pool.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM job_analisis WHERE id = ?", (job_id,))
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            job = dict(zip([d[0] for d in cursor.getdescription()], row))
+            cursor.close()  # Selesaikan statement sebelum reader kembali ke pool
+        
+        job['simpan_db'] = bool(job['simpan_db'])
+        job['progress'] = round(job['diproses'] / job['total'], 4) if job['total'] else None
+        job['teks_per_detik'] = round(job['diproses'] / job['durasi'], 2) if job['durasi'] > 0 else None
+        return job
+    
+    def _checkpoint(self, job_id, **kolom):
+        with self.pool.writer() as conn:
+            conn.cursor().execute(
+                f"UPDATE job_analisis SET {', '.join(f'{k} = ?' for k in kolom)} WHERE id = ?",
+                (*kolom.values(), job_id)
+            )
+    
+    def _loop(self):
+        while True:
+            job_id = self._antrian.get()
+            try:
+                self._jalankan(job_id)
+            except Exception as e:
+                logger.error(f"Job {job_id} gagal: {str(e)}", exc_info=True)
+                jalankan_blocking(self._checkpoint, job_id, status='gagal', error=str(e),
+                                  selesai=datetime.now().isoformat())
+    
+    def _jalankan(self, job_id):
+        """Proses job dari checkpoint terakhir hingga selesai"""
+        job = jalankan_blocking(self._dapatkan, job_id)
+        if job is None or job['status'] not in self.STATUS_AKTIF:
+            return
+        if job['total'] is None:
+            job['total'] = jalankan_blocking(
+                lambda: sum(1 for _ in baca_input_job(job['path_input'], job['format'], job['kolom']))
+            )
+            jalankan_blocking(self._checkpoint, job_id, status='berjalan', total=job['total'])
+        else:
+            jalankan_blocking(self._checkpoint, job_id, status='berjalan')
+        
+        records = baca_input_job(job['path_input'], job['format'], job['kolom'], job['kolom_id'])
+        records = itertools.islice(records, job['diproses'], None)  # Lewati yang sudah ter-checkpoint
+        
+        with open(job['path_hasil'], 'a+', encoding='utf-8') as out:
+            # Buang hasil yang ditulis setelah checkpoint terakhir
+            out.truncate(job['offset_hasil'])
+            
+            while True:
+                mulai = time.perf_counter()
+                jumlah, gagal, tersimpan = jalankan_blocking(self._proses_chunk, job, records, out)
+                if not jumlah:
+                    break
+                
+                if job['simpan_db'] and tersimpan and self.result_writer is not None:
+                    self.result_writer.simpan_batch(tersimpan)
+                    if self.broadcaster is not None:
+                        self.broadcaster.tandai()
+                
+                job['diproses'] += jumlah
+                job['gagal'] += gagal
+                job['durasi'] += time.perf_counter() - mulai
+                jalankan_blocking(self._checkpoint, job_id, diproses=job['diproses'], gagal=job['gagal'],
+                                  offset_hasil=out.tell(), durasi=job['durasi'])
+        
+        jalankan_blocking(self._checkpoint, job_id, status='selesai', selesai=datetime.now().isoformat())
+        logger.info(f"Job {job_id} selesai: {job['diproses']} teks dalam {job['durasi']:.1f} detik")
+    
+    def _proses_chunk(self, job, records, out):
+        """
+        Analisis satu chunk dan tulis hasilnya ke file (fsync sebelum checkpoint)
+        
+        Returns:
+            Tuple (jumlah record, jumlah gagal, list (teks, hasil) untuk database)
+        """
+        chunk = list(itertools.islice(records, self.chunk_size))
+        if not chunk:
+            return 0, 0, []
+        
+        semua_baris, tersimpan, gagal = analisis_records(self.model, chunk, job['kolom'])
+        out.writelines(json.dumps(baris, default=str) + '\n' for baris in semua_baris)
+        out.flush()
+        os.fsync(out.fileno())
+        return len(chunk), gagal, tersimpan
+
+# -------------- BAGIAN STARTUP --------------
+
+class StatusStartup:
+    """Tahap startup yang sedang berjalan dan durasi tiap tahap, untuk endpoint readiness"""
+    
+    def __init__(self):
+        self.mulai = time.monotonic()
+        self.tahap = 'server'
+        self.durasi = {}  # tahap -> detik
+        self.siap = False
+        self.berhenti = False  # True setelah SIGTERM/SIGINT: request baru ditolak
+        self.error = None
+    
+    @contextmanager
+    def catat(self, tahap):
+        """Tandai tahap yang sedang berjalan dan ukur durasinya"""
+        self.tahap = tahap
+        mulai = time.monotonic()
+        try:
+            yield
+        finally:
+            self.durasi[tahap] = round(time.monotonic() - mulai, 3)
+    
+    def tandai_siap(self):
+        self.tahap = 'siap'
+        self.siap = True
+        self.durasi['total'] = round(time.monotonic() - self.mulai, 3)
+        logger.info(f"Aplikasi siap dalam {self.durasi['total']:.2f} detik: {self.durasi}")
+    
+    def stats(self):
+        return {
+            'siap': self.siap and not self.berhenti,
+            'tahap': 'berhenti' if self.berhenti else self.tahap,
+            'durasi': self.durasi,
+            'uptime': round(time.monotonic() - self.mulai, 3),
+            'error': self.error
+        }
+
+status_startup = StatusStartup()
+
+# Komponen aplikasi, diisi siapkan_aplikasi
+model = batcher = statistik_live = result_writer = broadcaster = job_manager = None
+
+def siapkan_aplikasi(model_path, vocab_path):
+    """
+    Muat model, lexicon dan worker latar belakang setelah server sudah
+    menerima koneksi. Pekerjaan blocking dijalankan di luar hub eventlet
+    sehingga endpoint readiness tetap bisa menjawab selama startup.
+    """
+    global model, batcher, statistik_live, result_writer, broadcaster, job_manager
+    
+    try:
+        with status_startup.catat('model'):
+            model = jalankan_blocking(SentimenModel, model_path, vocab_path)
+        
+        with status_startup.catat('pemanasan'):
+            jalankan_blocking(model.pemanasan)
+        
+        with status_startup.catat('worker'):
+            batcher = MicroBatcher(model).start()
+            
+            # Penulis hasil write-behind, sisa antrian ditulis saat aplikasi berhenti
+            # (SIGTERM/SIGINT lewat hentikan_aplikasi; atexit berjalan terbalik:
+            # flush dulu, baru koneksi ditutup)
+            statistik_live = StatistikLive()
+            jalankan_blocking(statistik_live.muat)
+            statistik_live.start()
+            result_writer = ResultWriter(statistik=statistik_live).start()
+            broadcaster = VisualisasiBroadcaster(statistik_live).start()
+            
+            # Job korpus besar; job yang terputus dilanjutkan dari checkpoint
+            job_manager = JobManager(model, result_writer, broadcaster).start()
+            atexit.register(result_writer.flush)
+        
+        metrik.kolektor(kolektor_metrik_aplikasi)
+        status_startup.tandai_siap()
+    
+    except Exception as e:
+        status_startup.error = str(e)
+        logger.error(f"Gagal memuat model: {str(e)}", exc_info=True)
+        os._exit(1)
+
+def hentikan_aplikasi(signum):
+    """
+    Shutdown bersih setelah SIGTERM/SIGINT: tolak request baru, tulis semua
+    hasil yang masih di antrian penulis, tutup koneksi database lalu keluar.
+    atexit tidak dijalankan Python untuk SIGTERM, jadi langkah ini eksplisit.
+    """
+    logger.info(f"Sinyal {signal.Signals(signum).name} diterima, menghentikan aplikasi")
+    status_startup.berhenti = True
+    kode = 0
+    try:
+        if result_writer is not None:
+            result_writer.tutup()
+            logger.info(f"Antrian hasil ditulis: {result_writer.stats()}")
+        jalankan_blocking(penulis_cache.flush)
+        db_pool.close()
+    except Exception as e:
+        logger.error(f"Gagal menulis sisa hasil saat berhenti: {str(e)}", exc_info=True)
+        kode = 1
+    logging.shutdown()
+    os._exit(kode)
+
+def pasang_handler_sinyal():
+    """
+    Jalankan hentikan_aplikasi di greenlet terpisah saat SIGTERM/SIGINT diterima.
+    
+    Greenlet baru dari handler sinyal baru berjalan saat hub eventlet bangun,
+    padahal hub yang menganggur bisa tidur hingga timer berikutnya. Handler
+    karena itu menulis nomor sinyal ke pipe yang ditunggu greenlet penjaga
+    (self-pipe), sehingga hub langsung bangun.
+    """
+    baca, tulis = os.pipe()
+    os.set_blocking(baca, False)
+    os.set_blocking(tulis, False)
+    
+    def penjaga():
+        from eventlet.hubs import trampoline
+        while True:
+            trampoline(baca, read=True)
+            try:
+                data = os.read(baca, 64)
+            except BlockingIOError:
+                continue
+            if data:
+                hentikan_aplikasi(data[0])
+                return
+    
+    def handler(signum, frame):
+        if not status_startup.berhenti:
+            # Request baru langsung ditolak, sebelum antrian penulis di-flush
+            status_startup.berhenti = True
+            os.write(tulis, bytes([signum]))
+    
+    socketio.start_background_task(penjaga)
+    for sinyal in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sinyal, handler)
+
+def kolektor_metrik_aplikasi():
+    """Metrik yang dibaca dari komponen aplikasi saat /metrics di-scrape"""
+    writer = result_writer.stats()
+    cache = {'terjemahan': model.translation_cache.stats(), 'hasil': model.result_cache.stats()}
+    return [
+        ('sentimen_antrian_penulis', 'gauge', 'Jumlah hasil yang menunggu ditulis ke database',
+         [({}, writer['kedalaman_antrian'])]),
+        ('sentimen_antrian_batcher', 'gauge', 'Jumlah request yang menunggu micro-batch',
+         [({}, batcher.kedalaman_antrian())]),
+        ('sentimen_hasil_ditulis_total', 'counter', 'Jumlah hasil yang ditulis ke database per status',
+         [({'status': 'berhasil'}, writer['ditulis']), ({'status': 'gagal'}, writer['gagal'])]),
+        ('sentimen_cache_hits_total', 'counter', 'Jumlah hit cache per cache dan tingkat',
+         [({'cache': nama, 'tingkat': tingkat}, stats[f'hits_{tingkat}'])
+          for nama, stats in cache.items() for tingkat in ('memori', 'disk')]),
+        ('sentimen_cache_misses_total', 'counter', 'Jumlah miss cache',
+         [({'cache': nama}, stats['misses']) for nama, stats in cache.items()]),
+    ]
+
 # -------------- ROUTE DAN SOCKETIO --------------
 
+@app.before_request
+def tolak_jika_belum_siap():
+    """Request API selain readiness ditolak dengan 503 sampai model siap"""
+    if request.path.startswith('/api/') and request.path != '/api/siap':
+        if status_startup.berhenti:
+            return jsonify({'error': 'Aplikasi sedang berhenti'}), 503
+        if not status_startup.siap:
+            return jsonify({'error': 'Aplikasi belum siap', 'tahap': status_startup.tahap}), 503
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Metrik dalam format teks Prometheus"""
+    return Response(metrik.render(), mimetype='text/plain; version=0.0.4')
+
+def butuh_token_admin(fungsi):
+    """
+    Endpoint admin hanya melayani request dengan header X-Admin-Token yang cocok
+    dengan ADMIN_TOKEN. remote_addr tidak dipakai karena di belakang reverse
+    proxy semua request tampak datang dari localhost.
+    """
+    @wraps(fungsi)
+    def pembungkus(*args, **kwargs):
+        if not ADMIN_TOKEN:
+            return jsonify({'error': 'Endpoint admin nonaktif (SENTIMEN_ADMIN_TOKEN belum diatur)'}), 404
+        token = request.headers.get('X-Admin-Token', '')
+        if not hmac.compare_digest(token.encode('utf-8'), ADMIN_TOKEN.encode('utf-8')):
+            return jsonify({'error': 'Token admin tidak valid'}), 403
+        return fungsi(*args, **kwargs)
+    return pembungkus
+
+@app.route('/admin/tracing', methods=['GET', 'POST'])
+@butuh_token_admin
+def admin_tracing():
+    """
+    GET: status tracing, N request paling lambat dan daftar file profil.
+    POST {"aktif": bool, "profil_setiap": K}: ubah konfigurasi saat runtime.
+    """
+    if request.method == 'POST':
+        data = request.get_json(silent=True) or {}
+        if 'aktif' in data:
+            tracer.aktif = bool(data['aktif'])
+        if 'profil_setiap' in data:
+            tracer.profil_setiap = max(0, int(data['profil_setiap']))
+    
+    n = request.args.get('n', TRACING_TERLAMBAT, type=int)
+    return jsonify({
+        'aktif': tracer.aktif,
+        'profil_setiap': tracer.profil_setiap,
+        'terlambat': tracer.terlambat(n),
+        'profil': tracer.daftar_profil()
+    })
+
+@app.route('/admin/profil/<nama_file>', methods=['GET'])
+@butuh_token_admin
+def admin_profil(nama_file):
+    """Ringkasan pstats dari satu file profil"""
+    try:
+        return Response(tracer.baca_profil(nama_file), mimetype='text/plain')
+    except (OSError, TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 404
+
+@app.route('/api/siap', methods=['GET'])
+def readiness():
+    """Readiness probe: 200 jika model dan lexicon sudah dimuat dan dipanaskan, 503 saat berhenti"""
+    return jsonify(status_startup.stats()), 200 if status_startup.siap and not status_startup.berhenti else 503
+
 @app.route('/')
 def index():
     """Render halaman utama"""
@@ -619,11 +3604,17 @@ def index():
 @app.route('/api/sentimen', methods=['POST'])
 def analisis_sentimen():
     try:
-        data = request.json
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict) or not isinstance(data.get('teks'), str):
+            return jsonify({'error': "Field 'teks' (string) tidak ditemukan"}), 400
         teks = data['teks']
         
-        hasil = model.predict(teks)
-        simpan_hasil(teks, hasil)
+        trace = tracer.mulai('analisis_sentimen')
+        with tracer.span(trace, 'predict'):
+            hasil = batcher.predict(teks, trace)
+        if 'error' not in hasil:
+            with tracer.span(trace, 'simpan'):
+                result_writer.simpan(teks, hasil)
         
         # Format response baru
         response = {
@@ -633,48 +3624,183 @@ def analisis_sentimen():
             },
             'kata_positif': hasil.get('positive_words', []),
             'terjemahan': hasil.get('translations', []),
-            'statistik': dapatkan_statistik()
+            'statistik': statistik_live.dapatkan()
         }
         
+        tracer.selesai(trace)
         return jsonify(response)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/sentimen/bulk', methods=['POST'])
+def analisis_sentimen_bulk():
+    """
+    Analisis banyak teks sekaligus. Body berupa array JSON atau NDJSON,
+    hasil di-stream sebagai NDJSON dengan id yang sama seperti input.
+    """
+    try:
+        ndjson = 'ndjson' in (request.content_type or '')
+        items = baca_item_bulk(request.get_data(as_text=True), ndjson)
+    except ValueError as e:
+        return jsonify({'error': f"Body tidak valid: {str(e)}"}), 400
+    
+    if not items:
+        return jsonify({'error': 'Tidak ada teks dalam request'}), 400
+    if len(items) > BULK_MAX_ITEMS:
+        return jsonify({'error': f"Maksimal {BULK_MAX_ITEMS} teks per request"}), 413
+    
+    return Response(stream_analisis_bulk(items), mimetype='application/x-ndjson')
+
+@app.route('/api/jobs', methods=['POST'])
+def buat_job():
+    """
+    Daftarkan job analisis dari file upload (multipart field 'file') atau
+    path lokal (JSON {"path": ...}). Opsi: format, kolom, kolom_id, simpan_db.
+    """
+    try:
+        upload = request.files.get('file')
+        opsi = request.form if upload else (request.get_json(silent=True) or {})
+        
+        if upload:
+            ext = {'csv': '.csv', 'parquet': '.parquet'}.get(tebak_format_input(upload.filename), '.jsonl')
+            path_input = os.path.join(job_manager.job_dir, f"{uuid.uuid4().hex}.input{ext}")
+            upload.save(path_input)
+        elif opsi.get('path'):
+            path_input = os.path.abspath(opsi['path'])
+            root = os.path.abspath(JOB_INPUT_ROOT)
+            if os.path.commonpath([root, path_input]) != root:
+                return jsonify({'error': f"Path harus berada di dalam {root}"}), 400
+        else:
+            return jsonify({'error': "Sertakan file upload atau 'path'"}), 400
+        
+        simpan_db = str(opsi.get('simpan_db', '')).lower() in ('1', 'true', 'ya')
+        job_id = job_manager.buat(path_input, opsi.get('format'), opsi.get('kolom', 'teks'),
+                                  opsi.get('kolom_id'), simpan_db)
+        return jsonify(job_manager.dapatkan(job_id)), 202
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def status_job(job_id):
+    """Status, progress dan throughput (teks/detik) job"""
+    job = job_manager.dapatkan(job_id)
+    if job is None:
+        return jsonify({'error': 'Job tidak ditemukan'}), 404
+    return jsonify(job)
+
+@app.route('/api/jobs/<job_id>/hasil', methods=['GET'])
+def hasil_job(job_id):
+    """Unduh hasil job (NDJSON) setelah selesai"""
+    job = job_manager.dapatkan(job_id)
+    if job is None:
+        return jsonify({'error': 'Job tidak ditemukan'}), 404
+    if job['status'] != 'selesai':
+        return jsonify({'error': f"Job belum selesai (status: {job['status']})"}), 409
+    return send_file(os.path.abspath(job['path_hasil']), mimetype='application/x-ndjson',
+                     as_attachment=True, download_name=f"{job_id}.jsonl")
+
+@app.route('/api/riwayat', methods=['GET'])
+def riwayat_hasil():
+    """
+    Riwayat hasil analisis dengan keyset pagination. Query: label (pisah koma),
+    skor_min, skor_max, dari, sampai (tanggal YYYY-MM-DD atau timestamp ISO;
+    sampai berupa tanggal mencakup seluruh hari itu), q (substring teks),
+    limit, urutan (desc/asc), cursor (dari cursor_berikutnya halaman sebelumnya).
+    """
+    try:
+        label = [l.strip() for l in request.args.get('label', '').split(',') if l.strip()]
+        limit = min(max(1, request.args.get('limit', RIWAYAT_LIMIT, type=int)), RIWAYAT_LIMIT_MAKS)
+        data, berikutnya = dapatkan_riwayat(
+            label=label,
+            skor_min=request.args.get('skor_min', type=float),
+            skor_max=request.args.get('skor_max', type=float),
+            dari=request.args.get('dari'),
+            sampai=request.args.get('sampai'),
+            q=request.args.get('q'),
+            cursor_halaman=request.args.get('cursor'),
+            limit=limit,
+            urutan=request.args.get('urutan', 'desc')
+        )
+        return jsonify({'data': data, 'cursor_berikutnya': berikutnya})
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error saat mengambil riwayat: {str(e)}", exc_info=True)
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/antrian/hasil', methods=['GET'])
+def statistik_antrian_hasil():
+    """Metrik antrian penulis hasil (kedalaman antrian, latensi commit)"""
+    return jsonify(result_writer.stats())
+
+@app.route('/api/cache/terjemahan', methods=['GET'])
+def statistik_cache_terjemahan():
+    """Statistik hit/miss cache terjemahan"""
+    return jsonify(model.translation_cache.stats())
+
+@app.route('/api/cache/hasil', methods=['GET'])
+def statistik_cache_hasil():
+    """Statistik hit/miss dan versi cache hasil prediksi"""
+    return jsonify(model.result_cache.stats())
+
 @socketio.on('connect')
 def handle_connect():
     """Handler saat client terhubung via WebSocket"""
     try:
         logger.info(f"Client terhubung: {request.sid}")
+        if not status_startup.siap:
+            return
         
         # Kirim data visualisasi terbaru ke client baru
-        statistik = dapatkan_statistik()
-        visualisasi = buat_visualisasi_plotly(statistik)
-        emit('update_visualisasi', visualisasi)
+        emit('update_visualisasi', broadcaster.payload())
     except Exception as e:
         logger.error(f"Error saat menangani koneksi: {str(e)}")
 
+@socketio.on('minta_resync')
+def handle_resync_request():
+    """Client mendeteksi celah versi stats_delta, kirim ulang visualisasi penuh"""
+    if status_startup.siap:
+        emit('update_visualisasi', broadcaster.payload())
+
 @socketio.on('request_analisis')
 def handle_analisis_request(data):
     """Handler untuk request analisis melalui WebSocket"""
     try:
-        if not data or 'teks' not in data:
+        if not isinstance(data, dict) or 'teks' not in data:
             emit('hasil_analisis', {'error': 'Teks tidak ditemukan dalam request'})
             return
+        if not isinstance(data['teks'], str):
+            emit('hasil_analisis', {'error': "Field 'teks' harus berupa string"})
+            return
+        if not status_startup.siap:
+            emit('hasil_analisis', {'error': 'Aplikasi belum siap'})
+            return
+        if status_startup.berhenti:
+            emit('hasil_analisis', {'error': 'Aplikasi sedang berhenti'})
+            return
         
         teks = data['teks']
-        hasil = model.predict(teks)
+        trace = tracer.mulai('request_analisis')
+        with tracer.span(trace, 'predict'):
+            hasil = batcher.predict(teks, trace)
         
-        # Simpan hasil ke database
-        simpan_hasil(teks, hasil)
+        # Simpan hasil ke database (hasil error tidak disimpan, sama seperti bulk)
+        if 'error' not in hasil:
+            with tracer.span(trace, 'simpan'):
+                result_writer.simpan(teks, hasil)
         
         # Kirim hasil ke client yang meminta
-        emit('hasil_analisis', hasil)
+        with tracer.span(trace, 'emit'):
+            emit('hasil_analisis', hasil)
+        tracer.selesai(trace)
         
-        # Update visualisasi untuk semua client
-        statistik = dapatkan_statistik()
-        visualisasi = buat_visualisasi_plotly(statistik)
-        socketio.emit('update_visualisasi', visualisasi)
+        # Update visualisasi untuk semua client (digabung per BROADCAST_INTERVAL)
+        broadcaster.tandai()
     except Exception as e:
         logger.error(f"Error saat memproses request analisis: {str(e)}")
         emit('hasil_analisis', {'error': str(e)})
@@ -692,20 +3818,16 @@ if __name__ == '__main__':
             logger.error("Gagal menginisialisasi database. Aplikasi berhenti.")
             exit(1)
         
-        # Load model
-        try:
-            model = SentimenModel(MODEL_PATH, VOCAB_PATH)
-            logger.info("Model berhasil dimuat")
-            
-            # Verifikasi database
-            with get_db_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM sentimen_statistik")
-                logger.info(f"Total data statistik: {cursor.fetchone()[0]}")
+        atexit.register(db_pool.close)
+        pasang_handler_sinyal()
         
-        except Exception as e:
-            logger.error(f"Gagal memuat model: {str(e)}")
-            exit(1)
+        # Verifikasi database
+        with db_pool.reader() as conn:
+            jumlah = conn.cursor().execute("SELECT COUNT(*) FROM sentimen_statistik").fetchall()[0][0]
+            logger.info(f"Total data statistik: {jumlah}")
+        
+        # Model dimuat di background; /api/siap menjawab 503 sampai selesai
+        socketio.start_background_task(siapkan_aplikasi, MODEL_PATH, VOCAB_PATH)
         
         # Konfigurasi SocketIO
         socketio.run(app, 
@@ -0,0 +1,254 @@
+"""
+Load test HTTP/WebSocket untuk satu node app.py di localhost.
+
+Menjalankan bersamaan:
+  - N worker REST yang mengirim POST /api/sentimen
+  - N client Socket.IO yang mengirim event request_analisis
+  - M client dashboard yang hanya menerima update_visualisasi / stats_delta
+
+Melaporkan throughput dan persentil latensi per jenis request, serta lag
+broadcast: jeda dari analisis selesai sampai dashboard menerima update
+(termasuk debounce BROADCAST_INTERVAL) dan sebaran waktu terima antar
+dashboard untuk versi statistik yang sama (fan-out).
+
+Dengan --jalankan-server, app.py dijalankan dengan translator noop dan
+database sementara, lalu dihentikan setelah selesai.
+
+Butuh client python-socketio (pip install "python-socketio[client]").
+
+Contoh:
+    python benchmarks/beban.py --jalankan-server --rest 8 --socket 8 --dashboard 50 --durasi 30
+    python benchmarks/beban.py --url http://127.0.0.1:5000 --korpus ulasan.txt --output beban.json
+"""
+import os
+import sys
+import csv
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+import subprocess
+import urllib.request
+import urllib.error
+
+import socketio
+
+from pipeline import KATA_PENGISI, ringkas
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def muat_korpus(path, jumlah, seed):
+    """Teks dari file (satu teks per baris, atau JSONL dengan field 'teks'), atau korpus sintetis"""
+    if path:
+        with open(path, encoding='utf-8') as f:
+            baris = [line.strip() for line in f if line.strip()]
+        return [json.loads(line)['teks'] if line.startswith('{') else line for line in baris]
+    
+    rng = random.Random(seed)
+    lexicon = []
+    for nama in ('positive_words.csv', 'negative_words.csv'):
+        with open(os.path.join(ROOT, nama), encoding='utf-8', newline='') as f:
+            lexicon.extend(row['word'] for row in csv.DictReader(f) if row.get('word'))
+    return [
+        ' '.join(rng.sample(KATA_PENGISI, rng.randint(4, 12)) + rng.choices(lexicon, k=rng.randint(0, 3)))
+        for _ in range(jumlah)
+    ]
+
+class Rekaman:
+    """Hasil pengukuran yang dikumpulkan dari semua thread"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latensi = {'rest': [], 'socket': []}
+        self.error = {'rest': 0, 'socket': 0}
+        self.selesai = []  # waktu monotonic setiap analisis selesai
+        self.terima = {}   # versi -> list waktu terima di dashboard
+        self.lag = []
+    
+    def catat(self, jenis, mulai, berhasil):
+        sekarang = time.monotonic()
+        with self._lock:
+            if berhasil:
+                self.latensi[jenis].append(sekarang - mulai)
+                if jenis == 'socket':  # Hanya request_analisis yang memicu broadcast
+                    self.selesai.append(sekarang)
+            else:
+                self.error[jenis] += 1
+    
+    def catat_broadcast(self, versi, sebelumnya, sekarang):
+        """Lag: analisis yang selesai sejak broadcast sebelumnya sampai broadcast ini diterima"""
+        with self._lock:
+            self.terima.setdefault(versi, []).append(sekarang)
+            self.lag.extend(sekarang - t for t in self.selesai if sebelumnya < t <= sekarang)
+
+class TeksBerputar:
+    """Iterator teks thread-safe; opsional menambah akhiran unik agar tidak kena cache hasil"""
+    
+    def __init__(self, korpus, unik):
+        self.korpus = korpus
+        self.unik = unik
+        self._i = 0
+        self._lock = threading.Lock()
+    
+    def berikut(self):
+        with self._lock:
+            i = self._i
+            self._i += 1
+        teks = self.korpus[i % len(self.korpus)]
+        return f"{teks} #{i}" if self.unik else teks
+
+def worker_rest(url, teks, rekaman, berhenti):
+    while not berhenti.is_set():
+        body = json.dumps({'teks': teks.berikut()}).encode('utf-8')
+        req = urllib.request.Request(f"{url}/api/sentimen", data=body, headers={'Content-Type': 'application/json'})
+        mulai = time.monotonic()
+        try:
+            with urllib.request.urlopen(req, timeout=30) as response:
+                berhasil = response.status == 200 and 'error' not in json.loads(response.read())
+        except (urllib.error.URLError, OSError, ValueError):
+            berhasil = False
+        rekaman.catat('rest', mulai, berhasil)
+
+def worker_socket(url, teks, rekaman, berhenti):
+    client = socketio.Client(reconnection=False)
+    jawaban = threading.Event()
+    status = {}
+    
+    @client.on('hasil_analisis')
+    def hasil_analisis(data):
+        status['berhasil'] = 'error' not in data
+        jawaban.set()
+    
+    client.connect(url, transports=['websocket'])
+    try:
+        while not berhenti.is_set():
+            jawaban.clear()
+            mulai = time.monotonic()
+            client.emit('request_analisis', {'teks': teks.berikut()})
+            rekaman.catat('socket', mulai, jawaban.wait(30) and status.get('berhasil', False))
+    finally:
+        client.disconnect()
+
+def buat_dashboard(url, rekaman):
+    """Client yang hanya mendengarkan broadcast visualisasi"""
+    client = socketio.Client(reconnection=False)
+    terakhir = {'waktu': time.monotonic()}
+    
+    def terima(data):
+        sekarang = time.monotonic()
+        versi = (data or {}).get('versi')
+        if versi is not None:
+            rekaman.catat_broadcast(versi, terakhir['waktu'], sekarang)
+        terakhir['waktu'] = sekarang
+    
+    client.on('update_visualisasi', terima)
+    client.on('stats_delta', terima)
+    client.connect(url, transports=['websocket'])
+    return client
+
+def tunggu_siap(url, batas_waktu):
+    mulai = time.monotonic()
+    while time.monotonic() - mulai < batas_waktu:
+        try:
+            with urllib.request.urlopen(f"{url}/api/siap", timeout=1) as response:
+                if response.status == 200:
+                    return True
+        except (urllib.error.URLError, OSError):
+            pass
+        time.sleep(0.2)
+    return False
+
+def jalankan_server(tmp):
+    """app.py dengan translator noop dan database sementara"""
+    env = dict(os.environ, SENTIMEN_TRANSLATOR='noop', SENTIMEN_DB=os.path.join(tmp, 'beban.db'))
+    return subprocess.Popen(
+        [sys.executable, 'app.py'], cwd=ROOT, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test /api/sentimen, request_analisis dan broadcast dashboard")
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--jalankan-server', action='store_true',
+                        help="Jalankan app.py (translator noop, database sementara) selama pengujian")
+    parser.add_argument('--rest', type=int, default=4, help="Jumlah worker REST bersamaan")
+    parser.add_argument('--socket', type=int, default=4, help="Jumlah client request_analisis bersamaan")
+    parser.add_argument('--dashboard', type=int, default=20, help="Jumlah client dashboard")
+    parser.add_argument('--durasi', type=float, default=20.0, help="Lama pengujian (detik)")
+    parser.add_argument('--korpus', help="File teks (satu per baris) atau JSONL dengan field 'teks'")
+    parser.add_argument('--dengan-duplikat', action='store_true',
+                        help="Kirim teks korpus apa adanya (cache hasil ikut terukur)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="Simpan hasil JSON ke file")
+    args = parser.parse_args(argv)
+    
+    tmp = tempfile.TemporaryDirectory()
+    server = None
+    if args.jalankan_server:
+        server = jalankan_server(tmp.name)
+    
+    try:
+        if not tunggu_siap(args.url, 180):
+            print(f"Server {args.url} tidak siap", file=sys.stderr)
+            return 1
+        
+        teks = TeksBerputar(muat_korpus(args.korpus, 1000, args.seed), unik=not args.dengan_duplikat)
+        rekaman = Rekaman()
+        berhenti = threading.Event()
+        
+        dashboards = [buat_dashboard(args.url, rekaman) for _ in range(args.dashboard)]
+        threads = [threading.Thread(target=worker_rest, args=(args.url, teks, rekaman, berhenti), daemon=True)
+                   for _ in range(args.rest)]
+        threads += [threading.Thread(target=worker_socket, args=(args.url, teks, rekaman, berhenti), daemon=True)
+                    for _ in range(args.socket)]
+        
+        mulai = time.monotonic()
+        for thread in threads:
+            thread.start()
+        time.sleep(args.durasi)
+        berhenti.set()
+        for thread in threads:
+            thread.join(timeout=35)
+        durasi = time.monotonic() - mulai
+        
+        # Beri waktu broadcast terakhir sampai ke dashboard
+        time.sleep(2)
+        for client in dashboards:
+            client.disconnect()
+        
+        hasil = {
+            'konfigurasi': {
+                'url': args.url, 'rest': args.rest, 'socket': args.socket, 'dashboard': args.dashboard,
+                'durasi_detik': round(durasi, 2), 'teks_unik': not args.dengan_duplikat
+            },
+            'rest': dict(ringkas(rekaman.latensi['rest']), error=rekaman.error['rest'],
+                         rps=round(len(rekaman.latensi['rest']) / durasi, 1)),
+            'socket': dict(ringkas(rekaman.latensi['socket']), error=rekaman.error['socket'],
+                           rps=round(len(rekaman.latensi['socket']) / durasi, 1)),
+            'broadcast': {
+                'versi_diterima': len(rekaman.terima),
+                'event_diterima': sum(len(waktu) for waktu in rekaman.terima.values()),
+                'lag_analisis_ke_dashboard': ringkas(rekaman.lag),
+                'sebaran_fan_out': ringkas([max(w) - min(w) for w in rekaman.terima.values() if len(w) > 1])
+            }
+        }
+    finally:
+        if server is not None:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+        tmp.cleanup()
+    
+    teks_json = json.dumps(hasil, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(teks_json)
+    print(teks_json)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""
+Benchmark pipeline analisis sentimen yang berjalan sepenuhnya offline.
+
+Translator diganti backend noop, cache terjemahan dan cache hasil hanya di
+memori (cache hasil dimatikan agar setiap teks benar-benar dianalisis),
+lexicon memakai CSV bawaan, dan database memakai file sementara.
+
+Mengukur:
+  - latensi satu teks (predict) dalam persentil
+  - throughput predict_batch untuk beberapa ukuran batch
+  - throughput tulis simpan_hasil dan simpan_hasil_batch
+  - latensi query dapatkan_statistik
+  - biaya buat_visualisasi_plotly
+
+Model: --model, atau model/sentimen_model.tflite (lihat load_models.py), atau
+model sintetis kecil yang dibuat dengan tensorflow (--sintetis).
+
+Contoh:
+    python benchmarks/pipeline.py --output hasil-bench.json
+    python benchmarks/pipeline.py --sintetis --ulang 500
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+import multiprocessing
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # Lexicon CSV dibaca relatif terhadap root repo
+
+import app
+
+MODEL_BAWAAN = 'model/sentimen_model.tflite'
+
+KATA_PENGISI = [
+    'the', 'product', 'service', 'delivery', 'was', 'is', 'really', 'very', 'and', 'but',
+    'produk', 'pelayanan', 'pengiriman', 'sangat', 'cukup', 'dan', 'tapi', 'ini', 'itu', 'sekali'
+]
+
+def buat_korpus(jumlah, seed):
+    """Teks sintetis dari kata lexicon bawaan dan kata pengisi (deterministik untuk seed yang sama)"""
+    rng = random.Random(seed)
+    lexicon = sorted(
+        row['word'] for path in app.LEXICON_FILES for row in app.baca_csv(path) if row.get('word')
+    )
+    korpus = []
+    for i in range(jumlah):
+        kata = rng.choices(KATA_PENGISI, k=rng.randint(4, 20)) + rng.choices(lexicon, k=rng.randint(0, 3))
+        rng.shuffle(kata)
+        korpus.append(' '.join(kata) + f' #{i}')  # Akhiran unik: tidak ada teks kembar
+    return korpus
+
+def buat_model_sintetis(path, max_length=256):
+    """
+    Model TFLite kecil (embedding + pooling + dense) dengan input (1, max_length)
+    float32. Dibuat di proses terpisah: tensorflow dan tflite_runtime yang
+    dimuat dalam satu proses saling bentrok saat interpreter dibuat.
+    """
+    proses = multiprocessing.get_context('spawn').Process(target=_tulis_model_sintetis, args=(path, max_length))
+    proses.start()
+    proses.join()
+    if proses.exitcode != 0:
+        raise RuntimeError(f"Gagal membuat model sintetis (exit code {proses.exitcode})")
+    return path
+
+def _tulis_model_sintetis(path, max_length):
+    import tensorflow as tf
+    
+    model = tf.keras.Sequential([
+        tf.keras.layers.Input(shape=(max_length,), batch_size=1, dtype=tf.float32),
+        # Fitur hash_stabil berada di [0, 1): skalakan dulu agar tiap kata punya indeks embedding sendiri
+        tf.keras.layers.Lambda(lambda x: tf.cast(x * 10000, tf.int32) % 10000),
+        tf.keras.layers.Embedding(10000, 16),
+        tf.keras.layers.GlobalAveragePooling1D(),
+        tf.keras.layers.Dense(3, activation='softmax')
+    ])
+    with open(path, 'wb') as f:
+        f.write(tf.lite.TFLiteConverter.from_keras_model(model).convert())
+
+def ringkas(durasi):
+    """Persentil latensi dalam milidetik"""
+    if not durasi:
+        return {'n': 0}
+    urut = sorted(durasi)
+    def persentil(p):
+        return round(urut[min(len(urut) - 1, int(p / 100 * len(urut)))] * 1000, 3)
+    return {
+        'n': len(urut),
+        'mean_ms': round(statistics.fmean(urut) * 1000, 3),
+        'p50_ms': persentil(50),
+        'p90_ms': persentil(90),
+        'p99_ms': persentil(99),
+        'max_ms': round(urut[-1] * 1000, 3)
+    }
+
+def ukur(fungsi, ulang):
+    durasi = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fungsi()
+        durasi.append(time.perf_counter() - mulai)
+    return durasi
+
+def bench_latensi_tunggal(model, korpus, ulang):
+    teks = iter(korpus)
+    model.predict(korpus[0])  # Pemanasan di luar pengukuran
+    return ringkas(ukur(lambda: model.predict(next(teks)), ulang))
+
+def bench_throughput_batch(model, korpus, ukuran_batch, jumlah):
+    hasil = {}
+    for ukuran in ukuran_batch:
+        batch = [korpus[i:i + ukuran] for i in range(0, min(jumlah, len(korpus)), ukuran)]
+        mulai = time.perf_counter()
+        for texts in batch:
+            model.predict_batch(texts)
+        durasi = time.perf_counter() - mulai
+        total = sum(len(texts) for texts in batch)
+        hasil[str(ukuran)] = {'teks': total, 'detik': round(durasi, 4), 'teks_per_detik': round(total / durasi, 1)}
+    return hasil
+
+def bench_simpan_hasil(korpus, jumlah, ukuran_batch):
+    hasil_dummy = [
+        (teks, {'label': random.choice(['positif', 'netral', 'negatif']), 'skor': 0.8,
+                'timestamp': datetime.now().isoformat()})
+        for teks in korpus[:jumlah]
+    ]
+    
+    mulai = time.perf_counter()
+    for teks, hasil in hasil_dummy:
+        app.simpan_hasil(teks, hasil)
+    durasi_tunggal = time.perf_counter() - mulai
+    
+    mulai = time.perf_counter()
+    for i in range(0, len(hasil_dummy), ukuran_batch):
+        app.simpan_hasil_batch(hasil_dummy[i:i + ukuran_batch])
+    durasi_batch = time.perf_counter() - mulai
+    
+    return {
+        'simpan_hasil': {'baris': len(hasil_dummy), 'baris_per_detik': round(len(hasil_dummy) / durasi_tunggal, 1)},
+        'simpan_hasil_batch': {'baris': len(hasil_dummy), 'ukuran_batch': ukuran_batch,
+                               'baris_per_detik': round(len(hasil_dummy) / durasi_batch, 1)}
+    }
+
+def versi_git():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark pipeline analisis sentimen (offline)")
+    parser.add_argument('--model', help=f"Path model TFLite (default: {MODEL_BAWAAN})")
+    parser.add_argument('--sintetis', action='store_true', help="Buat dan pakai model sintetis (butuh tensorflow)")
+    parser.add_argument('--ulang', type=int, default=200, help="Jumlah pengukuran latensi")
+    parser.add_argument('--jumlah-batch', type=int, default=2048, help="Teks per pengukuran throughput batch")
+    parser.add_argument('--ukuran-batch', default='1,8,16,32,64', help="Daftar ukuran batch dipisah koma")
+    parser.add_argument('--jumlah-tulis', type=int, default=2000, help="Baris per pengukuran simpan_hasil")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="Simpan hasil JSON ke file")
+    args = parser.parse_args(argv)
+    
+    random.seed(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        # Database sementara agar hasil tidak bergantung pada isi sentimen_data.db
+        app.DB_PATH = os.path.join(tmp, 'bench.db')
+        app.init_db()
+        
+        if args.sintetis:
+            model_path = buat_model_sintetis(os.path.join(tmp, 'sintetis.tflite'))
+        else:
+            model_path = args.model or MODEL_BAWAAN
+        
+        mulai = time.perf_counter()
+        model = app.SentimenModel(model_path, translator_backend='noop', cache_persisten=False)
+        model.result_cache = app.PredictionCache(model.result_cache.versi, persisten=False, max_size=0)
+        model.pemanasan()
+        waktu_muat = time.perf_counter() - mulai
+        
+        korpus = buat_korpus(max(args.ulang + 1, args.jumlah_batch, args.jumlah_tulis), args.seed)
+        ukuran_batch = [int(n) for n in args.ukuran_batch.split(',') if n.strip()]
+        
+        hasil = {
+            'meta': {
+                'commit': versi_git(),
+                'waktu': datetime.now().isoformat(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'model': 'sintetis' if args.sintetis else model_path,
+                'interpreter_pool': model.interpreter_pool.size,
+                'seed': args.seed
+            },
+            'muat_model_detik': round(waktu_muat, 3),
+            'latensi_tunggal': bench_latensi_tunggal(model, korpus, args.ulang),
+            'throughput_batch': bench_throughput_batch(model, korpus, ukuran_batch, args.jumlah_batch),
+            'tulis_db': bench_simpan_hasil(korpus, args.jumlah_tulis, app.WRITER_BATCH_SIZE),
+            'dapatkan_statistik': ringkas(ukur(app.dapatkan_statistik, args.ulang))
+        }
+        
+        statistik = app.dapatkan_statistik()
+        hasil['buat_visualisasi_plotly'] = ringkas(ukur(lambda: app.buat_visualisasi_plotly(statistik), args.ulang))
+        
+        app.db_pool.close()
+    
+    teks = json.dumps(hasil, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(teks)
+    print(teks)
+
+if __name__ == '__main__':
+    main()
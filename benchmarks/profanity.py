@@ -0,0 +1,122 @@
+"""
+Microbenchmark deteksi kata kotor: ProfanityIndex.cari dibandingkan jalur
+lama yang memanggil better_profanity dan profanityfilter per teks.
+
+Jalur lama per teks (sebelum ProfanityIndex):
+  - _analisis_awal: profanity.contains_profanity pada teks asli dan terjemahan
+  - analyze_sentiment_lexicon: profanity.contains_profanity pada teks asli
+    dan satu ProfanityFilter.censor atas token teks terjemahan
+Jalur baru: satu ProfanityIndex.cari pada teks terjemahan (ditambah
+contains pada teks asli jika berbeda).
+
+Teks asli dan terjemahan dianggap sama (translator noop), jadi kedua jalur
+diukur tanpa biaya terjemahan. Butuh better_profanity dan profanityfilter.
+
+Contoh:
+    python benchmarks/profanity.py --jumlah 5000 --output profanity.json
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # Lexicon CSV dibaca relatif terhadap root repo
+
+from better_profanity import profanity
+from profanityfilter import ProfanityFilter
+
+import app
+from pipeline import buat_korpus, ringkas, ukur, versi_git
+
+# Sama dengan setup_profanity_filter
+KATA_KUSTOM = ['idiot', 'stupid', 'hate', 'terrible', 'awful', 'worst',
+               'jelek', 'buruk', 'bodoh', 'tolol', 'menyebalkan']
+
+def buat_korpus_profanity(jumlah, seed, rasio_kotor):
+    """Korpus pipeline dengan sebagian teks disisipi satu kata kotor"""
+    rng = random.Random(seed)
+    korpus = buat_korpus(jumlah, seed)
+    for i in range(len(korpus)):
+        if rng.random() < rasio_kotor:
+            kata = korpus[i].split()
+            kata.insert(rng.randrange(len(kata) + 1), rng.choice(KATA_KUSTOM))
+            korpus[i] = ' '.join(kata)
+    return korpus
+
+def jalur_lama(pf_extended):
+    """Panggilan library per teks seperti sebelum ProfanityIndex"""
+    def deteksi(text):
+        translated_text = text
+        if profanity.contains_profanity(text) or profanity.contains_profanity(translated_text):
+            return True
+        tokens = [token for token, _, _ in app.tokenisasi(translated_text.lower())]
+        disensor = pf_extended.censor(' '.join(tokens))
+        return profanity.contains_profanity(text) or '*' in disensor
+    return deteksi
+
+def jalur_baru(index):
+    def deteksi(text):
+        translated_text = text
+        hits = index.cari(translated_text)
+        return bool(hits) or (text != translated_text and index.contains(text))
+    return deteksi
+
+def bench(deteksi, korpus):
+    teks = iter(korpus)
+    deteksi(korpus[0])  # Pemanasan di luar pengukuran
+    durasi = ukur(lambda: deteksi(next(teks)), len(korpus) - 1)
+    return dict(ringkas(durasi), teks_per_detik=round(len(durasi) / sum(durasi), 1))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Microbenchmark ProfanityIndex vs better_profanity/profanityfilter")
+    parser.add_argument('--jumlah', type=int, default=5000, help="Jumlah teks yang diukur")
+    parser.add_argument('--rasio-kotor', type=float, default=0.1, help="Proporsi teks yang berisi kata kotor")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="Simpan hasil JSON ke file")
+    args = parser.parse_args(argv)
+    
+    korpus = buat_korpus_profanity(args.jumlah + 1, args.seed, args.rasio_kotor)
+    
+    mulai = time.perf_counter()
+    profanity.load_censor_words(KATA_KUSTOM)
+    pf_extended = ProfanityFilter()
+    waktu_muat_lama = time.perf_counter() - mulai
+    
+    mulai = time.perf_counter()
+    index = app.ProfanityIndex(app.muat_kata_profanity(KATA_KUSTOM))
+    waktu_muat_baru = time.perf_counter() - mulai
+    
+    lama, baru = jalur_lama(pf_extended), jalur_baru(index)
+    hasil = {
+        'meta': {
+            'commit': versi_git(),
+            'waktu': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'teks': args.jumlah,
+            'rasio_kotor': args.rasio_kotor,
+            'kata_indeks': len(index.kata),
+            'seed': args.seed
+        },
+        'muat_detik': {'lama': round(waktu_muat_lama, 3), 'baru': round(waktu_muat_baru, 3)},
+        'lama': bench(lama, korpus),
+        'baru': bench(baru, korpus),
+        # Indeks gabungan berisi lebih banyak kata, jadi boleh menandai lebih banyak teks
+        'terdeteksi': {'lama': sum(map(lama, korpus)), 'baru': sum(map(baru, korpus))}
+    }
+    hasil['percepatan_p50'] = round(hasil['lama']['p50_ms'] / hasil['baru']['p50_ms'], 1) if hasil['baru']['p50_ms'] else None
+    
+    teks = json.dumps(hasil, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(teks)
+    print(teks)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark waktu startup app.py.
+
+Mengukur:
+  - waktu `import app` di proses baru (beberapa kali ulang)
+  - modul dengan waktu impor kumulatif terbesar (python -X importtime)
+  - opsional (--server): waktu sampai server menerima koneksi dan sampai
+    /api/siap menjawab 200, beserta durasi tiap tahap startup
+
+Contoh:
+    python benchmarks/startup.py --ulang 5
+    python benchmarks/startup.py --server --output startup.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import urllib.request
+import urllib.error
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SKRIP_IMPOR = "import time; t = time.perf_counter(); import app; print(time.perf_counter() - t)"
+
+def ukur_impor(ulang):
+    """Waktu import app (detik) di proses Python baru"""
+    hasil = []
+    for _ in range(ulang):
+        keluaran = subprocess.run(
+            [sys.executable, '-c', SKRIP_IMPOR], cwd=ROOT,
+            capture_output=True, text=True, check=True
+        )
+        hasil.append(float(keluaran.stdout.strip().splitlines()[-1]))
+    return {
+        'ulang': ulang,
+        'min': round(min(hasil), 4),
+        'median': round(statistics.median(hasil), 4),
+        'max': round(max(hasil), 4)
+    }
+
+def modul_terlambat(top):
+    """Modul dengan waktu impor kumulatif terbesar menurut -X importtime"""
+    keluaran = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'], cwd=ROOT,
+        capture_output=True, text=True, check=True
+    )
+    modul = []
+    for line in keluaran.stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, kumulatif, nama = line[len('import time:'):].split('|')
+        modul.append((int(kumulatif), nama[1:]))
+    
+    # Hanya modul level teratas (tanpa indentasi) yang menjumlahkan submodulnya
+    teratas = [(us, nama) for us, nama in modul if not nama.startswith(' ')]
+    teratas.sort(reverse=True)
+    return [{'modul': nama, 'ms': round(us / 1000, 1)} for us, nama in teratas[:top]]
+
+def ukur_server(batas_waktu):
+    """Jalankan python app.py dan poll /api/siap sampai 200"""
+    url = "http://127.0.0.1:5000/api/siap"
+    mulai = time.perf_counter()
+    proses = subprocess.Popen(
+        [sys.executable, 'app.py'], cwd=ROOT,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    hasil = {'listening': None, 'siap': None, 'tahap': None}
+    try:
+        while time.perf_counter() - mulai < batas_waktu:
+            if proses.poll() is not None:
+                hasil['error'] = f"app.py berhenti dengan kode {proses.returncode}"
+                break
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    status, body = response.status, json.loads(response.read())
+            except urllib.error.HTTPError as e:
+                status, body = e.code, json.loads(e.read())
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.05)
+                continue
+            
+            sekarang = round(time.perf_counter() - mulai, 3)
+            if hasil['listening'] is None:
+                hasil['listening'] = sekarang
+            if status == 200:
+                hasil['siap'] = sekarang
+                hasil['tahap'] = body.get('durasi')
+                break
+            time.sleep(0.05)
+        else:
+            hasil['error'] = f"Tidak siap dalam {batas_waktu} detik"
+    finally:
+        proses.terminate()
+        try:
+            proses.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proses.kill()
+    return hasil
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark waktu startup app.py")
+    parser.add_argument('--ulang', type=int, default=5, help="Jumlah pengulangan import app")
+    parser.add_argument('--top', type=int, default=10, help="Jumlah modul terlambat yang dilaporkan")
+    parser.add_argument('--server', action='store_true', help="Ukur juga waktu sampai /api/siap = 200")
+    parser.add_argument('--batas-waktu', type=float, default=120.0)
+    parser.add_argument('--output', help="Simpan hasil JSON ke file")
+    args = parser.parse_args(argv)
+    
+    hasil = {
+        'python': sys.version.split()[0],
+        'impor': ukur_impor(args.ulang),
+        'modul_terlambat': modul_terlambat(args.top)
+    }
+    if args.server:
+        hasil['server'] = ukur_server(args.batas_waktu)
+    
+    teks = json.dumps(hasil, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(teks)
+    print(teks)
+
+if __name__ == '__main__':
+    main()
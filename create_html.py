@@ -1,4 +1,4 @@
-teplates="""
+templates="""
 <!DOCTYPE html>
 <html>
 <head>
@@ -208,6 +208,11 @@ teplates="""
         let reconnectAttempts = 0;
         const MAX_RECONNECT_ATTEMPTS = 5;
         
+        // Versi statistik yang sedang ditampilkan (protokol stats_delta)
+        let versiStatistik = null;
+        const TRACE_INDEX = { positif: 0, netral: 1, negatif: 2 };
+        const MAX_HARI = 7;
+        
         // Fungsi untuk inisialisasi koneksi Socket.IO dengan strategi reconnect
         function initSocketConnection() {
             try {
@@ -236,6 +241,9 @@ teplates="""
                 // Handler untuk update visualisasi
                 socket.on('update_visualisasi', handleVisualizationUpdate);
                 
+                // Handler untuk perubahan kecil statistik
+                socket.on('stats_delta', handleStatsDelta);
+                
                 return true;
             } catch (err) {
                 console.error('Gagal inisialisasi socket:', err);
@@ -409,6 +417,9 @@ teplates="""
         // Handler update visualisasi
         function handleVisualizationUpdate(data) {
             try {
+                // Figure penuh menjadi basis versi untuk delta berikutnya
+                versiStatistik = data.versi !== undefined ? data.versi : null;
+                
                 // Update line chart
                 if (data.line_chart) {
                     Plotly.newPlot('line-chart', data.line_chart.data, {
@@ -453,6 +464,87 @@ teplates="""
             }
         }
         
+        // Minta figure penuh dari server jika delta tidak bisa diterapkan
+        function mintaResync(alasan) {
+            console.warn('Resync visualisasi:', alasan);
+            versiStatistik = null;
+            if (socket && socket.connected) {
+                socket.emit('minta_resync');
+            }
+        }
+        
+        // Handler delta statistik (tanggal, label, increment, versi)
+        function handleStatsDelta(data) {
+            try {
+                if (versiStatistik === null) {
+                    return;  // Menunggu figure penuh
+                }
+                if (data.versi_awal > versiStatistik) {
+                    mintaResync(`celah versi ${versiStatistik} -> ${data.versi_awal}`);
+                    return;
+                }
+                
+                const chart = document.getElementById('line-chart');
+                if (!chart.data || chart.data.length < 3) {
+                    mintaResync('grafik belum siap');
+                    return;
+                }
+                
+                for (const delta of data.delta) {
+                    // Lewati delta yang sudah termasuk di figure penuh
+                    if (delta.versi <= versiStatistik) {
+                        continue;
+                    }
+                    const traceIndex = TRACE_INDEX[delta.label];
+                    if (traceIndex === undefined) {
+                        continue;
+                    }
+                    
+                    const x = chart.data[0].x;
+                    let posisi = Array.from(x).indexOf(delta.tanggal);
+                    if (posisi === -1) {
+                        if (x.length > 0 && delta.tanggal < x[x.length - 1]) {
+                            mintaResync(`tanggal ${delta.tanggal} tidak ada di grafik`);
+                            return;
+                        }
+                        // Hari baru: tambah titik nol di ketiga trace, geser jendela
+                        Plotly.extendTraces('line-chart', {
+                            x: [[delta.tanggal], [delta.tanggal], [delta.tanggal]],
+                            y: [[0], [0], [0]]
+                        }, [0, 1, 2], MAX_HARI);
+                        posisi = chart.data[0].x.length - 1;
+                    }
+                    
+                    const y = Array.from(chart.data[traceIndex].y);
+                    y[posisi] = (y[posisi] || 0) + delta.increment;
+                    Plotly.restyle('line-chart', { y: [y] }, [traceIndex]);
+                }
+                
+                versiStatistik = data.versi;
+                updatePieDanStatistikDariLineChart();
+            } catch (err) {
+                console.error('Error applying stats delta:', err);
+                mintaResync('error');
+            }
+        }
+        
+        // Hitung ulang pie chart dan statistik hari ini dari data line chart
+        function updatePieDanStatistikDariLineChart() {
+            const chart = document.getElementById('line-chart');
+            const totals = [0, 1, 2].map(i => Array.from(chart.data[i].y).reduce((sum, val) => sum + (val || 0), 0));
+            Plotly.restyle('pie-chart', { values: [totals] }, [0]);
+            
+            const terakhir = i => {
+                const y = chart.data[i].y;
+                return y.length > 0 ? y[y.length - 1] : 0;
+            };
+            updateTodayStatsFromObject({
+                positif: terakhir(0),
+                netral: terakhir(1),
+                negatif: terakhir(2)
+            });
+        }
+        
         // Update statistik hari ini dari array
         function updateTodayStats(latestData) {
             try {
@@ -656,6 +748,6 @@ teplates="""
 </html>
 """
 import os
-os.makedirs("templates")
-with open("templates/index.html", "w") as f
+os.makedirs("templates", exist_ok=True)
+with open("templates/index.html", "w") as f:
     f.write(templates)
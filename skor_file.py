@@ -0,0 +1,122 @@
+"""
+Skoring sentimen offline untuk file CSV/JSONL/Parquet tanpa menjalankan server.
+
+Contoh:
+    python skor_file.py ulasan.csv --kolom teks --output hasil.jsonl --workers 4
+    python skor_file.py ulasan.parquet --tanpa-translator --tanpa-db
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from app import (
+    SentimenModel, baca_input_job, tebak_format_input, analisis_records,
+    simpan_hasil_batch, init_db, penulis_cache, TRANSLATOR_BACKEND, JOB_CHUNK_SIZE
+)
+
+logger = logging.getLogger('skor_file')
+
+MODEL_PATH = 'model/sentimen_model.tflite'
+VOCAB_PATH = 'model/preprocessor.joblib'
+
+# Model milik masing-masing proses worker
+_model = None
+
+def _init_worker(model_path, vocab_path, translator_backend, cache_persisten):
+    """
+    Setiap proses memuat interpreter, lexicon dan translatornya sendiri. Worker
+    dibuat dengan 'spawn' sehingga db_pool-nya berisi koneksi SQLite sendiri,
+    bukan koneksi milik proses induk yang terbawa fork().
+    """
+    global _model
+    _model = SentimenModel(model_path, vocab_path, pool_size=1, num_threads=1,
+                           translator_backend=translator_backend, cache_persisten=cache_persisten)
+
+def _skor_chunk(chunk, kolom):
+    """Analisis satu chunk (list (id, teks)) di proses worker, baris hasil sudah berupa NDJSON"""
+    semua_baris, tersimpan, gagal = analisis_records(_model, chunk, kolom)
+    # atexit tidak berjalan di proses worker, jadi entri cache baru ditulis per chunk
+    penulis_cache.flush()
+    return [json.dumps(baris, default=str) + '\n' for baris in semua_baris], tersimpan, gagal
+
+def _per_chunk(records, chunk_size):
+    """Potong iterator record menjadi list berukuran chunk_size tanpa membaca seluruh file"""
+    while True:
+        chunk = list(itertools.islice(records, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Skoring sentimen file CSV/JSONL/Parquet secara offline")
+    parser.add_argument('input', help="File input (.csv, .jsonl atau .parquet)")
+    parser.add_argument('--output', help="File hasil NDJSON (default: <input>.hasil.jsonl)")
+    parser.add_argument('--format', choices=['csv', 'jsonl', 'parquet'], help="Format input (default: dari ekstensi)")
+    parser.add_argument('--kolom', default='teks', help="Kolom teks (default: teks)")
+    parser.add_argument('--kolom-id', help="Kolom id yang disalin ke hasil (default: nomor record)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Jumlah proses worker")
+    parser.add_argument('--chunk-size', type=int, default=JOB_CHUNK_SIZE, help="Teks per chunk yang dikirim ke worker")
+    parser.add_argument('--model', default=MODEL_PATH, help="Path model TFLite")
+    parser.add_argument('--vocab', default=VOCAB_PATH, help="Path preprocessor (opsional)")
+    parser.add_argument('--tanpa-translator', action='store_true',
+                        help="Jangan memanggil translator (teks dianalisis apa adanya)")
+    parser.add_argument('--tanpa-db', action='store_true',
+                        help="Jangan menyentuh database (hasil dan cache terjemahan)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    format_file = args.format or tebak_format_input(args.input)
+    output = args.output or f"{args.input}.hasil.jsonl"
+    workers = max(1, args.workers)
+    translator_backend = 'noop' if args.tanpa_translator else TRANSLATOR_BACKEND
+    
+    if not args.tanpa_db and not init_db():
+        logger.error("Gagal menginisialisasi database")
+        return 1
+    
+    records = baca_input_job(args.input, format_file, args.kolom, args.kolom_id)
+    jumlah = gagal = 0
+    mulai = time.perf_counter()
+    
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(args.model, args.vocab, translator_backend, not args.tanpa_db)
+    ) as executor, open(output, 'w', encoding='utf-8') as out:
+        def tulis(future):
+            nonlocal jumlah, gagal
+            baris, tersimpan, gagal_chunk = future.result()
+            out.writelines(baris)
+            out.flush()
+            if not args.tanpa_db and tersimpan:
+                simpan_hasil_batch(tersimpan)
+            
+            jumlah += len(baris)
+            gagal += gagal_chunk
+            logger.info(f"{jumlah} teks diproses ({jumlah / (time.perf_counter() - mulai):.1f} teks/detik)")
+        
+        # Batasi chunk yang sedang diproses agar memori tetap datar, urutan output tetap
+        berjalan = deque()
+        for chunk in _per_chunk(records, args.chunk_size):
+            berjalan.append(executor.submit(_skor_chunk, chunk, args.kolom))
+            if len(berjalan) >= workers * 2:
+                tulis(berjalan.popleft())
+        while berjalan:
+            tulis(berjalan.popleft())
+    
+    durasi = time.perf_counter() - mulai
+    logger.info(f"Selesai: {jumlah} teks, {gagal} gagal, {durasi:.1f} detik "
+                f"({jumlah / durasi if durasi > 0 else 0:.1f} teks/detik) -> {output}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,26 @@
+"""
+Konfigurasi bersama test: database sementara dan translator noop dipasang
+sebelum app diimpor, sehingga test tidak menyentuh sentimen_data.db.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.setdefault('SENTIMEN_DB', os.path.join(tempfile.mkdtemp(prefix='sentimen-test-'), 'sentimen.db'))
+os.environ.setdefault('SENTIMEN_TRANSLATOR', 'noop')
+
+DEPENDENSI_APP = ('apsw', 'flask', 'flask_socketio', 'eventlet', 'numpy')
+
+@pytest.fixture(scope='session')
+def aplikasi():
+    """Modul app, dilewati jika dependensi server tidak terpasang"""
+    for modul in DEPENDENSI_APP:
+        pytest.importorskip(modul)
+    
+    import app
+    return app
@@ -0,0 +1,24 @@
+"""
+Endpoint /admin/*: akses ditentukan token, bukan alamat asal request.
+"""
+import pytest
+
+@pytest.fixture
+def client(aplikasi):
+    return aplikasi.app.test_client()
+
+def test_admin_nonaktif_tanpa_token(aplikasi, client, monkeypatch):
+    monkeypatch.setattr(aplikasi, 'ADMIN_TOKEN', '')
+    # Request dari localhost (mis. lewat reverse proxy) tetap ditolak
+    respons = client.get('/admin/tracing', environ_base={'REMOTE_ADDR': '127.0.0.1'})
+    assert respons.status_code == 404
+
+def test_admin_butuh_token_yang_cocok(aplikasi, client, monkeypatch):
+    monkeypatch.setattr(aplikasi, 'ADMIN_TOKEN', 'rahasia')
+    
+    assert client.get('/admin/tracing').status_code == 403
+    assert client.get('/admin/tracing', headers={'X-Admin-Token': 'salah'}).status_code == 403
+    
+    respons = client.get('/admin/tracing', headers={'X-Admin-Token': 'rahasia'},
+                         environ_base={'REMOTE_ADDR': '203.0.113.7'})
+    assert respons.status_code == 200 and 'aktif' in respons.get_json()
@@ -0,0 +1,74 @@
+"""
+Analisis massal: parse NDJSON per baris, batas jumlah item dan pemecahan chunk.
+"""
+import json
+
+import pytest
+
+def test_ndjson_baris_tidak_valid_dilaporkan_per_baris(aplikasi):
+    body = '"satu"\n\n{"id": "x", "teks": "dua"}\n{rusak\n{"id": 7}\n42\n'
+    items = aplikasi.baca_item_bulk(body, ndjson=True)
+    
+    assert [(item_id, teks) for item_id, teks, _ in items] == [
+        (0, 'satu'), ('x', 'dua'), (None, None), (7, None), (4, None)]
+    error = items[2][2]
+    assert isinstance(error, aplikasi.BarisTidakValid) and error.nomor == 4
+    assert aplikasi.format_error_bulk(None, error) == {'baris': 4, 'error': str(error)}
+    assert items[3][2] == items[4][2] == "Field 'teks' (string) tidak ditemukan"
+
+def test_array_json_tidak_valid_menggagalkan_seluruh_body(aplikasi):
+    assert [teks for _, teks, _ in aplikasi.baca_item_bulk('["a", {"teks": "b"}]')] == ['a', 'b']
+    with pytest.raises(ValueError):
+        aplikasi.baca_item_bulk('["a", ')
+
+class ModelPalsu:
+    def __init__(self):
+        self.dipanggil = []
+    
+    def predict_batch(self, texts):
+        self.dipanggil.append(list(texts))
+        return [{'label': 'positif', 'skor': 0.9, 'timestamp': '2026-01-01T00:00:00'} for _ in texts]
+
+class PenulisPalsu:
+    def __init__(self):
+        self.batch = []
+    
+    def simpan_batch(self, items):
+        self.batch.append(list(items))
+    
+    def tandai(self):
+        pass
+
+@pytest.fixture
+def server(aplikasi, monkeypatch):
+    """Test client dengan model, penulis dan broadcaster palsu"""
+    penulis = PenulisPalsu()
+    monkeypatch.setattr(aplikasi, 'model', ModelPalsu())
+    monkeypatch.setattr(aplikasi, 'result_writer', penulis)
+    monkeypatch.setattr(aplikasi, 'broadcaster', penulis)
+    monkeypatch.setattr(aplikasi.status_startup, 'siap', True)
+    return aplikasi.app.test_client()
+
+def test_batas_jumlah_item(aplikasi, server, monkeypatch):
+    monkeypatch.setattr(aplikasi, 'BULK_MAX_ITEMS', 3)
+    
+    respons = server.post('/api/sentimen/bulk', json=['a', 'b', 'c', 'd'])
+    assert respons.status_code == 413
+    
+    respons = server.post('/api/sentimen/bulk', json=['a', 'b', 'c'])
+    assert respons.status_code == 200
+    assert len(respons.get_data(as_text=True).splitlines()) == 3
+
+def test_chunk_dan_urutan_hasil(aplikasi, server):
+    body = '\n'.join(json.dumps({'id': i, 'teks': f't{i}'}) for i in range(5)) + '\n{rusak'
+    items = aplikasi.baca_item_bulk(body, ndjson=True)
+    
+    baris = [json.loads(line) for line in aplikasi.stream_analisis_bulk(items, chunk_size=2)]
+    
+    # Error parse lebih dulu, lalu hasil per chunk dengan id dari client
+    assert baris[0] == {'baris': 6, 'error': baris[0]['error']}
+    assert [b['id'] for b in baris[1:]] == [0, 1, 2, 3, 4]
+    assert aplikasi.model.dipanggil == [['t0', 't1'], ['t2', 't3'], ['t4']]
+    # Semua hasil disimpan dalam satu transaksi setelah stream selesai
+    assert [[teks for teks, _ in batch] for batch in aplikasi.result_writer.batch] == [
+        ['t0', 't1', 't2', 't3', 't4']]
@@ -0,0 +1,49 @@
+"""
+Tabel cache persisten: entri kedaluwarsa dan entri di atas batas baris dibuang.
+"""
+import time
+
+def isi_tabel(aplikasi, sql, baris):
+    with aplikasi.db_pool.writer() as conn:
+        with conn:
+            conn.cursor().executemany(sql, baris)
+
+def semua_baris(aplikasi, sql):
+    with aplikasi.db_pool.reader() as conn:
+        return conn.cursor().execute(sql).fetchall()
+
+def test_cache_terjemahan_dibersihkan(aplikasi):
+    cache = aplikasi.TranslationCache(db_maks=50)
+    with aplikasi.db_pool.writer() as conn:
+        conn.cursor().execute("DELETE FROM cache_terjemahan")
+    sekarang = time.time()
+    kedaluwarsa = sekarang - aplikasi.TRANSLATION_CACHE_DB_TTL - 10
+    isi_tabel(aplikasi, "INSERT INTO cache_terjemahan VALUES (?, 'auto', 'en', 'x', ?)",
+              [(f"lama{i}", kedaluwarsa) for i in range(30)] +
+              [(f"baru{i}", sekarang - 1000 + i) for i in range(80)])
+    
+    cache.bersihkan()
+    
+    sisa = [teks for teks, in semua_baris(aplikasi, "SELECT teks FROM cache_terjemahan ORDER BY dibuat")]
+    assert sisa == [f"baru{i}" for i in range(30, 80)]
+
+def test_cache_prediksi_dibersihkan(aplikasi):
+    aplikasi.PredictionCache('versi-lama')  # Membuat tabel
+    with aplikasi.db_pool.writer() as conn:
+        conn.cursor().execute("DELETE FROM cache_prediksi")
+    sekarang = time.time()
+    kedaluwarsa = sekarang - aplikasi.RESULT_CACHE_DB_TTL - 10
+    isi_tabel(aplikasi, "INSERT INTO cache_prediksi VALUES (?, ?, '{}', ?)",
+              [(f"lain{i}", 'versi-lama', sekarang) for i in range(10)] +
+              [(f"lama{i}", 'versi-baru', kedaluwarsa) for i in range(10)] +
+              [(f"baru{i}", 'versi-baru', sekarang - 1000 + i) for i in range(40)])
+    
+    # Entri versi lain dibuang saat cache dibuat
+    cache = aplikasi.PredictionCache('versi-baru', db_maks=25)
+    assert not semua_baris(aplikasi, "SELECT kunci FROM cache_prediksi WHERE versi != 'versi-baru'")
+    assert cache.get('lama0') is None
+    
+    cache.bersihkan()
+    
+    sisa = [kunci for kunci, in semua_baris(aplikasi, "SELECT kunci FROM cache_prediksi ORDER BY dibuat")]
+    assert sisa == [f"baru{i}" for i in range(15, 40)]
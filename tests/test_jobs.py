@@ -0,0 +1,47 @@
+"""
+Input job: baris JSONL yang rusak menjadi baris error bernomor, bukan
+menghentikan seluruh job.
+"""
+def tulis_file(tmp_path, isi, nama='input.jsonl'):
+    path = tmp_path / nama
+    path.write_text(isi, encoding='utf-8')
+    return str(path)
+
+class ModelPalsu:
+    def predict_batch(self, texts):
+        return [{'label': 'netral', 'skor': 0.7} for _ in texts]
+
+def test_jsonl_rusak_menjadi_baris_error(aplikasi, tmp_path):
+    path = tulis_file(tmp_path, '{"teks": "a"}\n\n{rusak\n"b"\n{"lain": 1}\n{"teks": "c"')
+    records = list(aplikasi.baca_input_job(path, 'jsonl', 'teks'))
+    
+    assert [item_id for item_id, _ in records] == [0, 1, 2, 3, 4]
+    assert isinstance(records[1][1], aplikasi.BarisTidakValid) and records[1][1].nomor == 3
+    assert isinstance(records[4][1], aplikasi.BarisTidakValid) and records[4][1].nomor == 6
+    
+    semua_baris, tersimpan, gagal = aplikasi.analisis_records(ModelPalsu(), records)
+    assert [baris.get('baris') for baris in semua_baris] == [None, 3, None, None, 6]
+    assert semua_baris[1]['id'] == 1 and 'JSON tidak valid' in semua_baris[1]['error']
+    assert semua_baris[3] == {'id': 3, 'error': "Kolom 'teks' tidak ditemukan"}
+    assert [teks for teks, _ in tersimpan] == ['a', 'b']
+    assert gagal == 3
+
+def test_jumlah_record_tetap_untuk_checkpoint(aplikasi, tmp_path):
+    # Total dan posisi resume dihitung dari record yang sama, termasuk baris rusak
+    path = tulis_file(tmp_path, '"a"\n{rusak\n"b"\n')
+    assert sum(1 for _ in aplikasi.baca_input_job(path, 'jsonl', 'teks')) == 3
+
+def test_skor_file_menerima_baris_rusak(aplikasi, tmp_path, monkeypatch):
+    import pickle
+    import skor_file
+    
+    path = tulis_file(tmp_path, '"a"\n{rusak\n')
+    chunk = list(aplikasi.baca_input_job(path, 'jsonl', 'teks'))
+    # Chunk dikirim ke proses worker 'spawn', jadi harus bisa di-pickle
+    chunk = pickle.loads(pickle.dumps(chunk))
+    monkeypatch.setattr(skor_file, '_model', ModelPalsu())
+    monkeypatch.setattr(skor_file.penulis_cache, 'flush', lambda: None)
+    
+    baris, tersimpan, gagal = skor_file._skor_chunk(chunk, 'teks')
+    assert '"baris": 2' in baris[1] and gagal == 1
+    assert [teks for teks, _ in tersimpan] == ['a']
@@ -0,0 +1,116 @@
+"""
+LexiconMatcher dan ProfanityIndex dibandingkan dengan skor per kata lama
+(split spasi, strip tanda baca, cek kata satu per satu).
+"""
+import pytest
+
+POSITIF = ['mantap', 'good', 'great', 'amazing', 'luar biasa', 'not bad', 'very good']
+NEGATIF = ['bad', 'terrible', 'awful', 'tidak bagus', 'bangsat']
+KOTOR = ['idiot', 'stupid', 'son of a gun', 'bangsat']
+
+def skor_per_kata(text, positif, negatif):
+    """Skor lama: satu kata per token hasil split, tanpa frasa dan negasi"""
+    positive_found, negative_count = [], 0
+    for word in text.lower().split():
+        word = word.strip(".,!?;:'\"()-")
+        if word in positif:
+            positive_found.append(word)
+        elif word in negatif:
+            negative_count += 1
+    return positive_found, negative_count
+
+def skor_matcher(aplikasi, matcher, text):
+    """Hit matcher tanpa pembalikan negasi, dalam bentuk yang sama dengan skor lama"""
+    tokens = [token for token, _, _ in aplikasi.tokenisasi(text.lower())]
+    hits = matcher.cari(tokens)
+    return ([frasa for _, _, frasa, polaritas in hits if polaritas == 'positif'],
+            sum(1 for hit in hits if hit[3] == 'negatif'))
+
+@pytest.fixture
+def matcher(aplikasi):
+    lexicon = {frasa: 'positif' for frasa in POSITIF}
+    lexicon.update({frasa: 'negatif' for frasa in NEGATIF})
+    return aplikasi.LexiconMatcher(lexicon)
+
+@pytest.mark.parametrize('text', [
+    "This is good, really GOOD!",
+    "terrible service (awful) but great food.",
+    "nothing matches here",
+    "bad bad bad good",
+    "",
+])
+def test_kata_tunggal_sama_dengan_skor_lama(aplikasi, matcher, text):
+    positif = {frasa for frasa in POSITIF if ' ' not in frasa}
+    negatif = {frasa for frasa in NEGATIF if ' ' not in frasa}
+    assert skor_matcher(aplikasi, matcher, text) == skor_per_kata(text, positif, negatif)
+
+def test_frasa_multi_kata(aplikasi, matcher):
+    # Skor lama tidak mengenal frasa: 'luar biasa' dan 'tidak bagus' tidak pernah cocok
+    assert skor_per_kata("Pelayanan luar biasa", set(POSITIF), set(NEGATIF)) == ([], 0)
+    assert skor_matcher(aplikasi, matcher, "Pelayanan luar biasa") == (['luar biasa'], 0)
+    assert skor_matcher(aplikasi, matcher, "makanannya tidak bagus") == ([], 1)
+
+def test_tumpang_tindih_memilih_paling_kiri_lalu_paling_panjang(aplikasi, matcher):
+    tokens = ['very', 'good', 'not', 'bad']
+    hits = matcher.cari(tokens)
+    # 'very good' menang atas 'good', 'not bad' menang atas 'bad'
+    assert [(awal, akhir, frasa) for awal, akhir, frasa, _ in hits] == [
+        (0, 2, 'very good'), (2, 4, 'not bad')]
+
+def test_hit_tidak_saling_tumpang_tindih(aplikasi):
+    matcher = aplikasi.LexiconMatcher({'a b': 'positif', 'b c': 'negatif', 'c': 'negatif'})
+    hits = matcher.cari(['a', 'b', 'c'])
+    assert [frasa for _, _, frasa, _ in hits] == ['a b', 'c']
+
+def test_jendela_negasi(aplikasi):
+    tokens = ['it', 'is', 'not', 'very', 'good']
+    assert aplikasi.NEGASI_JENDELA == 2
+    assert aplikasi.ada_negasi(tokens, 4)  # 'not' dua token sebelum 'good'
+    assert not aplikasi.ada_negasi(['not', 'it', 'is', 'good'], 3)  # Di luar jendela
+    assert not aplikasi.ada_negasi(tokens, 0)
+    assert aplikasi.ada_negasi(['tidak', 'enak'], 1)
+
+def test_profanity_hit(aplikasi):
+    index = aplikasi.ProfanityIndex(KOTOR + ['', '  ', 'IDIOT '])
+    text = "You Idiot, what a son of a gun. Stupidity is fine"
+    hits = index.cari(text)
+    
+    assert index.kata == set(KOTOR)
+    assert [hit['kata'] for hit in hits] == ['idiot', 'son of a gun']
+    assert [text[awal:akhir] for awal, akhir in (hit['posisi'] for hit in hits)] == ['Idiot', 'son of a gun']
+    assert hits[0]['token'] == (1, 2)
+    assert index.contains("STUPID!") and not index.contains("stupidity")
+
+@pytest.fixture
+def model(aplikasi, matcher):
+    pytest.importorskip('textblob')
+    
+    class ModelUji(aplikasi.SentimenModel):
+        """SentimenModel dengan lexicon kecil dan tanpa translator"""
+        def __init__(self):
+            self.lexicon_matcher = matcher
+            self.profanity_index = aplikasi.ProfanityIndex(KOTOR)
+        
+        def translate_positive_words(self, words, batas_waktu=None):
+            return list(words)
+    
+    return ModelUji()
+
+def analisis(model, text):
+    return model.analyze_sentiment_lexicon(text, resolusi={'teks_inggris': text})
+
+def test_analisis_negasi_membalik_polaritas(model):
+    hasil = analisis(model, "the room is not good")
+    assert hasil['label'] == 'negatif' and hasil['positive_words'] == []
+    
+    hasil = analisis(model, "not bad, the room is good")
+    assert hasil['label'] == 'positif' and hasil['positive_words'] == ['not bad', 'good']
+
+def test_analisis_profanity_tidak_dihitung_ganda(model):
+    # Kata kotor di luar lexicon: satu hit negatif ditambah bobot profanity 2
+    hasil = analisis(model, "mantap mantap mantap son of a gun")
+    assert hasil['label'] == 'netral' and hasil['positive_words'] == ['mantap'] * 3
+    
+    # Kata kotor yang juga kata negatif lexicon hanya dihitung sekali
+    hasil = analisis(model, "mantap mantap mantap mantap bangsat")
+    assert hasil['label'] == 'positif'
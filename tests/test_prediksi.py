@@ -0,0 +1,36 @@
+"""
+predict_batch: kegagalan satu teks hanya mengenai hasil teks itu sendiri.
+"""
+import pytest
+
+@pytest.fixture
+def model(aplikasi):
+    class ModelUji(aplikasi.SentimenModel):
+        """SentimenModel tanpa interpreter: _predict_batch diganti hasil tetap"""
+        def __init__(self):
+            self.result_cache = aplikasi.PredictionCache('uji', persisten=False)
+            self.dipanggil = []
+        
+        def _predict_batch(self, texts):
+            self.dipanggil.append(list(texts))
+            if 'meledak' in texts:
+                raise RuntimeError('gagal')
+            return [{'label': 'positif', 'skor': 0.9} for _ in texts], [True] * len(texts)
+    
+    return ModelUji()
+
+def test_teks_bukan_string_tidak_menggagalkan_batch(model):
+    hasil = model.predict_batch(['bagus', 123, 'bagus sekali', None])
+    
+    assert hasil[0]['label'] == 'positif' and 'error' not in hasil[0]
+    assert hasil[2]['label'] == 'positif' and 'error' not in hasil[2]
+    assert 'string' in hasil[1]['error']
+    assert 'error' not in hasil[3]  # None diperlakukan sebagai teks kosong
+    assert all(123 not in batch for batch in model.dipanggil)
+
+def test_error_batch_tidak_mengenai_hasil_dari_cache(model):
+    model.predict_batch(['bagus'])
+    hasil = model.predict_batch(['bagus', 'meledak'])
+    
+    assert hasil[0]['label'] == 'positif' and 'error' not in hasil[0]
+    assert hasil[1]['error'] == 'gagal'
@@ -0,0 +1,80 @@
+"""
+Riwayat dengan keyset pagination: tidak ada baris yang hilang atau terulang
+antar halaman, termasuk timestamp kembar, filter banyak label dan pencarian teks.
+"""
+import pytest
+
+BARIS = [
+    # (teks, label, timestamp): beberapa baris berbagi timestamp yang sama
+    ('produk bagus sekali', 'positif', '2026-01-02T10:00:00'),
+    ('pengiriman lambat', 'negatif', '2026-01-02T10:00:00'),
+    ('biasa saja', 'netral', '2026-01-02T10:00:00'),
+    ('ok', 'positif', '2026-01-02T10:00:00'),
+    ('layanan buruk', 'negatif', '2026-01-02T10:00:00'),
+    ('mantap 100%', 'positif', '2026-01-01T09:00:00'),
+    ('harga_diskon ok', 'netral', '2026-01-01T09:00:00'),
+    ('barang ok tapi lambat', 'negatif', '2026-01-01T08:00:00'),
+    ('OK banget', 'positif', '2026-01-03T12:00:00'),
+]
+
+@pytest.fixture
+def conn(aplikasi):
+    assert aplikasi.init_db()
+    with aplikasi.db_pool.writer() as conn:
+        with conn:
+            conn.cursor().execute("DELETE FROM sentimen_hasil")
+            conn.cursor().executemany(
+                "INSERT INTO sentimen_hasil (teks, label, skor, timestamp) VALUES (?, ?, 0.9, ?)", BARIS)
+    with aplikasi.db_pool.reader() as conn:
+        yield conn
+
+def semua_halaman(aplikasi, conn, limit, **filter_riwayat):
+    """Ikuti cursor_berikutnya sampai habis, return list id per halaman"""
+    halaman, cursor_halaman = [], None
+    while True:
+        rows, cursor_halaman = aplikasi._query_riwayat(conn, cursor_halaman=cursor_halaman, limit=limit,
+                                                       **filter_riwayat)
+        halaman.append([row['id'] for row in rows])
+        if cursor_halaman is None:
+            return halaman
+
+def urut_penuh(conn, where='1', params=(), arah='DESC'):
+    return [row[0] for row in conn.cursor().execute(
+        f"SELECT id FROM sentimen_hasil WHERE {where} ORDER BY timestamp {arah}, id {arah}", params)]
+
+@pytest.mark.parametrize('urutan', ['desc', 'asc'])
+def test_cursor_dengan_timestamp_kembar(aplikasi, conn, urutan):
+    halaman = semua_halaman(aplikasi, conn, 2, urutan=urutan)
+    
+    assert all(len(ids) <= 2 for ids in halaman)
+    assert sum(halaman, []) == urut_penuh(conn, arah=urutan.upper())
+
+def test_cursor_dengan_banyak_label(aplikasi, conn):
+    halaman = semua_halaman(aplikasi, conn, 2, label=['positif', 'negatif', 'positif'])
+    
+    assert sum(halaman, []) == urut_penuh(conn, "label IN ('positif', 'negatif')")
+    assert len(halaman) == 4
+
+def cari(aplikasi, conn, q):
+    return sorted(sum(semua_halaman(aplikasi, conn, 3, q=q), []))
+
+@pytest.fixture
+def fts(aplikasi, conn, monkeypatch):
+    with aplikasi.db_pool.writer() as conn_writer:
+        if not aplikasi._init_fts_riwayat(conn_writer.cursor()):
+            pytest.skip("SQLite tanpa FTS5 trigram")
+        with conn_writer:
+            conn_writer.cursor().execute("INSERT INTO sentimen_hasil_fts (sentimen_hasil_fts) VALUES ('rebuild')")
+    monkeypatch.setattr(aplikasi, 'riwayat_fts', True)
+
+@pytest.mark.parametrize('q', ['ok', 'o', '%', '_', 'lambat', 'bagus sekali', '100%'])
+@pytest.mark.parametrize('pakai_fts', [False, True])
+def test_pencarian_teks(aplikasi, conn, request, q, pakai_fts):
+    if pakai_fts:
+        # Query pendek (< 3 karakter) tidak bisa dicocokkan trigram dan harus jatuh ke LIKE
+        request.getfixturevalue('fts')
+    escape = q.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    diharapkan = sorted(urut_penuh(conn, "teks LIKE ? ESCAPE '\\'", (f'%{escape}%',)))
+    
+    assert diharapkan  # Setiap query di atas punya hasil
+    assert cari(aplikasi, conn, q) == diharapkan
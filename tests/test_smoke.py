@@ -0,0 +1,61 @@
+"""
+Smoke test: modul aplikasi dan skrip pendukung bisa diimpor, dan tidak ada
+nama global yang dipakai tanpa pernah didefinisikan.
+"""
+import ast
+import builtins
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FILE_PYTHON = ['app.py', 'skor_file.py', 'load_models.py', 'create_html.py',
+               'benchmarks/startup.py', 'benchmarks/pipeline.py', 'benchmarks/beban.py',
+               'benchmarks/profanity.py']
+
+def nama_terikat(tree):
+    """Semua nama yang pernah diikat di mana pun dalam modul"""
+    nama = set(dir(builtins)) | {'__file__', '__name__', '__doc__'}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, (ast.Store, ast.Del)):
+            nama.add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            nama.add(node.name)
+        elif isinstance(node, ast.arg):
+            nama.add(node.arg)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            nama.update((alias.asname or alias.name).split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            nama.add(node.name)
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            nama.update(node.names)
+    return nama
+
+@pytest.mark.parametrize('path', [p for p in FILE_PYTHON if os.path.exists(os.path.join(ROOT, p))])
+def test_tidak_ada_nama_tak_terdefinisi(path):
+    with open(os.path.join(ROOT, path), encoding='utf-8') as f:
+        tree = ast.parse(f.read(), path)
+    terikat = nama_terikat(tree)
+    tak_terdefinisi = sorted({
+        node.id for node in ast.walk(tree)
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load) and node.id not in terikat
+    })
+    assert not tak_terdefinisi, f"{path}: nama tidak terdefinisi {tak_terdefinisi}"
+
+def test_import_app():
+    for modul in ('apsw', 'flask', 'flask_socketio', 'eventlet', 'numpy'):
+        pytest.importorskip(modul)
+    
+    import app
+    assert app.PredictionCache.__init__.__defaults__[0] is app.RESULT_CACHE_PERSISTEN
+    assert all(os.path.exists(os.path.join(ROOT, path)) for path in app.LEXICON_FILES)
+
+def test_import_skor_file():
+    for modul in ('apsw', 'flask', 'flask_socketio', 'eventlet', 'numpy'):
+        pytest.importorskip(modul)
+    
+    import skor_file
+    assert callable(skor_file.main)
@@ -0,0 +1,73 @@
+"""
+StatistikLive.delta_sejak: delta per versi, resync saat riwayat tidak lengkap,
+dan rekonsiliasi setelah ResultWriter menulis ke database.
+"""
+from datetime import datetime
+
+import pytest
+
+def hasil(label):
+    return {'label': label, 'skor': 0.9, 'timestamp': datetime.now().isoformat()}
+
+@pytest.fixture
+def statistik(aplikasi):
+    assert aplikasi.init_db()
+    with aplikasi.db_pool.writer() as conn:
+        with conn:
+            conn.cursor().execute("DELETE FROM sentimen_hasil")
+            conn.cursor().execute("DELETE FROM sentimen_statistik")
+    return aplikasi.StatistikLive().muat()
+
+def test_delta_sejak_versi(statistik):
+    awal = statistik.versi
+    tanggal = datetime.now().date().isoformat()
+    
+    statistik.catat('a', hasil('positif'))
+    statistik.catat_batch([('b', hasil('negatif')), ('c', hasil('negatif'))])
+    
+    assert statistik.delta_sejak(awal) == [
+        {'tanggal': tanggal, 'label': 'positif', 'increment': 1, 'versi': awal + 1},
+        {'tanggal': tanggal, 'label': 'negatif', 'increment': 2, 'versi': awal + 2},
+    ]
+    assert statistik.delta_sejak(awal + 1) == [
+        {'tanggal': tanggal, 'label': 'negatif', 'increment': 2, 'versi': awal + 2}]
+    assert statistik.delta_sejak(statistik.versi) == []
+    assert statistik.snapshot() == (awal + 2, [
+        {'tanggal': tanggal, 'positif': 1, 'netral': 0, 'negatif': 2, 'total': 3}])
+
+def test_celah_versi_memaksa_snapshot_penuh(aplikasi, statistik, monkeypatch):
+    monkeypatch.setattr(aplikasi, 'STATISTIK_DELTA_LOG', 2)
+    statistik = aplikasi.StatistikLive().muat()
+    awal = statistik.versi
+    for label in ('positif', 'netral', 'negatif'):
+        statistik.catat('x', hasil(label))
+    
+    # Versi awal + 1 sudah terbuang dari log
+    assert statistik.delta_sejak(awal) is None
+    assert [delta['versi'] for delta in statistik.delta_sejak(awal + 1)] == [awal + 2, awal + 3]
+    
+    # Perubahan dari luar antrian (muat ulang database) tidak punya delta
+    aplikasi.simpan_hasil_batch([('lain', hasil('positif'))])
+    versi = statistik.versi
+    statistik.muat()
+    assert statistik.versi == versi + 1
+    assert statistik.delta_sejak(versi) is None
+
+def test_rekonsiliasi_setelah_flush_writer(aplikasi, statistik):
+    writer = aplikasi.ResultWriter(statistik=statistik)
+    awal = statistik.versi
+    for label in ('positif', 'positif', 'negatif'):
+        writer.simpan('x', hasil(label))
+    versi, jendela = statistik.snapshot()
+    assert versi == awal + 3 and jendela[0]['total'] == 3
+    
+    writer.flush()
+    
+    # Commit memindahkan angka pending ke angka database tanpa mengubah tampilan
+    assert statistik.snapshot() == (versi, jendela)
+    assert statistik._pending == {}
+    
+    # Rekonsiliasi dengan database tidak menghasilkan versi baru
+    statistik.muat()
+    assert statistik.snapshot() == (versi, jendela)
+    assert statistik.delta_sejak(versi) == []
@@ -0,0 +1,90 @@
+"""
+GoogleTranslatorBackend: deteksi bahasa per teks dan fallback per item saat
+jumlah baris terjemahan gabungan tidak cocok.
+"""
+import sys
+import time
+import types
+
+import pytest
+
+class TranslatorPalsu:
+    """Pengganti googletrans.Translator: bahasa = awalan teks sebelum ':'"""
+    
+    def __init__(self, timeout=None):
+        self.panggilan = []
+        self.buang_baris = False
+    
+    def translate(self, text, dest='en', src='auto'):
+        self.panggilan.append(text)
+        baris = text.split('\n')
+        if self.buang_baris and len(baris) > 1:
+            baris = baris[:-1]
+        bahasa = text.split(':')[0] if src == 'auto' else src
+        return types.SimpleNamespace(text='\n'.join(b.upper() for b in baris), src=bahasa,
+                                     dest=dest, extra_data={'confidence': 0.9})
+
+@pytest.fixture
+def backend(aplikasi, monkeypatch):
+    monkeypatch.setitem(sys.modules, 'googletrans', types.SimpleNamespace(Translator=TranslatorPalsu))
+    return aplikasi.GoogleTranslatorBackend()
+
+def test_auto_mendeteksi_bahasa_per_teks(backend):
+    hasil = backend.translate(['id: bagus', 'fr: tres bien', 'id: jelek'])
+    
+    assert [h.src for h in hasil] == ['id', 'fr', 'id']
+    assert [h.text for h in hasil] == ['ID: BAGUS', 'FR: TRES BIEN', 'ID: JELEK']
+    assert sorted(backend.translator.panggilan) == ['fr: tres bien', 'id: bagus', 'id: jelek']
+
+def test_src_pasti_satu_request_per_segmen(backend):
+    hasil = backend.translate(['good', 'nice  day'], dest='id', src='en')
+    
+    assert backend.translator.panggilan == ['good\nnice day']
+    assert [h.text for h in hasil] == ['GOOD', 'NICE DAY']
+
+def test_baris_tidak_cocok_diterjemahkan_per_item(backend):
+    backend.translator.buang_baris = True
+    
+    hasil = backend.translate(['good', 'nice'], dest='id', src='en')
+    
+    assert [h.text for h in hasil] == ['GOOD', 'NICE']
+    assert backend.translator.panggilan[1:] in (['good', 'nice'], ['nice', 'good'])
+
+class BackendGagal:
+    nama = 'gagal'
+    cacheable = True
+    
+    def __init__(self):
+        self.panggilan = 0
+    
+    def translate(self, text, dest='en', src='auto'):
+        self.panggilan += 1
+        raise ConnectionError('offline')
+
+@pytest.fixture
+def model_translator(aplikasi):
+    class ModelUji(aplikasi.SentimenModel):
+        """SentimenModel yang hanya punya bagian translator"""
+        def __init__(self):
+            self.translator = BackendGagal()
+            self.translator_cadangan = aplikasi.NoopTranslatorBackend()
+            self.translator_breaker = aplikasi.CircuitBreaker(threshold=3, cooldown=60)
+    
+    return ModelUji()
+
+def test_deadline_habis_tidak_membuka_breaker(model_translator):
+    for _ in range(5):
+        hasil, boleh_cache = model_translator._translate_dengan_retry('halo', 'en', 'auto', time.monotonic() - 1)
+        assert hasil.text == 'halo' and not boleh_cache  # Langsung ke translator cadangan
+    
+    assert model_translator.translator.panggilan == 0
+    assert model_translator.translator_breaker.gagal_beruntun == 0
+    assert model_translator.translator_breaker.boleh_dipanggil()
+
+def test_kegagalan_backend_dicatat_breaker(model_translator, monkeypatch, aplikasi):
+    monkeypatch.setattr(aplikasi, 'TRANSLATOR_BACKOFF_BASE', 0.0)
+    
+    model_translator._translate_dengan_retry('halo', 'en', 'auto')
+    
+    assert model_translator.translator.panggilan == aplikasi.TRANSLATOR_RETRY
+    assert model_translator.translator_breaker.gagal_beruntun == 1
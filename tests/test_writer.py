@@ -0,0 +1,31 @@
+"""
+ResultWriter saat shutdown: isi antrian ditulis oleh tutup() dan hasil yang
+datang sesudahnya ditulis langsung, bukan ditinggal di antrian.
+"""
+import pytest
+
+@pytest.fixture
+def tertulis(aplikasi, monkeypatch):
+    """Ganti simpan_hasil_batch dengan pencatat batch"""
+    batch = []
+    
+    def simpan_hasil_batch(items, setelah_commit=None):
+        batch.append(list(items))
+        return True
+    
+    monkeypatch.setattr(aplikasi, 'simpan_hasil_batch', simpan_hasil_batch)
+    return batch
+
+def test_tutup_menulis_antrian_lalu_menulis_langsung(aplikasi, tertulis):
+    writer = aplikasi.ResultWriter(flush_interval=0.01)
+    for i in range(5):
+        writer.simpan(f'teks {i}', {'label': 'positif'})
+    
+    writer.tutup(batas_waktu=2)
+    assert sorted(teks for batch in tertulis for teks, _ in batch) == [f'teks {i}' for i in range(5)]
+    assert writer.stats()['tertunda'] == 0
+    
+    writer.simpan('terlambat', {'label': 'negatif'})
+    assert tertulis[-1] == [('terlambat', {'label': 'negatif'})]
+    assert writer.stats()['kedalaman_antrian'] == 0
+    assert writer.stats()['tulis_langsung'] == 1